@@ -6,24 +6,35 @@ AI Assistant module that integrates various components such as speech recognitio
 from assistant.ai_provider.ai_providers import AIProvider
 import assistant.ai_provider as ai
 from assistant.assistant import ConversationalAssistant
+from assistant.session.context_spill import DEFAULT_SPILL_PATH
 
 class AIAssistant(ConversationalAssistant):
     def __init__(
         self,
         ai_provider: AIProvider = ai.Ollama(),
-        name: str = "AI Assistant"
+        name: str = "AI Assistant",
+        spill_path: str | None = DEFAULT_SPILL_PATH,
     ):
         super().__init__(
             ai_provider=ai_provider,
-            name=name
+            name=name,
+            spill_path=spill_path,
         )
 
     def change_ai_provider(self, new_provider: AIProvider) -> None:
+        if new_provider is self.ai_provider:
+            return
+        self.ai_provider.release()
+        # Load the model now rather than on the first question, providers
+        # that warmed up when they were created skip this
+        new_provider.warm_up()
         self.ai_provider = new_provider
+        # Sessions hold copies of the old provider
+        self.sessions.clear()
         print(f"🤖 AI Provider changed to {new_provider.name}")
 
     def ask(self, prompt: str):
-        self.response = self.ai_provider.ask_with_timeout(prompt)
+        self.response = self._ask_once(prompt, self.ai_provider.ask_with_timeout)
         self.answer(self.response)
         return self.response
 
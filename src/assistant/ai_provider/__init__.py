@@ -1,11 +1,20 @@
 from .ai_providers import AIProvider # Import the base class
 from .ollama import Ollama
 from .github_gpt_5 import GPT_5
+from .async_gpt_5 import AsyncGPT_5
 from .gemini import Gemini
 from .llama import Llama
 from .cohere_api import CohereAPI
+from .router import HedgedRouter, FailoverRouter
+from .circuit_breaker import CircuitBreaker, CircuitState
+from .http_session import PooledSession
+from .metrics import GenerationMetrics, MetricsWindow
+from .history import QuestionAndAnswer, QandALog, ConversationStats
+from .retry import RetryPolicy, RetryBudget, RETRY_BUDGET
+from .rate_limit import FairRateLimiter, current_user, shared_limiter
+from .scheduler import Priority, PriorityScheduler, current_priority
 
 
 __version__ = "0.1.0"
 
-__all__ = ["AIProvider", "Ollama", "GPT_5", "Gemini", "Llama", "CohereAPI"]
\ No newline at end of file
+__all__ = ["AIProvider", "Ollama", "GPT_5", "AsyncGPT_5", "Gemini", "Llama", "CohereAPI", "HedgedRouter", "FailoverRouter", "CircuitBreaker", "CircuitState", "PooledSession", "GenerationMetrics", "MetricsWindow", "QuestionAndAnswer", "QandALog", "ConversationStats", "RetryPolicy", "RetryBudget", "RETRY_BUDGET", "FairRateLimiter", "current_user", "shared_limiter", "Priority", "PriorityScheduler", "current_priority"]
\ No newline at end of file
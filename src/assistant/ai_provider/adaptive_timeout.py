@@ -0,0 +1,93 @@
+import threading
+from collections import deque
+
+# Custom Imports
+try:
+    from .metrics import _percentile
+except ImportError:
+    from metrics import _percentile
+
+
+class AdaptiveTimeout:
+    """
+    Request timeouts learned from the latencies a provider actually showed.
+
+    Latencies are kept per model, warm and cold apart. A warm request gets
+    `multiplier` times the `percentile` of the recent warm latencies, a cold
+    one (model not loaded, first request) `multiplier` times the slowest
+    cold latency seen. Until there are enough samples the defaults are used.
+    Timeouts that fired are recorded as samples too, so a backend that got
+    slower raises its timeout instead of timing out for ever. The result is
+    kept between `floor` and `ceiling` (`cold_ceiling` when cold).
+    """
+
+    def __init__(
+        self,
+        percentile: float = 99.0,
+        multiplier: float = 1.5,
+        floor: float = 3.0,
+        ceiling: float = 30.0,
+        default: float = 10.0,
+        cold_default: float = 60.0,
+        cold_ceiling: float = 120.0,
+        min_samples: int = 5,
+        window: int = 50,
+    ):
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.floor = floor
+        self.ceiling = ceiling
+        self.default = default
+        self.cold_default = cold_default
+        self.cold_ceiling = cold_ceiling
+        self.min_samples = min_samples
+        self.window = window
+        self._lock = threading.Lock()
+        self._warm: dict[str, deque[float]] = {}
+        self._cold: dict[str, deque[float]] = {}
+
+    def record(self, model: str, latency: float, cold: bool = False) -> None:
+        samples = self._cold if cold else self._warm
+        with self._lock:
+            samples.setdefault(model, deque(maxlen=self.window)).append(latency)
+
+    def compute(self, model: str, cold: bool = False) -> tuple[float, str]:
+        """Timeout in seconds for the next request and why it was chosen"""
+        with self._lock:
+            warm = list(self._warm.get(model, ()))
+            cold_samples = list(self._cold.get(model, ()))
+
+        if cold:
+            ceiling = self.cold_ceiling
+            if cold_samples:
+                timeout = self.multiplier * max(cold_samples)
+                reason = f"cold: {self.multiplier:g} x slowest of {len(cold_samples)} cold requests"
+            else:
+                timeout, reason = self.cold_default, "cold: no cold requests seen yet, default"
+        else:
+            ceiling = self.ceiling
+            if len(warm) >= self.min_samples:
+                timeout = self.multiplier * _percentile(warm, self.percentile)
+                reason = f"{self.multiplier:g} x p{self.percentile:g} of {len(warm)} requests"
+            else:
+                timeout, reason = self.default, f"default, only {len(warm)} of {self.min_samples} samples"
+
+        if timeout < self.floor:
+            return self.floor, f"{reason}, raised to floor"
+        if timeout > ceiling:
+            return ceiling, f"{reason}, capped at ceiling"
+        return timeout, reason
+
+    def get_stats(self) -> dict:
+        """Per model: sample counts and the timeouts that would be chosen now"""
+        stats = {}
+        for model in sorted(set(self._warm) | set(self._cold)):
+            warm_timeout, _ = self.compute(model)
+            cold_timeout, _ = self.compute(model, cold=True)
+            stats[model] = {
+                'warm_samples': len(self._warm.get(model, ())),
+                'cold_samples': len(self._cold.get(model, ())),
+                'warm_timeout': round(warm_timeout, 2),
+                'cold_timeout': round(cold_timeout, 2),
+            }
+        return stats
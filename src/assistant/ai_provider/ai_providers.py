@@ -1,9 +1,45 @@
 
 from abc import ABC, abstractmethod
+import asyncio
+import concurrent.futures
+import contextvars
+from contextlib import contextmanager
 from enum import Enum
-from datetime import datetime
 import time
 import threading
+from typing import Callable, Iterable, Iterator
+
+try:
+    from .adaptive_timeout import AdaptiveTimeout
+    from .circuit_breaker import CircuitBreaker, CircuitState
+    from .event_loop import BackgroundLoop
+    from .history import ConversationStats, QandALog, QuestionAndAnswer, estimate_tokens, intern_role
+    from .metrics import GenerationMetrics, MetricsWindow
+    from .rate_limit import FairRateLimiter, TokenReservation
+    from .retry import RETRY_BUDGET, RetryPolicy, is_retryable
+except ImportError:
+    from adaptive_timeout import AdaptiveTimeout
+    from circuit_breaker import CircuitBreaker, CircuitState
+    from event_loop import BackgroundLoop
+    from history import ConversationStats, QandALog, QuestionAndAnswer, estimate_tokens, intern_role
+    from metrics import GenerationMetrics, MetricsWindow
+    from rate_limit import FairRateLimiter, TokenReservation
+    from retry import RETRY_BUDGET, RetryPolicy, is_retryable
+
+"""Demo question asked outside the conversation to see if an offline provider is back"""
+PROBE_QUESTION = "Hello"
+
+"""Stop token of the request running in this context, with the id of the provider it belongs to"""
+_request_stop: contextvars.ContextVar[tuple[int, threading.Event] | None] = contextvars.ContextVar(
+    "request_stop", default=None
+)
+
+"""Token reserved for the requests of this context, with the id of the provider it belongs to"""
+_reserved_token: contextvars.ContextVar[tuple[int, TokenReservation] | None] = contextvars.ContextVar(
+    "reserved_token", default=None
+)
+
+
 class AiProviderStatus(Enum):
     IDLE = "Idle"
     BUSY = "Busy"
@@ -19,36 +55,6 @@ class AiProviderList(Enum):
     GEMINI = "Gemini"
     LLAMA = "GitHub Llama"
    
-class QuestionAndAnswer:
-    def __init__(
-        self,
-        question: str,
-        answer: str,
-        ):
-        self.question = question
-        self.answer = answer
-        self.timestamp =  datetime.now()
-        
-    def to_dict(self) -> dict:
-        return {
-            "question": self.question,
-            "answer": self.answer,
-            "timestamp": self.timestamp.isoformat()
-        }
-    
-    def __repr__(self) -> str:
-        return f"QuestionAndAnswer(question='{self.question[:50]}...', answer='{self.answer[:50]}...', timestamp={self.timestamp})"
-    
-    def __str__(self) -> str:
-        return f"Q: {self.question}\nA: {self.answer}\nTime: {self.timestamp}"
-
-
-    @classmethod
-    def from_dict(cls, data: dict):
-        # Note: timestamp is always set to current time in __init__
-        # The stored timestamp in data is for reference only
-        return cls(question=data["question"], answer=data["answer"])
-     
 class AIProvider(ABC):
     def __init__(self):
         self._status = AiProviderStatus.IDLE
@@ -56,26 +62,65 @@ class AIProvider(ABC):
         self._responses = []
         """List of messages in the conversation history"""
         self._messages: list[dict[str, str]] | list = []
-        self._QandAs: list[QuestionAndAnswer] = []
+        """Kept in step with _messages by add_message, trimming and replacing"""
+        self._conversation_stats = ConversationStats()
+        """The last answered questions, see QandALog for retention and spilling"""
+        self._QandAs = QandALog()
+        """Question of the request in flight, recorded with its answer"""
+        self._prompt: str = ""
         self._question_asked_time: float = 0.0
         self._answer_time: float = 0.0
         self._response_time: float = 0.0
         self._last_answer_time: float = 0.0  
+        """Backend reported usage of the request in flight, set by _call_api"""
+        self._usage: GenerationMetrics | None = None
+        self._last_metrics: GenerationMetrics | None = None
+        self._metrics_window = MetricsWindow()
         """Request Params"""
         self._temperature: float = 0.3
         self._max_tokens: int = 150
+        """Oldest turns are dropped once the history is estimated above this, None keeps everything"""
+        self.max_history_tokens: int | None = 2000
+        """Trimming goes down to this share of max_history_tokens, so the next turns do not trim
+        again and the caches built from the history (contexts, sessions) last a while"""
+        self.trim_ratio: float = 0.75
+        """Stream the answer where the provider supports it, chunks go to on_chunk"""
+        self.stream: bool = False
+        self.on_chunk: Callable[[str], None] | None = None
+        self._request_start: float = 0.0
+        self._first_chunk_time: float | None = None
         
         """For Threading"""
         self._thread: threading.Thread | None = None
-        self._timeout: int = 10  # Default timeout in seconds
-        self._stop_event: threading.Event = threading.Event()  
+        self._timeout: float = 10  # Default timeout in seconds
+        """Picks _timeout per request from observed latencies, None keeps it fixed"""
+        self.adaptive_timeout: AdaptiveTimeout | None = AdaptiveTimeout()
+        self.timeout_reason: str = "fixed"
+        self._request_cold: bool = False
+        """Transient API errors are retried with backoff until the request's deadline"""
+        self.retry_policy = RetryPolicy()
+        self._deadline: float = 0.0
+        """Queues requests when the API's rate limit is used up, None for unlimited"""
+        self.rate_limiter: FairRateLimiter | None = None
+        """Seconds the current request waited for a token, not counted as generation time"""
+        self._queue_wait: float = 0.0
+        self._queued_at: float | None = None
+        self._stop_event = threading.Event()
         self._last_result: str = ""  
+        """Request started with submit(), cancelled by cancel()"""
+        self._async_future: concurrent.futures.Future | None = None
+        """Fails fast after repeated errors, a probe thread brings the provider back"""
+        self.breaker = CircuitBreaker(on_state_change=self._on_breaker_change)
+        self._probe_thread: threading.Thread | None = None
     @property
-    def QandAs(self) -> list[QuestionAndAnswer]:
+    def QandAs(self) -> QandALog:
         return self._QandAs
     @QandAs.setter
-    def QandAs(self, value: list[QuestionAndAnswer]):
-        self._QandAs = value
+    def QandAs(self, value: Iterable[QuestionAndAnswer]):
+        """Replaces the entries, retention and spill path stay"""
+        q_and_as = QandALog(self._QandAs.max_entries, self._QandAs.spill_path)
+        q_and_as.extend(value)
+        self._QandAs = q_and_as
     
     def add_QandA(self, question: str, answer: str) -> None:
         q_and_a = QuestionAndAnswer(
@@ -87,27 +132,97 @@ class AIProvider(ABC):
     @property
     def thread(self) -> threading.Thread | None:
         return self._thread
+
+    @property
+    def _stop_event(self) -> threading.Event:
+        """
+        Stop token of the request this code runs for, else of the latest request.
+        Every request gets a new token, so starting the next one does not
+        un-cancel a worker that was abandoned on timeout or cancel().
+        """
+        request = _request_stop.get()
+        if request is not None and request[0] == id(self):
+            return request[1]
+        return self._latest_stop
+    @_stop_event.setter
+    def _stop_event(self, event: threading.Event) -> None:
+        self._latest_stop = event
+
+    def _new_stop_event(self, context: contextvars.Context | None = None) -> threading.Event:
+        """A fresh stop token for the next request, bound to `context` (default the current one)"""
+        stop = threading.Event()
+        self._stop_event = stop
+        if context is None:
+            _request_stop.set((id(self), stop))
+        else:
+            context.run(_request_stop.set, (id(self), stop))
+        return stop
     
     @property
-    def timeout(self) -> int:
+    def timeout(self) -> float:
+        """Timeout of the current or last request"""
         return self._timeout
     @timeout.setter
-    def timeout(self, value: int) -> None:
+    def timeout(self, value: float) -> None:
+        """Setting a timeout turns the adaptive one off"""
         self._timeout = value
+        self.adaptive_timeout = None
+        self.timeout_reason = "fixed"
+
+    def choose_timeout(self) -> float:
+        """Set _timeout for the next request from the latencies seen so far"""
+        self._request_cold = self._is_cold()
+        if self.adaptive_timeout is not None:
+            self._timeout, self.timeout_reason = self.adaptive_timeout.compute(self._model_name(), self._request_cold)
+        return self._timeout
+
+    def _is_cold(self) -> bool:
+        """True when the next request will pay a start-up cost, e.g. loading the model"""
+        return False
+
+    def get_timeout_stats(self) -> dict:
+        stats = {'timeout': self._timeout, 'reason': self.timeout_reason}
+        if self.adaptive_timeout is not None:
+            stats['models'] = self.adaptive_timeout.get_stats()
+        return stats
         
     def ask_with_timeout(self, prompt: str) -> str:
+        """Ask with timeout, failing fast while the circuit breaker is open"""
+        if not self.breaker.allow_request():
+            print(f"⛔ {self.name} is offline, not asking")
+            return ""
+        self.choose_timeout()
+        result = self._ask_in_thread(prompt)
+        self._record_outcome(result)
+        return result
+
+    def _ask_in_thread(self, prompt: str) -> str:
         """Ask with timeout - kills thread if it takes too long"""
-        self._stop_event.clear()  
+        self._queue_wait = 0.0
         
-        # Create and start thread
-        self._thread = threading.Thread(target=self._ask_with_stop_check, args=(prompt,))
+        # Create and start thread, it sees the caller's context variables (current user)
+        # and its own stop token
+        context = contextvars.copy_context()
+        stop = self._new_stop_event(context)
+        self._thread = threading.Thread(target=context.run, args=(self._ask_with_stop_check, prompt))
         self._thread.daemon = True  # Make it a daemon thread
         self._thread.start()
         
-        self._thread.join(timeout=self._timeout)
+        deadline = time.monotonic() + self._timeout
+        # Poll so that cancel() releases the caller right away
+        while self._thread.is_alive() and not stop.is_set():
+            # Waiting in the rate limit queue does not count against the timeout
+            remaining = deadline + self._queue_time() - time.monotonic()
+            if remaining <= 0:
+                break
+            self._thread.join(timeout=min(remaining, 0.05))
+        if stop.is_set() and self.status != AiProviderStatus.TIMEOUT:
+            print(f"🛑 {self.name} request cancelled")
+            self.status = AiProviderStatus.IDLE
+            return ""
         if self._thread.is_alive():
-            print(f"⚠️ {self.name} request timed out after {self._timeout} seconds")
-            self._stop_event.set() 
+            print(f"⚠️ {self.name} request timed out after {self._timeout:.1f} seconds ({self.timeout_reason})")
+            stop.set() 
             self._thread.join(timeout=0.5)
             if self._thread.is_alive():
                 print(f"❌ {self.name} with id {self._thread.ident} did not stop")
@@ -117,6 +232,141 @@ class AIProvider(ABC):
         # Thread completed successfully
         return getattr(self, '_last_result', '')
     
+    @contextmanager
+    def reserved_token(self, stop_event: threading.Event | None = None) -> Iterator[bool]:
+        """
+        Wait for a rate limit token before asking inside the block, e.g. before
+        queueing for a scheduler slot so the wait does not hold the slot. Only
+        a request of this provider asked from this context (or threads started
+        from it) takes the token; unused, it goes back to the limiter on exit.
+        Yields False if stop_event was set first.
+        """
+        if self.rate_limiter is None:
+            yield True
+            return
+        if not self.rate_limiter.acquire(stop_event=stop_event):
+            yield False
+            return
+        reservation = TokenReservation(self.rate_limiter)
+        binding = _reserved_token.set((id(self), reservation))
+        try:
+            yield True
+        finally:
+            _reserved_token.reset(binding)
+            reservation.release()
+
+    def _reservation(self) -> TokenReservation | None:
+        """The unused token reserved for this provider in this context, if any"""
+        reserved = _reserved_token.get()
+        if reserved is not None and reserved[0] == id(self) and not reserved[1].used:
+            return reserved[1]
+        return None
+
+    def _acquire_token(self) -> TokenReservation | None:
+        """
+        The reserved token, else wait for one from the rate limiter. None if
+        cancelled. The caller take()s it when calling the API and releases it
+        on every path.
+        """
+        reservation = self._reservation()
+        if reservation is not None:
+            return reservation
+        if self.rate_limiter is None:
+            self._queue_wait = 0.0
+            return TokenReservation(None)
+        self._queued_at = time.monotonic()
+        try:
+            has_token = self.rate_limiter.acquire(stop_event=self._stop_event)
+        finally:
+            self._queue_wait = time.monotonic() - self._queued_at
+            self._queued_at = None
+        if self._queue_wait > 0.01:
+            print(f"🚦 {self.name}: waited {self._queue_wait:.2f}s for the rate limit")
+        return TokenReservation(self.rate_limiter) if has_token else None
+
+    def _queue_time(self) -> float:
+        """Seconds the current request has spent in the rate limit queue so far"""
+        queued_at = self._queued_at
+        if queued_at is not None:
+            return time.monotonic() - queued_at
+        return self._queue_wait
+
+    def _record_outcome(self, result: str) -> None:
+        """Feed the circuit breaker, cancelled requests count neither way"""
+        if self.status == AiProviderStatus.TIMEOUT and self.adaptive_timeout is not None:
+            # The real latency is unknown but at least this long
+            self.adaptive_timeout.record(self._model_name(), self._timeout, self._request_cold)
+        if self.status in (AiProviderStatus.ERROR, AiProviderStatus.TIMEOUT):
+            self.breaker.record_failure()
+        elif result:
+            self.breaker.record_success()
+
+    def _on_breaker_change(self, old: CircuitState, new: CircuitState) -> None:
+        if new is CircuitState.OPEN:
+            self.status = AiProviderStatus.OFFLINE
+            print(f"⛔ {self.name} marked offline, probing again in {self.breaker.recovery_timeout:g}s")
+            if self._probe_thread is None or not self._probe_thread.is_alive():
+                self._probe_thread = threading.Thread(target=self._probe_loop, daemon=True)
+                self._probe_thread.start()
+        elif new is CircuitState.CLOSED:
+            self.status = AiProviderStatus.IDLE
+            print(f"✅ {self.name} is back online")
+
+    def _probe_loop(self) -> None:
+        """Runs while the breaker is not closed, asking PROBE_QUESTION after each recovery timeout"""
+        while self.breaker.state is not CircuitState.CLOSED:
+            time.sleep(max(self.breaker.time_until_probe(), 0.05))
+            if not self.breaker.start_probe():
+                continue
+            if self.probe():
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
+
+    def probe(self) -> bool:
+        """
+        Ask PROBE_QUESTION without touching the history, True if a real answer came back.
+        The probe queues for the rate limit like any request and is never streamed,
+        so its answer is not spoken.
+        """
+        result: dict[str, str] = {}
+        stop = threading.Event()
+
+        def run() -> None:
+            try:
+                if self.rate_limiter is not None and not self.rate_limiter.acquire(user="probe", stop_event=stop):
+                    return
+                result['answer'] = self._call_api(PROBE_QUESTION)
+            except Exception as e:
+                print(f"⚠️ {self.name} probe failed: {e}")
+
+        # No request runs while the breaker is open, only the probe sees these
+        stream, on_chunk = self.stream, self.on_chunk
+        self.stream, self.on_chunk = False, None
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        try:
+            thread.join(timeout=self._timeout)
+        finally:
+            stop.set()
+            self.stream, self.on_chunk = stream, on_chunk
+        return bool(result.get('answer')) and self.status != AiProviderStatus.ERROR
+
+    def get_breaker_states(self) -> dict[str, dict]:
+        return {self.name: self.breaker.to_dict()}
+
+    def cancel(self) -> None:
+        """Abandon the request in flight, its answer is discarded"""
+        self._stop_event.set()
+        if self._async_future is not None:
+            self._async_future.cancel()
+
+    def warm_up(self) -> None:
+        """Get ready to answer quickly, e.g. load the model. Default does nothing"""
+
+    def release(self) -> None:
+        """Undo warm_up() when the provider is no longer in use"""
+
     def _ask_with_stop_check(self, prompt: str) -> None:
         """Internal method that checks for stop signal during execution"""
         try:
@@ -129,7 +379,8 @@ class AIProvider(ABC):
         except Exception as e:
             if not self._stop_event.is_set():
                 print(f"Error in thread: {e}")
-                self._last_result = f"Error: {e}"
+                self.status = AiProviderStatus.ERROR
+                self._last_result = ""
 
     @abstractmethod
     def ask(self, prompt: str) -> str:
@@ -138,8 +389,7 @@ class AIProvider(ABC):
         if hasattr(self, '_stop_event') and self._stop_event.is_set():
             return "Request was cancelled due to timeout"
 
-        message = {"role": "user", "content": prompt}
-        self._messages.append(message)
+        # The user message is added to the history by _generic_ask
         # Don't return anything - let subclasses handle the actual response
         return ""  # Return empty string instead of None
     
@@ -155,27 +405,213 @@ class AIProvider(ABC):
             return "Please provide a valid prompt."
         print("DEBUG: Prompt validation passed, proceeding...")
         
+        token = self._acquire_token()
+        if token is None:
+            return "Request was cancelled"
         try:
-            self.status = AiProviderStatus.BUSY
-            self.add_message("user", prompt)
-            
-            # Check for stop signal before API call
-            if hasattr(self, '_stop_event') and self._stop_event.is_set():
-                self.status = AiProviderStatus.ERROR
+            if not self._start_request(prompt):
                 return "Request was cancelled"
+            token.take()
             
             # Send full conversation history for context
-            self.answer = self._call_api(self.messages)
-            self.status = AiProviderStatus.IDLE
-            self.add_QandA(
-                self.messages[-1]['content'], 
-                self.answer
-            )
-            return self.answer
+            self.answer = self._call_with_retry(self.messages)
+            return self._finish_request()
+        except Exception as e:
+            # Nothing worth speaking came back, the status tells the caller
+            self.status = AiProviderStatus.ERROR
+            print(f"❌ Error communicating with {self.name}: {e}")
+            return ""
+        finally:
+            # Back to the limiter unless the API was called
+            token.release()
+
+    async def _generic_ask_async(self, prompt: str) -> str:
+        """_generic_ask for providers with a native _call_api_async"""
+        if not prompt or not prompt.strip():
+            print(f"{ self.name }: Prompt validation failed")
+            return "Please provide a valid prompt."
+        # Acquired by ask_async, a direct caller is not rate limited
+        token = self._reservation()
+        try:
+            if not self._start_request(prompt):
+                return "Request was cancelled"
+            if token is not None:
+                token.take()
+            self.answer = await self._call_with_retry_async(self.messages)
+            return self._finish_request()
         except Exception as e:
             self.status = AiProviderStatus.ERROR
-            return f"Error communicating with {self.name}: {e}"
+            print(f"❌ Error communicating with {self.name}: {e}")
+            return ""
+        finally:
+            if token is not None:
+                token.release()
+
+    def _call_with_retry(self, message: list[dict[str, str]] | str) -> str:
+        """_call_api, retrying transient errors while budget and deadline allow"""
+        RETRY_BUDGET.record_request()
+        attempt = 0
+        while True:
+            try:
+                return self._call_api(message)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None or self._stop_event.wait(delay):
+                    raise
+                attempt += 1
+
+    async def _call_with_retry_async(self, message: list[dict[str, str]] | str) -> str:
+        RETRY_BUDGET.record_request()
+        attempt = 0
+        while True:
+            try:
+                return await self._call_api_async(message)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    def _retry_delay(self, error: Exception, attempt: int) -> float | None:
+        """Seconds to wait before retrying after `error`, None to give up"""
+        if not is_retryable(error) or attempt + 1 >= self.retry_policy.max_attempts:
+            return None
+        if self._first_chunk_time is not None:
+            # Part of the answer was already streamed out, a retry would repeat it
+            return None
+        delay = self.retry_policy.delay(attempt, error)
+        if self._stop_event.is_set() or time.monotonic() + delay >= self._deadline:
+            return None
+        if not RETRY_BUDGET.try_spend():
+            print(f"⚠️ {self.name}: retry budget exhausted, not retrying")
+            return None
+        if self.rate_limiter is not None and not self.rate_limiter.try_acquire():
+            print(f"⚠️ {self.name}: rate limit reached, not retrying")
+            return None
+        print(f"🔁 {self.name}: {error}, retry {attempt + 1} in {delay:.2f}s")
+        return delay
+
+    def _start_request(self, prompt: str) -> bool:
+        """Record the question, False if the request was cancelled meanwhile"""
+        self.status = AiProviderStatus.BUSY
+        self._prompt = prompt
+        self.add_message("user", prompt)
+        self._trim_history()
+        
+        # Check for stop signal before API call
+        if hasattr(self, '_stop_event') and self._stop_event.is_set():
+            self.status = AiProviderStatus.ERROR
+            return False
+        self._usage = None
+        self._first_chunk_time = None
+        self._request_start = time.perf_counter()
+        self._deadline = time.monotonic() + self._timeout
+        return True
+
+    def _finish_request(self) -> str:
+        if self.status != AiProviderStatus.ERROR:
+            self._record_metrics(time.perf_counter() - self._request_start)
+            # A failed request stays in ERROR so callers and the breaker can see it
+            self.status = AiProviderStatus.IDLE
+        self.add_QandA(
+            self._prompt,
+            self.answer
+        )
+        return self.answer
+
+    """Providers that implement _call_api_async set this, the others run ask() in a thread"""
+    native_async: bool = False
+
+    async def _call_api_async(self, message: list[dict[str, str]] | str) -> str:
+        """Non-blocking _call_api, only for providers with native_async"""
+        raise NotImplementedError(f"{self.name} has no native async API")
+
+    async def ask_async(self, prompt: str, timeout: float | None = None) -> str:
+        """
+        Coroutine version of ask_with_timeout. The timeout is enforced with
+        asyncio.wait_for and cancelling the awaiting task cancels the request.
+        Providers without a native async API run ask() in a worker thread,
+        which is told to stop through _stop_event.
+        """
+        if not self.breaker.allow_request():
+            print(f"⛔ {self.name} is offline, not asking")
+            return ""
+        if timeout is None:
+            timeout = self.choose_timeout()
+        else:
+            self._timeout, self.timeout_reason = timeout, "set by caller"
+        # Bound to this task, asyncio.to_thread below passes it on to the worker
+        self._new_stop_event()
+        self._queue_wait = 0.0
+        # Queue for the rate limit before the timeout starts
+        token = await asyncio.to_thread(self._acquire_token)
+        if token is None:
+            return ""
+        # The request below takes it, also from the worker thread
+        binding = _reserved_token.set((id(self), token))
+        try:
+            if self.native_async:
+                request = self._generic_ask_async(prompt)
+            else:
+                request = asyncio.to_thread(self.ask, prompt)
+            result = await asyncio.wait_for(request, timeout)
+        except asyncio.TimeoutError:
+            self._stop_event.set()
+            print(f"⚠️ {self.name} request timed out after {timeout:.1f} seconds ({self.timeout_reason})")
+            self.status = AiProviderStatus.TIMEOUT
+            result = ""
+        except asyncio.CancelledError:
+            self._stop_event.set()
+            print(f"🛑 {self.name} request cancelled")
+            self.status = AiProviderStatus.IDLE
+            raise
+        finally:
+            _reserved_token.reset(binding)
+            token.release()
+        self._record_outcome(result)
+        return result
+
+    def submit(self, prompt: str, timeout: float | None = None) -> concurrent.futures.Future:
+        """Run ask_async on the shared background loop, for synchronous callers"""
+        future = BackgroundLoop.get().submit(self.ask_async(prompt, timeout))
+        self._async_future = future
+        return future
     
+    def _record_metrics(self, wall_time: float) -> None:
+        metrics = self._usage or GenerationMetrics()
+        metrics.provider = self.name
+        metrics.model = self._model_name()
+        metrics.wall_time = wall_time
+        metrics.queue_time = self._queue_wait if self.rate_limiter is not None else None
+        metrics.first_chunk_time = self._first_chunk_time
+        self._last_metrics = metrics
+        self._metrics_window.add(metrics)
+        self._conversation_stats.record_latency(wall_time)
+        if self.adaptive_timeout is not None:
+            self.adaptive_timeout.record(metrics.model, wall_time, self._request_cold)
+        self._usage = None
+
+    def _model_name(self) -> str:
+        model = getattr(self, "model", "")
+        return str(getattr(model, "model_name", model))
+
+    def _emit_chunk(self, text: str) -> None:
+        """Hand a streamed piece of the answer to on_chunk"""
+        if self._first_chunk_time is None:
+            self._first_chunk_time = time.perf_counter() - self._request_start
+        if self.on_chunk is not None and text:
+            self.on_chunk(text)
+
+    @property
+    def last_metrics(self) -> GenerationMetrics | None:
+        """Metrics of the last successful request"""
+        return self._last_metrics
+
+    def get_generation_stats(self) -> dict:
+        """Rolling averages over recent requests, tells model time from network time"""
+        return self._metrics_window.get_stats()
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -219,38 +655,102 @@ class AIProvider(ABC):
         """ For getting question response time """
         self._question_asked_time = time.time()
         self._messages = value
+        self._conversation_stats.reset(value)
     
     def add_message(self, role: str, content: str) -> None:
         """Method to add a message to the messages list"""
-        self._messages.append({"role": role, "content": content})
+        message = {"role": intern_role(role), "content": content}
+        self._messages.append(message)
+        self._running_stats().add(message)
+
+    def _running_stats(self) -> ConversationStats:
+        """The running stats, recounted only if the list was changed behind our back"""
+        if self._conversation_stats.total != len(self._messages):
+            self._conversation_stats.reset(self._messages)
+        return self._conversation_stats
+
+    def _pop_message(self, index: int) -> dict[str, str]:
+        message = self._messages.pop(index)
+        self._conversation_stats.remove(message)
+        return message
     
+    def _trim_history(self) -> int:
+        """Drop the oldest non-system messages until the history fits the token budget"""
+        if self.max_history_tokens is None:
+            return 0
+        stats = self._running_stats()
+        if stats.tokens <= self.max_history_tokens:
+            return 0
+        target = self.max_history_tokens * self.trim_ratio
+        dropped = 0
+        while stats.tokens > target:
+            # Never drop system messages or the question being asked
+            index = next((i for i in range(len(self._messages) - 1) if self._messages[i]['role'] != 'system'), None)
+            if index is None:
+                break
+            self._pop_message(index)
+            dropped += 1
+            # Take the reply with it so the history does not start with an answer
+            if index < len(self._messages) - 1 and self._messages[index]['role'] == 'assistant':
+                self._pop_message(index)
+                dropped += 1
+        if dropped:
+            self._invalidate_history()
+            print(f"✂️ {self.name}: dropped {dropped} old messages to stay within {self.max_history_tokens} tokens")
+        return dropped
+
     def clear_messages(self) -> None:
         """Method to clear the messages list"""
         self._messages = []
+        self._conversation_stats.reset()
+        self._invalidate_history()
         print("Conversation history cleared")
 
+    def replace_messages(self, messages: list[dict[str, str]]) -> None:
+        """Swap in a different history, e.g. one kept by a router"""
+        self._messages = messages
+        self._conversation_stats.reset(messages)
+        self._invalidate_history()
+
+    def _invalidate_history(self) -> None:
+        """Drop any state derived from the history (sessions, contexts), it no longer matches"""
+
+    def new_conversation(self) -> "AIProvider":
+        """A provider set up like this one but with an empty history, for another conversation"""
+        provider = self._new_instance()
+        provider._temperature = self._temperature
+        provider._max_tokens = self._max_tokens
+        provider.max_history_tokens = self.max_history_tokens
+        provider.trim_ratio = self.trim_ratio
+        provider.QandAs.max_entries = self._QandAs.max_entries
+        provider.QandAs.spill_path = self._QandAs.spill_path
+        provider.stream = self.stream
+        provider.retry_policy = self.retry_policy
+        provider.rate_limiter = self.rate_limiter
+        # Same backend: failures, learned timeouts and latencies count together,
+        # and only this provider probes while the breaker is open
+        provider.breaker = self.breaker
+        provider.adaptive_timeout = self.adaptive_timeout
+        provider._timeout = self._timeout
+        provider._metrics_window = self._metrics_window
+        return provider
+
+    def _new_instance(self) -> "AIProvider":
+        """Override when the constructor needs arguments, e.g. an API key"""
+        return type(self)()
+
     """HACK: Refactor this. to smaller methods"""
     def show_conversation_history(self) -> None:
         """Display the current conversation history"""
-        print(f"\n📝 Conversation History ({len(self.messages)} messages):")
+        stats = self._running_stats()
+        print(f"\n📝 Conversation History ({stats.total} messages, ~{stats.tokens} tokens):")
         for i, msg in enumerate(self.messages):
             print(f"  {i+1}. {msg['role'].upper()}: {msg['content'][:100]}{'...' if len(msg['content']) > 100 else ''}")
         print()
 
     def get_conversation_stats(self) -> dict:
-        """Get statistics about the current conversation"""
-        user_messages = [msg for msg in self.messages if msg['role'] == 'user']
-        assistant_messages = [msg for msg in self.messages if msg['role'] == 'assistant']
-
-        total_chars = sum(len(msg['content']) for msg in self.messages)
-
-        return {
-            'total_messages': len(self.messages),
-            'user_messages': len(user_messages),
-            'assistant_messages': len(assistant_messages),
-            'total_characters': total_chars,
-            'avg_message_length': total_chars / len(self.messages) if self.messages else 0
-        }
+        """Get statistics about the current conversation, from running totals"""
+        return self._running_stats().to_dict()
     def test_timeout(self) -> None:
         """Test the timeout functionality"""
         print(f"🧪 Testing {self.name} timeout (set to {self._timeout} seconds)")
@@ -260,8 +760,8 @@ class AIProvider(ABC):
         print(f"✅ Quick response: {result[:50]}...")
         
         # Test with timeout by setting a very short timeout
-        original_timeout = self._timeout
-        self._timeout = 1  # Very short timeout for testing
+        original_timeout, adaptive_timeout = self._timeout, self.adaptive_timeout
+        self.timeout = 1  # Very short timeout for testing
         
         import time
         start_time = time.time()
@@ -272,7 +772,7 @@ class AIProvider(ABC):
         print(f"📝 Result: {result}")
         
         # Restore original timeout
-        self._timeout = original_timeout 
+        self._timeout, self.adaptive_timeout = original_timeout, adaptive_timeout
     @property 
     def response_time(self) -> float:
         """Calculate and return the response time for the last interaction"""
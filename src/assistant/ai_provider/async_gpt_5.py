@@ -0,0 +1,143 @@
+import asyncio
+import concurrent.futures
+
+from azure.ai.inference.aio import ChatCompletionsClient
+from azure.ai.inference.models import UserMessage
+from azure.core.credentials import AzureKeyCredential
+
+# Custom Import
+try:
+    from .ai_providers import AIProvider, AiProviderList, AiProviderStatus
+    from .event_loop import BackgroundLoop
+    from .github_gpt_5 import azure_wire_history, token
+    from .metrics import GenerationMetrics
+    from .rate_limit import shared_limiter
+except ImportError:
+    from ai_providers import AIProvider, AiProviderList, AiProviderStatus
+    from event_loop import BackgroundLoop
+    from github_gpt_5 import azure_wire_history, token
+    from metrics import GenerationMetrics
+    from rate_limit import shared_limiter
+
+
+class AsyncGPT_5(AIProvider):
+    """
+    GitHub GPT-5 on the SDK's asyncio client, streaming by default.
+
+    The generation runs as a coroutine on the shared BackgroundLoop, so it
+    does not hold a worker thread while tokens arrive; `ask()` still works
+    for synchronous callers by waiting on it. One client per endpoint and
+    token is shared by all instances and kept open between requests.
+    """
+    _clients: dict[tuple[str, str], ChatCompletionsClient] = {}
+
+    def __init__(self, api_token: str = ""):
+        super().__init__()
+        self.endpoint = "https://models.github.ai/inference"
+        self.model = "openai/gpt-5"
+        self.rate_limiter = shared_limiter("GitHub Models")
+        self.token = api_token or token
+        if not self.token:
+            raise ValueError(
+                "GITHUB_GPT_5_TOKEN environment variable not set or api_token not provided"
+            )
+        self.stream = True
+        self.loop = BackgroundLoop.get()
+        self._wire_history = azure_wire_history()
+
+    @property
+    def name(self) -> str:
+        return AiProviderList.GITHUB_GPT_5.value
+
+    @property
+    def client(self) -> ChatCompletionsClient:
+        """Created on first use, it must live on the background loop"""
+        key = (self.endpoint, self.token)
+        if key not in self._clients:
+            self._clients[key] = ChatCompletionsClient(
+                endpoint=self.endpoint,
+                credential=AzureKeyCredential(self.token),
+            )
+        return self._clients[key]
+
+    def _call_api(self, message: list[dict[str, str]] | str) -> str:
+        """Run the coroutine on the shared loop and wait for it"""
+        future = self.loop.submit(self._complete(message))
+        # Wake up regularly so cancel() also stops the coroutine
+        while True:
+            try:
+                return future.result(timeout=0.1)
+            except concurrent.futures.TimeoutError:
+                if self._stop_event.is_set():
+                    future.cancel()
+                    return ""
+
+    native_async = True
+
+    async def _call_api_async(self, message: list[dict[str, str]] | str) -> str:
+        """The client lives on the background loop, hop over to it when called from another loop"""
+        if asyncio.get_running_loop() is self.loop.loop:
+            return await self._complete(message)
+        return await asyncio.wrap_future(self.loop.submit(self._complete(message)))
+
+    async def _complete(self, message: list[dict[str, str]] | str) -> str:
+        messages = [UserMessage(message)] if isinstance(message, str) else self._wire_history.sync(message)
+        # A stream only reports usage when asked to, in a last chunk without choices
+        extras = {"stream_options": {"include_usage": True}} if self.stream else None
+        response = await self.client.complete(
+            messages=messages, model=self.model, stream=self.stream, model_extras=extras
+        )
+
+        if self.stream:
+            chunks = []
+            usage = None
+            async for update in response:
+                if self._stop_event.is_set():
+                    break
+                if update.choices and update.choices[0].delta.content:
+                    chunks.append(update.choices[0].delta.content)
+                    self._emit_chunk(chunks[-1])
+                # Only the final chunk carries it
+                usage = getattr(update, "usage", None) or usage
+            await response.aclose()
+            assistant_response = "".join(chunks)
+        else:
+            assistant_response = response.choices[0].message.content
+            usage = getattr(response, "usage", None)
+        self._usage = GenerationMetrics.from_usage(
+            getattr(usage, "prompt_tokens", None), getattr(usage, "completion_tokens", None)
+        )
+
+        if isinstance(message, list):
+            self.add_message("assistant", assistant_response)
+        return assistant_response
+
+    def _invalidate_history(self) -> None:
+        self._wire_history.invalidate()
+
+    def _new_instance(self) -> "AsyncGPT_5":
+        return AsyncGPT_5(self.token)
+
+    def ask(self, prompt: str) -> str:
+        """Use the generic ask implementation from base class"""
+        super().ask(prompt)
+        return self._generic_ask(prompt)
+
+    @classmethod
+    async def close_clients(cls) -> None:
+        clients, cls._clients = list(cls._clients.values()), {}
+        await asyncio.gather(*(client.close() for client in clients))
+
+
+if __name__ == "__main__":
+    if not token:
+        print("⚠️ Please set GITHUB_GPT_5_TOKEN environment variable to test GitHub GPT-5 provider")
+        exit(1)
+
+    gpt5 = AsyncGPT_5()
+    gpt5.on_chunk = lambda text: print(text, end="", flush=True)
+    for q in ["Hello! My name is Arun CS", "What's my name?"]:
+        print(f"\n🐸 Arun > {q}\n🤖 GPT-5 > ", end="")
+        gpt5.ask(q)
+        print(f"\n⏳ First chunk {gpt5.last_metrics.first_chunk_time or 0:.2f}s, total {gpt5.last_metrics.wall_time:.2f}s")
+    gpt5.loop.run(AsyncGPT_5.close_clients())
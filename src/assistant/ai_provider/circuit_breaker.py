@@ -0,0 +1,103 @@
+import threading
+import time
+from enum import Enum
+from typing import Callable
+
+
+class CircuitState(Enum):
+    CLOSED = "Closed"
+    OPEN = "Open"
+    HALF_OPEN = "Half-open"
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests to a provider that keeps failing.
+
+    CLOSED lets requests through and counts consecutive failures. After
+    `failure_threshold` of them it goes OPEN and requests fail fast. Once
+    `recovery_timeout` seconds have passed a probe may move it to HALF_OPEN
+    for one trial request, which closes it on success and opens it again
+    on failure.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        recovery_timeout: float = 30.0,
+        on_state_change: Callable[[CircuitState, CircuitState], None] | None = None,
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        """Called with (old, new) after every transition, outside the lock"""
+        self.on_state_change = on_state_change
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        """How often the breaker opened and how many requests it turned away"""
+        self.trips = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> CircuitState:
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Only a closed breaker lets requests through, the half-open trial is the probe's"""
+        with self._lock:
+            if self._state is CircuitState.CLOSED:
+                return True
+            self.rejected += 1
+            return False
+
+    def time_until_probe(self) -> float:
+        if self._state is not CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.recovery_timeout - time.monotonic())
+
+    def start_probe(self) -> bool:
+        """Move an open breaker whose recovery timeout passed to HALF_OPEN"""
+        with self._lock:
+            if self._state is not CircuitState.OPEN or self.time_until_probe() > 0:
+                return False
+            old = self._set_state(CircuitState.HALF_OPEN)
+        self._notify(old, CircuitState.HALF_OPEN)
+        return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            if self._state is CircuitState.CLOSED:
+                return
+            old = self._set_state(CircuitState.CLOSED)
+        self._notify(old, CircuitState.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state is CircuitState.OPEN:
+                return
+            if self._state is CircuitState.CLOSED and self._failures < self.failure_threshold:
+                return
+            self._opened_at = time.monotonic()
+            self.trips += 1
+            old = self._set_state(CircuitState.OPEN)
+        self._notify(old, CircuitState.OPEN)
+
+    def _set_state(self, state: CircuitState) -> CircuitState:
+        old, self._state = self._state, state
+        return old
+
+    def _notify(self, old: CircuitState, new: CircuitState) -> None:
+        if self.on_state_change is not None:
+            self.on_state_change(old, new)
+
+    def to_dict(self) -> dict:
+        return {
+            'state': self._state.value,
+            'consecutive_failures': self._failures,
+            'trips': self.trips,
+            'rejected': self.rejected,
+            'retry_in': round(self.time_until_probe(), 1),
+        }
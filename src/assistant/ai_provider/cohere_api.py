@@ -5,16 +5,33 @@ COHERE_API_KEY = "H3I7iZKSxqEtRjhFkIhvLyaO7O3m6hV8JOZ0Jj3p"
 # Custom Imports
 try:
     from .ai_providers import AIProvider, AiProviderList, AiProviderStatus
+    from .metrics import GenerationMetrics
+    from .rate_limit import shared_limiter
 except ImportError:
     from ai_providers import AIProvider, AiProviderList, AiProviderStatus
+    from metrics import GenerationMetrics
+    from rate_limit import shared_limiter
+
+def to_cohere_message(msg: dict[str, str]) -> cohere.Message:
+    if msg['role'] == 'user':
+        return cohere.UserMessage(message=msg['content'])
+    return cohere.ChatbotMessage(message=msg['content'])
+
 
 class CohereAPI(AIProvider):
     def __init__(self, api_key: str = COHERE_API_KEY):
         super().__init__()
+        self.api_key = api_key
         self.client = cohere.Client(api_key)
+        self.rate_limiter = shared_limiter("Cohere")
         # Use base class defaults or override as needed
         # self.temperature = 0.3  # already set in base class
         # self.max_tokens = 150   # already set in base class
+        """Structured history matching `messages` minus the question being asked"""
+        self._chat_history: list[cohere.Message] = []
+        self._preamble: str | None = None
+        """Number of messages of `messages` that _chat_history covers"""
+        self._chat_length = 0
 
     @property
     def name(self) -> str:
@@ -22,41 +39,80 @@ class CohereAPI(AIProvider):
 
     def _call_api(self, message: list[dict[str, str]] | str) -> str:
         """Implementation of the abstract _call_api method for Cohere"""
-        try:
-            # Prepare message for Cohere API
-            if isinstance(message, str):
-                # Single message
-                chat_message = message
-            else:
-                # Full conversation history - format for Cohere
-                # Cohere's chat API expects a single message string, so we'll format the conversation
-                formatted_messages = []
-                for msg in message:
-                    role = "Human" if msg['role'] == 'user' else "Assistant"
-                    formatted_messages.append(f"{role}: {msg['content']}")
-                chat_message = "\n".join(formatted_messages)
-
-            response = self.client.chat(
-                message=chat_message,
-                temperature=self._temperature,
-                max_tokens=self._max_tokens
-            )
-
-            # Extract assistant's response
-            assistant_response = response.text.strip()
-            if isinstance(message, list):
-                self.add_message("assistant", assistant_response)
-
-            return assistant_response
-
-        except Exception as e:
-            self.status = AiProviderStatus.ERROR
-            return f"Error communicating with Cohere API: {e}"
+        # Prepare message for Cohere API
+        if isinstance(message, str):
+            # Single message
+            chat_message, chat_history = message, []
+        else:
+            self._sync_history(message)
+            chat_message, chat_history = message[-1]['content'], self._chat_history
+
+        request = dict(
+            message=chat_message,
+            chat_history=chat_history,
+            preamble=self._preamble if chat_history is self._chat_history else None,
+            temperature=self._temperature,
+            max_tokens=self._max_tokens
+        )
+        if self.stream:
+            assistant_response = self._read_stream(self.client.chat_stream(**request))
+        else:
+            response = self.client.chat(**request)
+            self._record_usage(response)
+            assistant_response = response.text
+
+        # Extract assistant's response
+        assistant_response = assistant_response.strip()
+        if isinstance(message, list):
+            self._chat_history.append(to_cohere_message(message[-1]))
+            self.add_message("assistant", assistant_response)
+            self._chat_history.append(to_cohere_message(self.messages[-1]))
+            self._chat_length = len(self.messages)
+
+        return assistant_response
+
+    def _sync_history(self, message: list[dict[str, str]]) -> None:
+        """Convert only new turns, rebuild when the history was cleared or trimmed"""
+        if len(message) == self._chat_length + 1:
+            return
+        history = message[:-1]
+        system = [msg['content'] for msg in history if msg['role'] == 'system']
+        self._preamble = "\n".join(system) if system else None
+        self._chat_history = [to_cohere_message(msg) for msg in history if msg['role'] != 'system']
+        self._chat_length = len(history)
+
+    def _read_stream(self, events) -> str:
+        chunks = []
+        for event in events:
+            if self._stop_event.is_set():
+                break
+            if event.event_type == "text-generation":
+                chunks.append(event.text)
+                self._emit_chunk(event.text)
+            elif event.event_type == "stream-end":
+                self._record_usage(event.response)
+        return "".join(chunks)
+
+    def _record_usage(self, response) -> None:
+        billed = getattr(getattr(response, "meta", None), "billed_units", None)
+        self._usage = GenerationMetrics.from_usage(
+            getattr(billed, "input_tokens", None), getattr(billed, "output_tokens", None)
+        )
+
+    def _invalidate_history(self) -> None:
+        self._chat_length = -1
+        self._chat_history = []
 
     def ask_cohere_api(self, message: list[dict[str, str]] | str) -> str:
         """Legacy method - now delegates to _call_api"""
         return self._call_api(message)
 
+    def _new_instance(self) -> "CohereAPI":
+        provider = CohereAPI(self.api_key)
+        # The client is thread safe, share its connections
+        provider.client = self.client
+        return provider
+
     def ask(self, prompt: str) -> str:
         """Use the generic ask implementation from base class"""
         super().ask(prompt)
@@ -0,0 +1,41 @@
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Coroutine
+
+
+class BackgroundLoop:
+    """
+    One asyncio event loop on a daemon thread, shared by the async providers.
+
+    The rest of the assistant is threaded and synchronous, so sync code hands
+    coroutines to this loop and waits on the result. Async clients that are
+    bound to a loop (the httpx AsyncClient of PooledSession and the azure aio
+    ChatCompletionsClient of AsyncGPT_5) are created and used only here.
+    """
+    _instance: "BackgroundLoop | None" = None
+    _lock = threading.Lock()
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True, name="provider-loop")
+        self._thread.start()
+
+    @classmethod
+    def get(cls) -> "BackgroundLoop":
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine, timeout: float | None = None) -> Any:
+        """Block until the coroutine finishes, cancelling it on timeout"""
+        future = self.submit(coro)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
@@ -3,14 +3,20 @@ from pathlib import Path
 
 import dotenv
 from azure.ai.inference import ChatCompletionsClient
-from azure.ai.inference.models import SystemMessage, UserMessage
+from azure.ai.inference.models import AssistantMessage, ChatRequestMessage, SystemMessage, UserMessage
 from azure.core.credentials import AzureKeyCredential
 
 # Custom Import
 try:
     from .ai_providers import AIProvider, AiProviderList, AiProviderStatus
+    from .history import WireHistory
+    from .metrics import GenerationMetrics
+    from .rate_limit import shared_limiter
 except ImportError:
     from ai_providers import AIProvider, AiProviderList, AiProviderStatus
+    from history import WireHistory
+    from metrics import GenerationMetrics
+    from rate_limit import shared_limiter
 
 from dotenv import load_dotenv
 
@@ -18,6 +24,22 @@ load_dotenv()
 
 token = os.getenv('GITHUB_GPT_5_TOKEN', '')
 
+SYSTEM_PROMPT = "You are a helpful AI assistant. Always reply briefly, clearly, and to the point."
+
+
+def to_azure_message(msg: dict[str, str]) -> ChatRequestMessage | None:
+    if msg["role"] == "user":
+        return UserMessage(msg["content"])
+    if msg["role"] == "assistant":
+        return AssistantMessage(msg["content"])
+    if msg["role"] == "system":
+        return SystemMessage(msg["content"])
+    return None
+
+
+def azure_wire_history() -> WireHistory:
+    """The history as SDK messages, only new turns are converted"""
+    return WireHistory(to_azure_message, prefix=[SystemMessage(SYSTEM_PROMPT)])
 
 
 class GPT_5(AIProvider):
@@ -25,6 +47,7 @@ class GPT_5(AIProvider):
         super().__init__()
         self.endpoint = "https://models.github.ai/inference"
         self.model = "openai/gpt-5"
+        self.rate_limiter = shared_limiter("GitHub Models")
 
         # Use provided token or environment variable
         self.token = api_token or token
@@ -37,7 +60,7 @@ class GPT_5(AIProvider):
             endpoint=self.endpoint,
             credential=AzureKeyCredential(self.token),
         )
-
+        self._wire_history = azure_wire_history()
 
     @property
     def name(self) -> str:
@@ -45,57 +68,37 @@ class GPT_5(AIProvider):
 
     def _call_api(self, message: list[dict[str, str]] | str) -> str:
         """Implementation of the abstract _call_api method for GitHub GPT-5"""
-        try:
-            # Prepare message for GitHub GPT-5 API
-            if isinstance(message, str):
-                # Single message
-                messages = [UserMessage(message)]
-            else:
-                # Full conversation history - convert to GitHub AI format
-                messages = []
-
-                # Add system message for context
-                messages.append(
-                    SystemMessage(
-                        "You are a helpful AI assistant. Always reply briefly, clearly, and to the point."
-                    )
-                )
-
-                # Convert conversation history
-                for msg in message:
-                    if msg["role"] == "user":
-                        messages.append(UserMessage(msg["content"]))
-                    elif msg["role"] == "assistant":
-                        # Note: GitHub AI format might not support assistant messages in history
-                        # For now, we'll focus on the latest user message
-                        pass
-
-                # If we have conversation history, use the last user message
-                if not any(
-                    isinstance(msg, UserMessage) for msg in messages[1:]
-                ):  # Skip system message
-                    # No user messages found, use the last message content
-                    last_msg = message[-1] if message else {"content": "Hello"}
-                    if last_msg.get("role") == "user":
-                        messages.append(UserMessage(last_msg["content"]))
-
-            response = self.client.complete(messages=messages, model=self.model)
-
-            assistant_response = response.choices[0].message.content
-
-            if isinstance(message, list):
-                self.add_message("assistant", assistant_response)
-
-            return assistant_response
-
-        except Exception as e:
-            self.status = AiProviderStatus.ERROR
-            return f"Error communicating with GitHub GPT-5 API: {e}"
+        # Prepare message for GitHub GPT-5 API
+        if isinstance(message, str):
+            # Single message
+            messages = [UserMessage(message)]
+        else:
+            # Full conversation history - new turns converted to GitHub AI format
+            messages = self._wire_history.sync(message)
+
+        response = self.client.complete(messages=messages, model=self.model)
+
+        assistant_response = response.choices[0].message.content
+        usage = getattr(response, "usage", None)
+        self._usage = GenerationMetrics.from_usage(
+            getattr(usage, "prompt_tokens", None), getattr(usage, "completion_tokens", None)
+        )
+
+        if isinstance(message, list):
+            self.add_message("assistant", assistant_response)
+
+        return assistant_response
 
     def get_answer(self, message):
         """Legacy method - now delegates to _call_api"""
         return self._call_api(message)
 
+    def _invalidate_history(self) -> None:
+        self._wire_history.invalidate()
+
+    def _new_instance(self) -> "GPT_5":
+        return GPT_5(self.token)
+
     def ask(self, prompt: str) -> str:
         """Use the generic ask implementation from base class"""
         super().ask(prompt)
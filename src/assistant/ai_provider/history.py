@@ -0,0 +1,277 @@
+import json
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+"""Wall clock time at monotonic() == 0, turns monotonic timestamps back into dates"""
+WALL_CLOCK_ANCHOR = time.time() - time.monotonic()
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count, about 4 characters per token for English"""
+    return len(text) // 4 + 1
+
+
+def intern_role(role: str) -> str:
+    """Every message of a role shares one role string, also after decoding a stored history"""
+    return sys.intern(role)
+
+
+class QuestionAndAnswer:
+    """One answered question. Slotted and timed with a float, there can be many of them"""
+    __slots__ = ("question", "answer", "created")
+
+    def __init__(
+        self,
+        question: str,
+        answer: str,
+        created: float | None = None,
+        ):
+        self.question = question
+        self.answer = answer
+        """time.monotonic() when it was answered"""
+        self.created = time.monotonic() if created is None else created
+
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromtimestamp(WALL_CLOCK_ANCHOR + self.created)
+
+    def to_dict(self) -> dict:
+        return {
+            "question": self.question,
+            "answer": self.answer,
+            "timestamp": self.timestamp.isoformat()
+        }
+
+    def __repr__(self) -> str:
+        return f"QuestionAndAnswer(question='{self.question[:50]}...', answer='{self.answer[:50]}...', timestamp={self.timestamp})"
+
+    def __str__(self) -> str:
+        return f"Q: {self.question}\nA: {self.answer}\nTime: {self.timestamp}"
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        # Without a stored timestamp it counts as answered now
+        created = None
+        if data.get("timestamp"):
+            created = datetime.fromisoformat(data["timestamp"]).timestamp() - WALL_CLOCK_ANCHOR
+        return cls(question=data["question"], answer=data["answer"], created=created)
+
+
+class ConversationStats:
+    """
+    Running totals of a history, updated on every added and dropped message
+    so reading them does not walk the history. Also a rolling average of
+    the last `window` response latencies.
+    """
+
+    def __init__(self, window: int = 50):
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._latency_sum = 0.0
+        self.reset()
+
+    def reset(self, messages: Iterable[dict[str, str]] = ()) -> None:
+        """Start over from `messages`, after the history was replaced"""
+        self.by_role: dict[str, int] = {}
+        self.total = 0
+        self.characters = 0
+        self.tokens = 0
+        for message in messages:
+            self.add(message)
+
+    def add(self, message: dict[str, str]) -> None:
+        self.by_role[message['role']] = self.by_role.get(message['role'], 0) + 1
+        self.total += 1
+        self.characters += len(message['content'])
+        self.tokens += estimate_tokens(message['content'])
+
+    def remove(self, message: dict[str, str]) -> None:
+        self.by_role[message['role']] -= 1
+        self.total -= 1
+        self.characters -= len(message['content'])
+        self.tokens -= estimate_tokens(message['content'])
+
+    def record_latency(self, seconds: float) -> None:
+        if len(self._latencies) == self._latencies.maxlen:
+            self._latency_sum -= self._latencies[0]
+        self._latencies.append(seconds)
+        self._latency_sum += seconds
+
+    def to_dict(self) -> dict:
+        latencies = len(self._latencies)
+        return {
+            'total_messages': self.total,
+            'user_messages': self.by_role.get('user', 0),
+            'assistant_messages': self.by_role.get('assistant', 0),
+            'system_messages': self.by_role.get('system', 0),
+            'total_characters': self.characters,
+            'avg_message_length': self.characters / self.total if self.total else 0,
+            'total_tokens': self.tokens,
+            'avg_message_tokens': self.tokens / self.total if self.total else 0,
+            'recent_responses': latencies,
+            'avg_response_ms': 1000 * self._latency_sum / latencies if latencies else 0.0,
+            'last_response_ms': 1000 * self._latencies[-1] if latencies else 0.0,
+        }
+
+
+class WireHistory:
+    """
+    A history in an API's own message format, kept next to `messages`.
+
+    sync() converts only the messages added since the last call and returns
+    the same list every time. It is rebuilt from scratch after invalidate()
+    (the provider's history was trimmed, cleared or replaced) or when it no
+    longer lines up with the history it was built from. `convert` may
+    return None for messages the API does not take.
+    """
+
+    def __init__(self, convert: Callable[[dict[str, str]], Any], prefix: Sequence[Any] = ()):
+        self.convert = convert
+        self.prefix = list(prefix)
+        self._items: list[Any] = list(self.prefix)
+        self._source: list[dict[str, str]] | None = None
+        self._length = 0
+        self.rebuilds = 0
+
+    def sync(self, messages: list[dict[str, str]]) -> list[Any]:
+        if messages is not self._source or len(messages) < self._length:
+            self._items = list(self.prefix)
+            self._source = messages
+            self._length = 0
+            self.rebuilds += 1
+        for msg in messages[self._length:]:
+            item = self.convert(msg)
+            if item is not None:
+                self._items.append(item)
+        self._length = len(messages)
+        return self._items
+
+    def invalidate(self) -> None:
+        self._source = None
+
+
+_spill_lock = threading.Lock()
+
+
+class QandALog:
+    """
+    The last `max_entries` question and answer pairs of a provider.
+
+    Older pairs are dropped, or appended to `spill_path` as JSON lines
+    (QuestionAndAnswer.to_dict) when one is set. None keeps everything.
+    """
+
+    def __init__(self, max_entries: int | None = 200, spill_path: str | None = None):
+        self.spill_path = spill_path
+        self._entries: deque[QuestionAndAnswer] = deque()
+        self.max_entries = max_entries
+        self.spilled = 0
+
+    @property
+    def max_entries(self) -> int | None:
+        return self._max_entries
+    @max_entries.setter
+    def max_entries(self, value: int | None) -> None:
+        self._max_entries = value
+        self._drop_oldest()
+
+    def append(self, q_and_a: QuestionAndAnswer) -> None:
+        self._entries.append(q_and_a)
+        self._drop_oldest()
+
+    def extend(self, q_and_as: Iterable[QuestionAndAnswer]) -> None:
+        self._entries.extend(q_and_as)
+        self._drop_oldest()
+
+    def _drop_oldest(self) -> None:
+        if self._max_entries is None or len(self._entries) <= self._max_entries:
+            return
+        dropped = []
+        while len(self._entries) > self._max_entries:
+            dropped.append(self._entries.popleft())
+        if self.spill_path is not None:
+            self._spill(dropped)
+
+    def _spill(self, q_and_as: list[QuestionAndAnswer]) -> None:
+        lines = "".join(json.dumps(q_and_a.to_dict(), ensure_ascii=False) + "\n" for q_and_a in q_and_as)
+        try:
+            with _spill_lock, open(self.spill_path, "a", encoding="utf-8") as f:
+                f.write(lines)
+            self.spilled += len(q_and_as)
+        except OSError as e:
+            print(f"⚠️ Could not write old answers to {self.spill_path}: {e}")
+
+    def load_spilled(self) -> list[QuestionAndAnswer]:
+        """The pairs written to spill_path so far, oldest first"""
+        if self.spill_path is None:
+            return []
+        try:
+            with _spill_lock, open(self.spill_path, encoding="utf-8") as f:
+                return [QuestionAndAnswer.from_dict(json.loads(line)) for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def to_list(self) -> list[dict]:
+        return [q_and_a.to_dict() for q_and_a in self._entries]
+
+    def __iter__(self) -> Iterator[QuestionAndAnswer]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getitem__(self, index: int) -> QuestionAndAnswer:
+        return self._entries[index]
+
+    def get_stats(self) -> dict:
+        return {
+            'stored': len(self._entries),
+            'max_entries': self._max_entries,
+            'spilled': self.spilled,
+            'spill_path': self.spill_path,
+        }
+
+
+def benchmark_wire_history(turns: int = 40) -> dict:
+    """Bytes allocated per turn converting the whole history versus only the new messages"""
+    import tracemalloc
+
+    def convert(msg: dict[str, str]) -> dict:
+        return {"role": "user" if msg["role"] == "user" else "model", "parts": [msg["content"]]}
+
+    def allocated_per_turn(build: Callable[[list[dict[str, str]]], list]) -> float:
+        messages: list[dict[str, str]] = []
+        # Everything built is kept, freed objects would be recycled from free lists unseen
+        sent = []
+        total = 0
+        tracemalloc.start()
+        for turn in range(turns):
+            messages.append({"role": "user", "content": f"Question {turn}"})
+            before = tracemalloc.get_traced_memory()[0]
+            sent.append(build(messages))
+            total += tracemalloc.get_traced_memory()[0] - before
+            messages.append({"role": "assistant", "content": f"Answer {turn}"})
+        tracemalloc.stop()
+        return total / turns
+
+    wire = WireHistory(convert)
+    rebuilt = allocated_per_turn(lambda messages: [convert(msg) for msg in messages])
+    cached = allocated_per_turn(wire.sync)
+    return {
+        'turns': turns,
+        'rebuilt_bytes_per_turn': round(rebuilt),
+        'cached_bytes_per_turn': round(cached),
+        'reduction': rebuilt / cached if cached else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    print("🧪 Allocations per turn, full conversion against the cached wire history")
+    for key, value in benchmark_wire_history().items():
+        print(f"  {key.replace('_', ' ').title()}: {value}")
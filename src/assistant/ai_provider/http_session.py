@@ -0,0 +1,221 @@
+import asyncio
+import threading
+import time
+import weakref
+from typing import Callable
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+class _CountingAdapter(HTTPAdapter):
+    """
+    Calls `on_connect` for every socket its pools open. urllib3's own
+    num_connections misses pooled connections that were dropped (server
+    closed them, `Connection: close`) and silently reconnected.
+    """
+
+    def __init__(self, on_connect: Callable[[], None], **kwargs):
+        self._on_connect = on_connect
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        on_connect = self._on_connect
+
+        class CountingHTTPConnection(HTTPConnection):
+            def connect(self) -> None:
+                super().connect()
+                on_connect()
+
+        class CountingHTTPSConnection(HTTPSConnection):
+            def connect(self) -> None:
+                super().connect()
+                on_connect()
+
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": type("CountingHTTPConnectionPool", (HTTPConnectionPool,), {"ConnectionCls": CountingHTTPConnection}),
+            "https": type("CountingHTTPSConnectionPool", (HTTPSConnectionPool,), {"ConnectionCls": CountingHTTPSConnection}),
+        }
+
+
+class PooledSession:
+    """
+    Keep-alive HTTP session owned by one AI provider.
+
+    Module level `requests.post` opens a new TCP (and TLS) connection for
+    every question. This keeps up to `pool_size` connections per host open
+    between questions and counts how often one was reused, from the sockets
+    its connection pools actually opened.
+
+    `post_async` does the same over httpx for coroutines. An httpx client
+    belongs to the event loop it was first used on, so there is one per loop.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 2,
+        keep_alive: bool = True,
+        connect_timeout: float = 3.05,
+        read_timeout: float | None = 60.0,
+        headers: dict[str, str] | None = None,
+    ):
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.connect_timeout = connect_timeout
+        """Longest silence between bytes of the answer, None waits forever"""
+        self.read_timeout = read_timeout
+        self._session = requests.Session()
+        self._adapter = _CountingAdapter(self._on_connect, pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount("http://", self._adapter)
+        self._session.mount("https://", self._adapter)
+        self._session.headers.update(headers or {})
+        if not keep_alive:
+            self._session.headers["Connection"] = "close"
+        self._headers = {**(headers or {}), **({} if keep_alive else {"Connection": "close"})}
+        self._async_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+        self._requests = 0
+        """httpx does not count connections, async requests are reported apart"""
+        self._async_requests = 0
+        self._connections = 0
+        self._total_time = 0.0
+
+    @property
+    def timeout(self) -> tuple[float, float | None]:
+        return (self.connect_timeout, self.read_timeout)
+
+    @property
+    def session(self) -> requests.Session:
+        return self._session
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        start = time.perf_counter()
+        try:
+            return self._session.post(url, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._total_time += elapsed
+                self._requests += 1
+
+    async def post_async(self, url: str, **kwargs) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            return await self._async_client().post(url, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._total_time += elapsed
+                self._async_requests += 1
+
+    def _async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(
+                headers=self._headers,
+                timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size if self.keep_alive else 0,
+                ),
+            )
+            self._async_clients[loop] = client
+        return client
+
+    def _on_connect(self) -> None:
+        with self._lock:
+            self._connections += 1
+
+    def close(self) -> None:
+        self._session.close()
+
+    async def close_async(self) -> None:
+        """Close the httpx client of the running loop"""
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            requests_made = self._requests
+            async_requests = self._async_requests
+            connections = self._connections
+            total_time = self._total_time
+        reused = max(0, requests_made - connections)
+        total_requests = requests_made + async_requests
+        return {
+            'requests': requests_made,
+            'async_requests': async_requests,
+            'connections_opened': connections,
+            'connections_reused': reused,
+            'reuse_rate': reused / requests_made if requests_made else 0.0,
+            'avg_request_ms': 1000 * total_time / total_requests if total_requests else 0.0,
+        }
+
+
+def benchmark_session(requests_count: int = 50) -> dict:
+    """Compare module level requests.post with a PooledSession against a local stub"""
+    import json
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out in separate writes, don't let Nagle hold the body back
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            body = json.dumps({"message": {"role": "assistant", "content": "ok"}}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/api/chat"
+    payload = {"model": "stub", "messages": [{"role": "user", "content": "Hello"}]}
+
+    try:
+        start = time.perf_counter()
+        for _ in range(requests_count):
+            requests.post(url, json=payload).json()
+        unpooled = (time.perf_counter() - start) / requests_count
+
+        session = PooledSession()
+        start = time.perf_counter()
+        for _ in range(requests_count):
+            session.post(url, json=payload).json()
+        pooled = (time.perf_counter() - start) / requests_count
+        stats = session.get_stats()
+        session.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    return {
+        'requests': requests_count,
+        'unpooled_avg_ms': 1000 * unpooled,
+        'pooled_avg_ms': 1000 * pooled,
+        'speedup': unpooled / pooled if pooled else 0.0,
+        'connections_opened': stats['connections_opened'],
+        'connections_reused': stats['connections_reused'],
+    }
+
+
+if __name__ == "__main__":
+    print("🧪 Benchmarking pooled sessions against a local stub server")
+    for key, value in benchmark_session().items():
+        print(f"  {key.replace('_', ' ').title()}: {value}")
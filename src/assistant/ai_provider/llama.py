@@ -1,22 +1,28 @@
 import os
-import requests
 from typing import Optional
 
 # Custom Imports
 try:
     from .ai_providers import AIProvider, AiProviderList, AiProviderStatus
+    from .metrics import GenerationMetrics
+    from .http_session import PooledSession
+    from .rate_limit import shared_limiter
 except ImportError:
     from ai_providers import AIProvider, AiProviderList, AiProviderStatus
+    from metrics import GenerationMetrics
+    from http_session import PooledSession
+    from rate_limit import shared_limiter
 
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 
 class Llama(AIProvider):
-    def __init__(self, token: Optional[str] = GITHUB_TOKEN):
+    def __init__(self, token: Optional[str] = GITHUB_TOKEN, session: Optional[PooledSession] = None):
         super().__init__()
         if not token:
             raise ValueError("GITHUB_TOKEN not found.")
         self.token = token
         self.model = "meta/Llama-4-Scout-17B-16E-Instruct"
+        self.rate_limiter = shared_limiter("GitHub Models")
         self.url = "https://models.github.ai/inference/chat/completions"
         self.headers = {
             "Authorization": f"Bearer {self.token}",
@@ -24,6 +30,8 @@ class Llama(AIProvider):
             "Accept": "application/json",
             "X-GitHub-Api-Version": "2023-11-28"
         }
+        """Keep-alive connections, saves the TLS handshake on every question"""
+        self.session = session or PooledSession()
         self.add_message("system", "You are a helpful AI voice/text assistant")
 
     @property
@@ -32,31 +40,42 @@ class Llama(AIProvider):
 
     def _call_api(self, message: list[dict[str, str]] | str) -> str:
         """Implementation of the abstract _call_api method for GitHub Llama"""
-        try:
-            payload = {
-                "model": self.model,
-                "messages": message if isinstance(message, list) else [{"role": "user", "content": message}],
-                "max_tokens": self._max_tokens,
-                "temperature": self._temperature
-            }
-
-            response = requests.post(self.url, headers=self.headers, json=payload)
-            response.raise_for_status()
-            data = response.json()
-
-            assistant_response = data["choices"][0]["message"]["content"]
-            
-            if isinstance(message, list):
-                self.add_message("assistant", assistant_response)
-
-            return assistant_response
-
-        except requests.RequestException as e:
-            self.status = AiProviderStatus.ERROR
-            return f"Error communicating with GitHub Llama API: {e}"
-        except KeyError as e:
-            self.status = AiProviderStatus.ERROR
-            return f"Unexpected response format from GitHub Llama API: {e}"
+        payload = self._payload(message)
+
+        response = self.session.post(self.url, headers=self.headers, json=payload)
+        response.raise_for_status()
+        return self._read_answer(message, response.json())
+
+    native_async = True
+
+    async def _call_api_async(self, message: list[dict[str, str]] | str) -> str:
+        """_call_api over httpx, nothing blocks the event loop"""
+        response = await self.session.post_async(self.url, headers=self.headers, json=self._payload(message))
+        response.raise_for_status()
+        return self._read_answer(message, response.json())
+
+    def _payload(self, message: list[dict[str, str]] | str) -> dict:
+        return {
+            "model": self.model,
+            "messages": message if isinstance(message, list) else [{"role": "user", "content": message}],
+            "max_tokens": self._max_tokens,
+            "temperature": self._temperature
+        }
+
+    def _read_answer(self, message: list[dict[str, str]] | str, data: dict) -> str:
+        assistant_response = data["choices"][0]["message"]["content"]
+        usage = data.get("usage") or {}
+        self._usage = GenerationMetrics.from_usage(usage.get("prompt_tokens"), usage.get("completion_tokens"))
+        
+        if isinstance(message, list):
+            self.add_message("assistant", assistant_response)
+
+        return assistant_response
+
+    def _new_instance(self) -> "Llama":
+        provider = Llama(self.token, session=self.session)
+        provider.model = self.model
+        return provider
 
     def ask(self, prompt: str) -> str:
         """Use the generic ask implementation from base class"""
@@ -93,3 +112,7 @@ if __name__ == "__main__":
     stats = llama.get_conversation_stats()
     for key, value in stats.items():
         print(f"  {key.replace('_', ' ').title()}: {value}")
+
+    print("\n🔌 CONNECTION STATISTICS:")
+    for key, value in llama.session.get_stats().items():
+        print(f"  {key.replace('_', ' ').title()}: {value}")
@@ -0,0 +1,135 @@
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(percentile / 100 * (len(values) - 1))))
+    return values[index]
+
+
+@dataclass
+class GenerationMetrics:
+    """
+    What one request cost, normalized across providers.
+
+    `wall_time` is measured by us around the API call. Everything else is
+    what the backend reported and stays None when it did not say. Times are
+    in seconds.
+    """
+    provider: str = ""
+    model: str = ""
+    wall_time: float = 0.0
+    prompt_tokens: int | None = None
+    completion_tokens: int | None = None
+    """Time the backend spent loading the model (Ollama only)"""
+    load_time: float | None = None
+    prompt_eval_time: float | None = None
+    eval_time: float | None = None
+    """Total time the backend says it spent on the request"""
+    server_time: float | None = None
+    """Time until the first streamed chunk arrived, None when not streaming"""
+    first_chunk_time: float | None = None
+    """Time spent waiting for the rate limiter before the request, not part of wall_time"""
+    queue_time: float | None = None
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def tokens_per_second(self) -> float | None:
+        """Generation speed, from the backend's own timing when it gives one"""
+        if not self.completion_tokens:
+            return None
+        duration = self.eval_time or self.wall_time
+        return self.completion_tokens / duration if duration else None
+
+    @property
+    def overhead_time(self) -> float | None:
+        """Wall time not spent in the backend: network, TLS, queueing"""
+        if self.server_time is None:
+            return None
+        return max(0.0, self.wall_time - self.server_time)
+
+    @classmethod
+    def from_ollama(cls, data: dict) -> "GenerationMetrics":
+        """Ollama reports durations in nanoseconds"""
+        def seconds(key: str) -> float | None:
+            return data[key] / 1e9 if key in data else None
+
+        return cls(
+            prompt_tokens=data.get("prompt_eval_count"),
+            completion_tokens=data.get("eval_count"),
+            load_time=seconds("load_duration"),
+            prompt_eval_time=seconds("prompt_eval_duration"),
+            eval_time=seconds("eval_duration"),
+            server_time=seconds("total_duration"),
+        )
+
+    @classmethod
+    def from_usage(cls, prompt_tokens: int | None, completion_tokens: int | None) -> "GenerationMetrics":
+        """Remote APIs only report token usage"""
+        return cls(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+
+    def to_dict(self) -> dict:
+        return {
+            "provider": self.provider,
+            "model": self.model,
+            "wall_time": self.wall_time,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "load_time": self.load_time,
+            "prompt_eval_time": self.prompt_eval_time,
+            "eval_time": self.eval_time,
+            "server_time": self.server_time,
+            "first_chunk_time": self.first_chunk_time,
+            "queue_time": self.queue_time,
+            "overhead_time": self.overhead_time,
+            "tokens_per_second": self.tokens_per_second,
+            "timestamp": self.timestamp,
+        }
+
+
+class MetricsWindow:
+    """Rolling aggregates over the last `size` requests"""
+
+    def __init__(self, size: int = 100):
+        self._metrics: deque[GenerationMetrics] = deque(maxlen=size)
+
+    def add(self, metrics: GenerationMetrics) -> None:
+        self._metrics.append(metrics)
+
+    def clear(self) -> None:
+        self._metrics.clear()
+
+    def __len__(self) -> int:
+        return len(self._metrics)
+
+    def get_stats(self) -> dict:
+        metrics = list(self._metrics)
+
+        def average_ms(values: list[float | None]) -> float | None:
+            values = [v for v in values if v is not None]
+            return 1000 * sum(values) / len(values) if values else None
+
+        def average(values: list[float | None]) -> float | None:
+            values = [v for v in values if v is not None]
+            return sum(values) / len(values) if values else None
+
+        wall_times = [m.wall_time for m in metrics]
+        return {
+            'requests': len(metrics),
+            'avg_wall_ms': average_ms(wall_times),
+            'p50_wall_ms': 1000 * _percentile(wall_times, 50),
+            'p95_wall_ms': 1000 * _percentile(wall_times, 95),
+            'avg_server_ms': average_ms([m.server_time for m in metrics]),
+            'avg_overhead_ms': average_ms([m.overhead_time for m in metrics]),
+            'avg_first_chunk_ms': average_ms([m.first_chunk_time for m in metrics]),
+            'avg_queue_ms': average_ms([m.queue_time for m in metrics]),
+            'avg_load_ms': average_ms([m.load_time for m in metrics]),
+            'avg_prompt_eval_ms': average_ms([m.prompt_eval_time for m in metrics]),
+            'avg_prompt_tokens': average([m.prompt_tokens for m in metrics]),
+            'avg_completion_tokens': average([m.completion_tokens for m in metrics]),
+            'avg_tokens_per_second': average([m.tokens_per_second for m in metrics]),
+        }
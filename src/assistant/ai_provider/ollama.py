@@ -1,18 +1,95 @@
+import re
 import subprocess
+import threading
+import time
+from collections import deque
+import httpx
 import requests
 
 # custom import
 try:
     from .ai_providers import AIProvider, AiProviderList, AiProviderStatus
+    from .metrics import GenerationMetrics
+    from .http_session import PooledSession
 except ImportError:
     from ai_providers import AIProvider, AiProviderList, AiProviderStatus
+    from metrics import GenerationMetrics
+    from http_session import PooledSession
+
+"""A response that spent longer than this loading the model counts as cold"""
+COLD_LOAD_THRESHOLD = 0.1
+
+"""Used when keep_alive is not a valid duration"""
+DEFAULT_KEEP_ALIVE = "30m"
+"""Units of the Go durations Ollama takes for keep_alive, in seconds"""
+DURATION_UNITS = {"ns": 1e-9, "us": 1e-6, "µs": 1e-6, "ms": 1e-3, "s": 1, "m": 60, "h": 3600}
+_DURATION_PART = re.compile(r"(\d+\.?\d*|\.\d+)(ns|us|µs|ms|s|m|h)")
+
+
+def parse_duration(value: str | int | float) -> float:
+    """
+    Seconds of a keep_alive value: a number of seconds or a Go duration
+    such as "300ms" or "1h30m". Negative means for ever (inf).
+    """
+    if isinstance(value, str):
+        text = value.strip()
+        try:
+            seconds = float(text)
+        except ValueError:
+            sign = -1 if text.startswith("-") else 1
+            text = text.lstrip("+-")
+            parts = _DURATION_PART.findall(text)
+            if not text or "".join(number + unit for number, unit in parts) != text:
+                raise ValueError(f"Invalid duration {value!r}")
+            seconds = sign * sum(float(number) * DURATION_UNITS[unit] for number, unit in parts)
+    else:
+        seconds = float(value)
+    return float("inf") if seconds < 0 else seconds
     
 class Ollama(AIProvider):
-    def __init__(self):
+    """monotonic() of the last request per (host, model), the server keeps a model loaded for every client"""
+    _model_last_used: dict[tuple[str, str], float] = {}
+
+    def __init__(
+        self,
+        host: str = "http://localhost:11434",
+        session: PooledSession | None = None,
+        keep_alive: str | int = DEFAULT_KEEP_ALIVE,
+        keep_warm_interval: float = 240.0,
+        warm_up: bool = True,
+        reuse_context: bool = False,
+    ):
         super().__init__()
         self.model: str = "tinyllama"
+        self.host = host
+        """Keep-alive connections to the Ollama server"""
+        self.session = session or PooledSession()
+        """How long Ollama keeps the model loaded after a request ("30m", seconds, -1 for ever)"""
+        self.keep_alive = keep_alive
+        """Seconds of inactivity before a keep-warm ping, 0 disables pinging"""
+        self.keep_warm_interval = keep_warm_interval
+        self._keep_warm_thread: threading.Thread | None = None
+        self._keep_warm_stop = threading.Event()
+        """Set by warm_up(), so warming up again before release() does nothing"""
+        self._warmed = False
+        """Model load time reported by the last warm-up, in seconds"""
+        self.warm_up_load_time: float | None = None
+        self.cold_latencies: deque[float] = deque(maxlen=100)
+        self.warm_latencies: deque[float] = deque(maxlen=100)
+        """Continue from the server's KV context so only the new turn is evaluated"""
+        self.reuse_context = reuse_context
+        self._context: list[int] | None = None
+        """Number of messages the context covers and the model it belongs to"""
+        self._context_length = 0
+        self._context_model = ""
+        """Per turn: endpoint used and Ollama's prompt/eval token counts"""
+        self.turn_metrics: deque[dict] = deque(maxlen=100)
         # Override base class defaults for Ollama
         self.temperature = 0
+        """Local generation on a CPU can take a while even when warm"""
+        self.adaptive_timeout.ceiling = 60.0
+        if warm_up:
+            self.warm_up()
 
     @property
     def name(self) -> str:
@@ -20,39 +97,265 @@ class Ollama(AIProvider):
     
     def _call_api(self, message: list[dict[str, str]] | str) -> str:
         """Implementation of the abstract _call_api method for Ollama"""
+        ollama_messages = self._to_ollama_messages(message)
+        data = None
+        request = self._context_request(message)
+        if request is not None:
+            try:
+                data = self._post(*request)
+            except requests.HTTPError as e:
+                print(f"⚠️ Ollama rejected the saved context, resending full history: {e}")
+        if data is None:
+            data = self._post("/api/chat/", {"messages": ollama_messages}, "chat")
+        return self._read_answer(message, data)
+
+    native_async = True
+
+    async def _call_api_async(self, message: list[dict[str, str]] | str) -> str:
+        """_call_api over httpx, nothing blocks the event loop"""
+        ollama_messages = self._to_ollama_messages(message)
+        data = None
+        request = self._context_request(message)
+        if request is not None:
+            try:
+                data = await self._post_async(*request)
+            except httpx.HTTPStatusError as e:
+                print(f"⚠️ Ollama rejected the saved context, resending full history: {e}")
+        if data is None:
+            data = await self._post_async("/api/chat/", {"messages": ollama_messages}, "chat")
+        return self._read_answer(message, data)
+
+    def _to_ollama_messages(self, message: list[dict[str, str]] | str) -> list[dict[str, str]]:
+        # Prepare messages for Ollama API
+        if isinstance(message, str):
+            # Single message
+            return [{"role": "user", "content": message}]
+        # Full conversation history - already in Ollama's format, serialized as is
+        return message
+
+    def _read_answer(self, message: list[dict[str, str]] | str, data: dict) -> str:
+        if "response" in data:
+            self._context = data.get("context")
+            self._context_model = self.model
+            assistant_response = data["response"]
+        else:
+            self._context = None
+            assistant_response = data['message']['content']
+
+        # Add assistant's response to conversation history
+        if isinstance(message, list):
+            self.add_message("assistant", assistant_response)
+            self._context_length = len(self.messages)
+
+        return assistant_response
+
+    def _request_body(self, payload: dict) -> dict:
+        return {
+            "model": self.model,
+            "stream": False,
+            "keep_alive": self.keep_alive,
+            "options": {
+                "temperature": self.temperature
+            },
+            **payload,
+        }
+
+    def _post(self, endpoint: str, payload: dict, mode: str) -> dict:
+        start = time.perf_counter()
+        response = self.session.post(f"{self.host}{endpoint}", json=self._request_body(payload))
+        self._last_request_time = time.monotonic()
+        response.raise_for_status()
+        return self._record_response(response.json(), time.perf_counter() - start, mode)
+
+    async def _post_async(self, endpoint: str, payload: dict, mode: str) -> dict:
+        start = time.perf_counter()
+        response = await self.session.post_async(f"{self.host}{endpoint}", json=self._request_body(payload))
+        self._last_request_time = time.monotonic()
+        response.raise_for_status()
+        return self._record_response(response.json(), time.perf_counter() - start, mode)
+
+    def _record_response(self, data: dict, latency: float, mode: str) -> dict:
+        self._record_latency(latency, data)
+        self._record_turn(mode, data)
+        self._usage = GenerationMetrics.from_ollama(data)
+        return data
+
+    def _context_request(self, message: list[dict[str, str]] | str) -> tuple[str, dict, str] | None:
+        """
+        A /api/generate request sending only the new user turn plus the
+        context returned last time. When there is no matching context (start
+        of the conversation, history was cleared, trimmed or edited, model
+        changed) a fresh one is seeded from the system messages and the
+        turns so far. None when context mode is off, so the caller uses
+        /api/chat with the full history. The caller also falls back when
+        the server rejects the context.
+        """
+        if not self.reuse_context or isinstance(message, str) or message[-1]["role"] != "user":
+            return None
+        in_sync = (
+            self._context is not None
+            and self._context_model == self.model
+            and len(message) == self._context_length + 1
+        )
+        payload = {"prompt": message[-1]["content"]}
+        if in_sync:
+            payload["context"] = self._context
+        else:
+            system = self._seed_system(message[:-1])
+            if system:
+                payload["system"] = system
+        return "/api/generate", payload, "context" if in_sync else "seed"
+
+    @staticmethod
+    def _seed_system(history: list[dict[str, str]]) -> str:
+        """System messages, then the earlier turns as a transcript the new context starts from"""
+        system = [m["content"] for m in history if m["role"] == "system"]
+        turns = [f"{m['role']}: {m['content']}" for m in history if m["role"] != "system"]
+        if turns:
+            system.append("Conversation so far:\n" + "\n".join(turns))
+        return "\n\n".join(system)
+
+    def _invalidate_history(self) -> None:
+        self._context = None
+
+    def _new_instance(self) -> "Ollama":
+        """Shares the connection pool, keeping the model loaded is left to this instance"""
+        provider = Ollama(
+            host=self.host,
+            session=self.session,
+            keep_alive=self.keep_alive,
+            keep_warm_interval=0,
+            warm_up=False,
+            reuse_context=self.reuse_context,
+        )
+        provider.model = self.model
+        provider.temperature = self.temperature
+        return provider
+
+    def _record_turn(self, mode: str, data: dict) -> None:
+        metrics = {
+            'mode': mode,
+            'prompt_eval_count': data.get("prompt_eval_count", 0),
+            'eval_count': data.get("eval_count", 0),
+            'prompt_eval_ms': data.get("prompt_eval_duration", 0) / 1e6,
+        }
+        self.turn_metrics.append(metrics)
+        print(f"📏 {mode}: {metrics['prompt_eval_count']} prompt tokens evaluated in {metrics['prompt_eval_ms']:.0f} ms")
+
+    def get_context_stats(self) -> dict:
+        """Average prompt tokens evaluated per turn, by how the turn was sent"""
+        stats = {}
+        for mode in ("seed", "context", "chat"):
+            turns = [t for t in self.turn_metrics if t['mode'] == mode]
+            stats[f'{mode}_turns'] = len(turns)
+            stats[f'avg_{mode}_prompt_eval_count'] = (
+                sum(t['prompt_eval_count'] for t in turns) / len(turns) if turns else 0.0
+            )
+        return stats
+
+    @property
+    def keep_alive(self) -> str | int:
+        return self._keep_alive
+    @keep_alive.setter
+    def keep_alive(self, value: str | int) -> None:
+        """An invalid duration falls back to DEFAULT_KEEP_ALIVE, Ollama would reject it"""
+        try:
+            seconds = parse_duration(value)
+        except (TypeError, ValueError) as e:
+            print(f"⚠️ keep_alive {value!r} is not a duration ({e}), using {DEFAULT_KEEP_ALIVE}")
+            value = DEFAULT_KEEP_ALIVE
+            seconds = parse_duration(value)
+        self._keep_alive = value
+        self._keep_alive_duration = seconds
+
+    def _keep_alive_seconds(self) -> float:
+        """keep_alive in seconds, inf when Ollama keeps the model loaded for ever"""
+        return self._keep_alive_duration
+
+    @property
+    def _last_request_time(self) -> float:
+        """Last request to this model on this server from any instance, 0 if none yet"""
+        return self._model_last_used.get((self.host, self.model), 0.0)
+    @_last_request_time.setter
+    def _last_request_time(self, value: float) -> None:
+        self._model_last_used[(self.host, self.model)] = value
+
+    def _is_cold(self) -> bool:
+        """The model is not loaded until warm-up finished, and Ollama unloads it after keep_alive"""
+        if not self._last_request_time:
+            return True
+        return time.monotonic() - self._last_request_time > self._keep_alive_seconds()
+
+    def _record_latency(self, latency: float, data: dict) -> None:
+        """Sort the request into cold or warm by the load time Ollama reports"""
+        load_time = data.get("load_duration", 0) / 1e9
+        if load_time > COLD_LOAD_THRESHOLD:
+            self.cold_latencies.append(latency)
+        else:
+            self.warm_latencies.append(latency)
+
+    def _load_model(self) -> float | None:
+        """A generate request without a prompt only loads the model"""
         try:
-            # Prepare messages for Ollama API
-            if isinstance(message, str):
-                # Single message
-                ollama_messages = [{"role": "user", "content": message}]
-            else:
-                # Full conversation history - send all messages for context
-                ollama_messages = message.copy()
-
-            response = requests.post(
-                "http://localhost:11434/api/chat/",
-                json={
-                    "model": self.model,
-                    "messages": ollama_messages,
-                    "stream": False,
-                    "options": {
-                        "temperature": self.temperature
-                    }
-                },
+            response = self.session.post(
+                f"{self.host}/api/generate",
+                json={"model": self.model, "keep_alive": self.keep_alive},
             )
             response.raise_for_status()
-            data = response.json()
+            self._last_request_time = time.monotonic()
+            return response.json().get("load_duration", 0) / 1e9
+        except requests.RequestException as e:
+            print(f"⚠️ Could not load {self.model} into Ollama: {e}")
+            return None
 
-            # Add assistant's response to conversation history
-            assistant_response = data['message']['content']
-            if isinstance(message, list):
-                self.add_message("assistant", assistant_response)
+    def warm_up(self) -> None:
+        """Load the model in the background and keep it loaded while in use, once until release()"""
+        if self._warmed:
+            return
+        self._warmed = True
 
-            return assistant_response
+        def load() -> None:
+            start = time.perf_counter()
+            load_time = self._load_model()
+            if load_time is not None:
+                self.warm_up_load_time = load_time
+                print(f"🔥 {self.model} ready in {time.perf_counter() - start:.2f}s (load {load_time:.2f}s)")
 
-        except requests.RequestException as e:
-            self.status = AiProviderStatus.ERROR
-            return f"Error communicating with Ollama API: {e}"
+        threading.Thread(target=load, daemon=True).start()
+        self.start_keep_warm()
+
+    def release(self) -> None:
+        self._warmed = False
+        self.stop_keep_warm()
+
+    def start_keep_warm(self) -> None:
+        if self.keep_warm_interval <= 0:
+            return
+        if self._keep_warm_thread is not None and self._keep_warm_thread.is_alive():
+            return
+        self._keep_warm_stop.clear()
+        self._keep_warm_thread = threading.Thread(target=self._keep_warm, daemon=True)
+        self._keep_warm_thread.start()
+
+    def stop_keep_warm(self) -> None:
+        self._keep_warm_stop.set()
+
+    def _keep_warm(self) -> None:
+        """Ping only after keep_warm_interval without questions, answering also keeps it loaded"""
+        while not self._keep_warm_stop.wait(timeout=self.keep_warm_interval / 4):
+            if time.monotonic() - self._last_request_time >= self.keep_warm_interval:
+                self._load_model()
+
+    def get_latency_stats(self) -> dict:
+        """Cold (model had to load) and warm latencies kept apart, in ms"""
+        cold, warm = list(self.cold_latencies), list(self.warm_latencies)
+        return {
+            'warm_up_load_ms': 1000 * self.warm_up_load_time if self.warm_up_load_time is not None else None,
+            'cold_requests': len(cold),
+            'avg_cold_ms': 1000 * sum(cold) / len(cold) if cold else 0.0,
+            'warm_requests': len(warm),
+            'avg_warm_ms': 1000 * sum(warm) / len(warm) if warm else 0.0,
+        }
 
     def ask(self, prompt: str) -> str:
         """Use the generic ask implementation from base class"""
@@ -71,7 +374,7 @@ if __name__ == "__main__":
         "What's my name?",
     ]
 
-    ollama = Ollama()
+    ollama = Ollama(reuse_context=True)
 
     for i, q in enumerate(questions, 1):
         print(f"\n🐸 Arun > {q}")
@@ -88,6 +391,22 @@ if __name__ == "__main__":
     for key, value in stats.items():
         print(f"  {key.replace('_', ' ').title()}: {value}")
 
+    print("\n📏 PROMPT EVALUATION:")
+    for key, value in ollama.get_context_stats().items():
+        print(f"  {key.replace('_', ' ').title()}: {value}")
+
+    print("\n⚙️ GENERATION METRICS:")
+    for key, value in ollama.get_generation_stats().items():
+        print(f"  {key.replace('_', ' ').title()}: {value}")
+
+    print("\n🔥 LATENCY STATISTICS:")
+    for key, value in ollama.get_latency_stats().items():
+        print(f"  {key.replace('_', ' ').title()}: {value}")
+
+    print("\n🔌 CONNECTION STATISTICS:")
+    for key, value in ollama.session.get_stats().items():
+        print(f"  {key.replace('_', ' ').title()}: {value}")
+
     # print("\n🧹 Clearing conversation history...")
     # print()
     # for obj in ollama.QandAs:
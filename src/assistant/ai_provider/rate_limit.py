@@ -0,0 +1,177 @@
+import contextvars
+import threading
+import time
+from collections import OrderedDict, deque
+
+"""Who is asking, set per request by the server. Requests are queued fairly between users"""
+current_user: contextvars.ContextVar[str] = contextvars.ContextVar("current_user", default="local")
+
+"""Requests per minute and burst of the free tiers, change them with FairRateLimiter.configure()"""
+DEFAULT_RATE_LIMITS: dict[str, tuple[float, int]] = {
+    "GitHub Models": (10, 2),
+    "Gemini": (15, 3),
+    "Cohere": (20, 3),
+}
+
+
+class FairRateLimiter:
+    """
+    Token bucket that queues requests instead of failing them.
+
+    The bucket holds up to `burst` tokens and refills at
+    `requests_per_minute`. A request that finds it empty waits in a queue
+    of its user (`current_user`). Users take turns: after one of a user's
+    requests got a token, that user moves to the back, so one user asking
+    a lot does not hold everybody else up.
+    """
+
+    def __init__(self, requests_per_minute: float, burst: int = 1):
+        self._cond = threading.Condition()
+        self.configure(requests_per_minute, burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._queues: OrderedDict[str, deque[object]] = OrderedDict()
+        self.requests = 0
+        self.queued = 0
+        self._total_wait = 0.0
+        self.max_wait = 0.0
+        """Tokens given back unused, e.g. by a request that never reached the API"""
+        self.refunded = 0
+
+    def configure(self, requests_per_minute: float, burst: int = 1) -> None:
+        with self._cond:
+            self.requests_per_minute = requests_per_minute
+            self.burst = burst
+            self._cond.notify_all()
+
+    @property
+    def rate(self) -> float:
+        """Tokens per second"""
+        return self.requests_per_minute / 60
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, user: str | None = None, stop_event: threading.Event | None = None) -> bool:
+        """Wait for a token in turn, False if stop_event was set first"""
+        user = user or current_user.get()
+        ticket = object()
+        start = time.monotonic()
+        with self._cond:
+            self._queues.setdefault(user, deque()).append(ticket)
+            try:
+                while True:
+                    self._refill()
+                    head_user = next(iter(self._queues))
+                    is_next = self._queues[head_user][0] is ticket
+                    if is_next and self._tokens >= 1:
+                        self._tokens -= 1
+                        self._served(head_user)
+                        self._record_wait(time.monotonic() - start)
+                        return True
+                    if stop_event is not None and stop_event.is_set():
+                        self._drop(user, ticket)
+                        return False
+                    # The next in line sleeps until its token, poll for stop_event meanwhile
+                    wait = (1 - self._tokens) / self.rate if is_next and self.rate > 0 else 0.1
+                    self._cond.wait(timeout=min(wait, 0.1))
+            finally:
+                self._cond.notify_all()
+
+    def try_acquire(self) -> bool:
+        """Take a token only if one is free and nobody is waiting, e.g. for a retry"""
+        with self._cond:
+            self._refill()
+            if self._queues or self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def refund(self) -> None:
+        """Give back a token that was acquired but not used"""
+        with self._cond:
+            self._refill()
+            self._tokens = min(self.burst, self._tokens + 1)
+            self.refunded += 1
+            self._cond.notify_all()
+
+    def _served(self, user: str) -> None:
+        queue = self._queues[user]
+        queue.popleft()
+        if queue:
+            self._queues.move_to_end(user)
+        else:
+            del self._queues[user]
+
+    def _drop(self, user: str, ticket: object) -> None:
+        queue = self._queues[user]
+        queue.remove(ticket)
+        if not queue:
+            del self._queues[user]
+
+    def _record_wait(self, wait: float) -> None:
+        self.requests += 1
+        if wait > 0.001:
+            self.queued += 1
+        self._total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def get_stats(self) -> dict:
+        with self._cond:
+            self._refill()
+            return {
+                'requests_per_minute': self.requests_per_minute,
+                'burst': self.burst,
+                'tokens': round(self._tokens, 2),
+                'requests': self.requests,
+                'queued': self.queued,
+                'refunded': self.refunded,
+                'avg_wait_ms': 1000 * self._total_wait / self.requests if self.requests else 0.0,
+                'max_wait_ms': 1000 * self.max_wait,
+                'waiting': {user: len(queue) for user, queue in self._queues.items()},
+            }
+
+
+class TokenReservation:
+    """
+    A token acquired for one request ahead of its call. The request take()s
+    it when it reaches the API; release() gives it back to the limiter if
+    nobody did, on whatever path the request ended. `limiter` None stands
+    for an unlimited provider.
+    """
+    __slots__ = ("limiter", "_used", "_lock")
+
+    def __init__(self, limiter: FairRateLimiter | None):
+        self.limiter = limiter
+        self._used = False
+        self._lock = threading.Lock()
+
+    @property
+    def used(self) -> bool:
+        return self._used
+
+    def take(self) -> bool:
+        """Spend the token, False if it was already spent or released"""
+        with self._lock:
+            if self._used:
+                return False
+            self._used = True
+            return True
+
+    def release(self) -> None:
+        if self.take() and self.limiter is not None:
+            self.limiter.refund()
+
+
+_limiters: dict[str, FairRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def shared_limiter(key: str) -> FairRateLimiter:
+    """One limiter per API account, shared by every provider instance using it"""
+    with _limiters_lock:
+        if key not in _limiters:
+            _limiters[key] = FairRateLimiter(*DEFAULT_RATE_LIMITS[key])
+        return _limiters[key]
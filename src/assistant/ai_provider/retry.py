@@ -0,0 +1,105 @@
+import random
+import threading
+
+import httpx
+import requests
+
+try:
+    from azure.core.exceptions import ServiceRequestError, ServiceResponseError
+    AZURE_TRANSPORT_ERRORS: tuple[type[Exception], ...] = (ServiceRequestError, ServiceResponseError)
+except ImportError:
+    AZURE_TRANSPORT_ERRORS = ()
+
+"""Rate limited, or the server had a temporary problem"""
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+"""Connection refused or reset, read timeouts: the request may well work a moment later"""
+TRANSPORT_ERRORS = (
+    ConnectionError,
+    TimeoutError,
+    requests.ConnectionError,
+    requests.Timeout,
+    httpx.TransportError,
+) + AZURE_TRANSPORT_ERRORS
+
+
+def status_code(error: Exception) -> int | None:
+    """HTTP status of an SDK or HTTP client error, None when it has none"""
+    response = getattr(error, "response", None)
+    for code in (
+        getattr(error, "status_code", None),  # azure, cohere
+        getattr(response, "status_code", None),  # requests, httpx
+        getattr(error, "code", None),  # google.api_core
+    ):
+        if isinstance(code, int):
+            return code
+    return None
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, TRANSPORT_ERRORS):
+        return True
+    return status_code(error) in RETRYABLE_STATUS_CODES
+
+
+def retry_after(error: Exception) -> float | None:
+    """Seconds the server asked us to wait, from a Retry-After header"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or getattr(error, "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After") or headers.get("retry-after"))
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter: attempt n waits a random time up to base_delay * 2**n"""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 8.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, error: Exception | None = None) -> float:
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        server_delay = retry_after(error) if error is not None else None
+        return max(backoff, min(server_delay, self.max_delay)) if server_delay else backoff
+
+
+class RetryBudget:
+    """
+    Caps retries at a fraction of requests across all providers.
+
+    Every request adds `ratio` tokens and every retry spends one, so during
+    an outage at most about `ratio` extra requests are sent per request
+    instead of `max_attempts` times the load. `max_tokens` bounds the
+    burst of retries saved up while things were fine.
+    """
+
+    def __init__(self, ratio: float = 0.2, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._lock = threading.Lock()
+        self.retries = 0
+        self.denied = 0
+
+    def record_request(self) -> None:
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                self.denied += 1
+                return False
+            self._tokens -= 1
+            self.retries += 1
+            return True
+
+    def get_stats(self) -> dict:
+        return {'tokens': round(self._tokens, 2), 'retries': self.retries, 'denied': self.denied}
+
+
+"""Shared by every provider, so retries to all backends together stay bounded"""
+RETRY_BUDGET = RetryBudget()
@@ -0,0 +1,223 @@
+import asyncio
+import concurrent.futures
+import dataclasses
+import time
+
+# Custom Imports
+try:
+    from .ai_providers import AIProvider, AiProviderStatus
+    from .circuit_breaker import CircuitState
+    from .event_loop import BackgroundLoop
+    from .metrics import _percentile
+except ImportError:
+    from ai_providers import AIProvider, AiProviderStatus
+    from circuit_breaker import CircuitState
+    from event_loop import BackgroundLoop
+    from metrics import _percentile
+
+
+class HedgedRouter(AIProvider):
+    """
+    Composite provider that asks a primary backend and hedges to a secondary.
+
+    The question goes to `providers[0]`. If no answer arrived after the
+    primary's `hedge_percentile` latency (from its recent GenerationMetrics,
+    `default_hedge_delay` until it has `min_samples`), or the primary failed,
+    the same question goes to the next backend. The first good answer wins
+    and the other request is cancelled. Backends whose circuit breaker is
+    open are skipped, the first healthy one acts as primary.
+
+    The router owns the conversation history. Before a backend is asked its
+    history is replaced with the router's whenever they differ, e.g. after it
+    lost a race.
+    """
+
+    def __init__(
+        self,
+        providers: list[AIProvider],
+        hedge_percentile: float = 95.0,
+        default_hedge_delay: float = 2.0,
+        min_samples: int = 5,
+    ):
+        super().__init__()
+        if not providers:
+            raise ValueError("HedgedRouter needs at least one provider")
+        self.providers = providers
+        self.hedge_percentile = hedge_percentile
+        self.default_hedge_delay = default_hedge_delay
+        self.min_samples = min_samples
+        """Trimming is done here, the backends get the router's history"""
+        self.max_history_tokens = providers[0].max_history_tokens
+        self._stats: dict[str, dict[str, int]] = {
+            provider.name: {'primary': 0, 'hedged': 0, 'attempts': 0, 'wins': 0} for provider in providers
+        }
+        self.last_winner: AIProvider | None = None
+
+    @property
+    def name(self) -> str:
+        return "Router(" + ", ".join(provider.name for provider in self.providers) + ")"
+
+    @property
+    def model(self) -> str:
+        return str(getattr(self.last_winner, "model", "")) if self.last_winner else ""
+
+    def warm_up(self) -> None:
+        for provider in self.providers:
+            provider.warm_up()
+
+    def release(self) -> None:
+        for provider in self.providers:
+            provider.release()
+
+    def hedge_delay(self, provider: AIProvider) -> float | None:
+        """Seconds to wait for `provider` before hedging, None waits until it answers or fails"""
+        wall_times = [m.wall_time for m in provider._metrics_window._metrics]
+        if len(wall_times) < self.min_samples:
+            return self.default_hedge_delay
+        return _percentile(wall_times, self.hedge_percentile)
+
+    def _call_api(self, message: list[dict[str, str]] | str) -> str:
+        """Waits until the request's deadline at most, then the race and the backend requests in it are cancelled"""
+        timeout = max(self._deadline - time.monotonic(), 0.0)
+        try:
+            return BackgroundLoop.get().run(self._call_api_async(message), timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            raise TimeoutError(f"no backend answered within {timeout:.1f}s") from None
+
+    native_async = True
+
+    async def _call_api_async(self, message: list[dict[str, str]] | str) -> str:
+        if isinstance(message, str):
+            history, prompt = [], message
+        else:
+            history, prompt = message[:-1], message[-1]['content']
+
+        winner, answer = await self._race(prompt, history)
+        if winner is None:
+            self.status = AiProviderStatus.ERROR
+            return answer
+        self.last_winner = winner
+        if winner.last_metrics is not None:
+            self._usage = dataclasses.replace(winner.last_metrics)
+        if isinstance(message, list):
+            self.add_message("assistant", answer)
+        return answer
+
+    async def _race(self, prompt: str, history: list[dict[str, str]]) -> tuple[AIProvider | None, str]:
+        healthy = [p for p in self.providers if p.breaker.state is CircuitState.CLOSED]
+        if not healthy:
+            return None, ""
+        primary, secondaries = healthy[0], healthy[1:]
+        self._stats[primary.name]['primary'] += 1
+        tasks = {asyncio.create_task(self._attempt(primary, prompt, history)): primary}
+        last_error = ""
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay(primary))
+            while True:
+                for task in done:
+                    provider = tasks.pop(task)
+                    answer = task.result()
+                    if self._is_good(provider, answer):
+                        self._stats[provider.name]['wins'] += 1
+                        return provider, answer
+                    last_error = answer
+                if secondaries and (not tasks or not done):
+                    # Primary is slow or failed: hedge to the next backend
+                    secondary = secondaries.pop(0)
+                    self._stats[primary.name]['hedged'] += 1
+                    print(f"🪃 Hedging {primary.name} to {secondary.name}")
+                    tasks[asyncio.create_task(self._attempt(secondary, prompt, history))] = secondary
+                if not tasks:
+                    return None, last_error
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            # Cancel whoever lost
+            for task in tasks:
+                task.cancel()
+
+    async def _attempt(self, provider: AIProvider, prompt: str, history: list[dict[str, str]]) -> str:
+        self._stats[provider.name]['attempts'] += 1
+        if provider.messages != history:
+            provider.replace_messages([dict(msg) for msg in history])
+        return await provider.ask_async(prompt)
+
+    @staticmethod
+    def _is_good(provider: AIProvider, answer: str) -> bool:
+        return bool(answer) and provider.status not in (
+            AiProviderStatus.ERROR, AiProviderStatus.TIMEOUT, AiProviderStatus.OFFLINE
+        )
+
+    def cancel(self) -> None:
+        super().cancel()
+        for provider in self.providers:
+            provider.cancel()
+
+    def _new_instance(self) -> "HedgedRouter":
+        return type(self)(
+            [provider.new_conversation() for provider in self.providers],
+            hedge_percentile=self.hedge_percentile,
+            default_hedge_delay=self.default_hedge_delay,
+            min_samples=self.min_samples,
+        )
+
+    def ask(self, prompt: str) -> str:
+        """Use the generic ask implementation from base class"""
+        super().ask(prompt)
+        return self._generic_ask(prompt)
+
+    def _is_cold(self) -> bool:
+        return any(p._is_cold() for p in self.providers if p.breaker.state is CircuitState.CLOSED)
+
+    def probe(self) -> bool:
+        """The backends probe themselves, the router is back once one of them is"""
+        return any(p.breaker.state is CircuitState.CLOSED for p in self.providers)
+
+    def get_breaker_states(self) -> dict[str, dict]:
+        states = super().get_breaker_states()
+        for provider in self.providers:
+            states.update(provider.get_breaker_states())
+        return states
+
+    def get_router_stats(self) -> dict:
+        """Per backend: how often it was hedged as primary and how often it won when asked"""
+        stats = {}
+        for name, counts in self._stats.items():
+            stats[name] = {
+                **counts,
+                'hedge_rate': counts['hedged'] / counts['primary'] if counts['primary'] else 0.0,
+                'win_rate': counts['wins'] / counts['attempts'] if counts['attempts'] else 0.0,
+            }
+        return stats
+
+
+class FailoverRouter(HedgedRouter):
+    """
+    Asks one backend at a time: the first healthy provider, and only when it
+    fails (error, timeout or open breaker) the next one.
+    """
+
+    @property
+    def name(self) -> str:
+        return "Failover(" + ", ".join(provider.name for provider in self.providers) + ")"
+
+    def hedge_delay(self, provider: AIProvider) -> float | None:
+        return None
+
+
+if __name__ == "__main__":
+    try:
+        from . import Ollama, Gemini
+    except ImportError:
+        from ollama import Ollama
+        from gemini import Gemini
+
+    router = HedgedRouter([Ollama(), Gemini()])
+    for q in ["Hello! My name is Arun CS", "What's my name?", "Tell me a short joke"]:
+        print(f"\n🐸 Arun > {q}")
+        answer = router.ask(q)
+        winner = router.last_winner.name if router.last_winner else router.name
+        print(f"🤖 {winner} > {answer}")
+        print(f"⏳ Response Time: {router.response_time:.2f} seconds")
+    print("\n🪃 ROUTER STATISTICS:")
+    for name, stats in router.get_router_stats().items():
+        print(f"  {name}: {stats}")
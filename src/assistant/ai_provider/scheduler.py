@@ -0,0 +1,117 @@
+import contextvars
+import itertools
+import threading
+import time
+from collections import deque
+from enum import IntEnum
+from typing import Any, Callable
+
+# Custom Imports
+try:
+    from .metrics import _percentile
+except ImportError:
+    from metrics import _percentile
+
+
+class Priority(IntEnum):
+    """Lower goes first"""
+    INTERACTIVE = 0
+    NORMAL = 1
+    BACKGROUND = 2
+
+
+"""Priority of the questions asked in this context, voice turns unless the caller says otherwise"""
+current_priority: contextvars.ContextVar[Priority] = contextvars.ContextVar(
+    "current_priority", default=Priority.INTERACTIVE
+)
+
+
+class _Ticket:
+    __slots__ = ("priority", "seq", "enqueued")
+
+    def __init__(self, priority: Priority, seq: int):
+        self.priority = priority
+        self.seq = seq
+        self.enqueued = time.monotonic()
+
+
+class PriorityScheduler:
+    """
+    Lets at most `max_concurrent` questions reach the provider at a time,
+    the most urgent first.
+
+    Waiting requests age: every `aging_interval` seconds spent in the queue
+    counts as one priority class higher, so background work still gets
+    through while voice turns keep coming. Same effective priority is
+    served in arrival order. Waits for anything else belong before the
+    slot is taken, e.g. inside AIProvider.reserved_token() for the rate
+    limit, so a waiting request does not hold a slot others could use.
+    """
+
+    def __init__(self, max_concurrent: int = 1, aging_interval: float = 10.0, window: int = 200):
+        self.max_concurrent = max_concurrent
+        self.aging_interval = aging_interval
+        self._cond = threading.Condition()
+        self._waiting: list[_Ticket] = []
+        self._running = 0
+        self._seq = itertools.count()
+        self._waits: dict[Priority, deque[float]] = {p: deque(maxlen=window) for p in Priority}
+        self._requests = {p: 0 for p in Priority}
+        """Requests served ahead of a more urgent one thanks to aging"""
+        self._aged = {p: 0 for p in Priority}
+
+    def _effective(self, ticket: _Ticket, now: float) -> tuple[float, int]:
+        return ticket.priority - (now - ticket.enqueued) / self.aging_interval, ticket.seq
+
+    def _next(self) -> _Ticket:
+        now = time.monotonic()
+        return min(self._waiting, key=lambda ticket: self._effective(ticket, now))
+
+    def acquire(self, priority: Priority | None = None) -> float:
+        """Wait for a slot, returns the seconds spent queueing"""
+        priority = current_priority.get() if priority is None else priority
+        with self._cond:
+            ticket = _Ticket(priority, next(self._seq))
+            self._waiting.append(ticket)
+            while self._running >= self.max_concurrent or self._next() is not ticket:
+                self._cond.wait()
+            self._waiting.remove(ticket)
+            self._running += 1
+            wait = time.monotonic() - ticket.enqueued
+            self._requests[priority] += 1
+            self._waits[priority].append(wait)
+            if any(other.priority < priority for other in self._waiting):
+                self._aged[priority] += 1
+            # Another slot may still be free for the next in line
+            self._cond.notify_all()
+        if wait > 0.01:
+            print(f"🗂️ {priority.name.lower()} question waited {wait:.2f}s for its turn")
+        return wait
+
+    def release(self) -> None:
+        with self._cond:
+            self._running -= 1
+            self._cond.notify_all()
+
+    def run(self, fn: Callable[[], Any], priority: Priority | None = None) -> Any:
+        self.acquire(priority)
+        try:
+            return fn()
+        finally:
+            self.release()
+
+    def get_stats(self) -> dict:
+        """Queue latency per priority class, in ms"""
+        with self._cond:
+            stats = {}
+            for priority in Priority:
+                waits = list(self._waits[priority])
+                stats[priority.name.lower()] = {
+                    'requests': self._requests[priority],
+                    'waiting': sum(1 for ticket in self._waiting if ticket.priority is priority),
+                    'aged': self._aged[priority],
+                    'avg_wait_ms': 1000 * sum(waits) / len(waits) if waits else 0.0,
+                    'p95_wait_ms': 1000 * _percentile(waits, 95),
+                    'max_wait_ms': 1000 * max(waits, default=0.0),
+                }
+            return stats
@@ -0,0 +1,99 @@
+import re
+import threading
+from typing import Any, Callable, Hashable
+
+# Custom Imports
+try:
+    from .ai_providers import AIProvider
+except ImportError:
+    from ai_providers import AIProvider
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Case, spacing and trailing punctuation do not change the question"""
+    return re.sub(r"\s+", " ", prompt).strip().rstrip("?!. ").lower()
+
+
+def request_key(prompt: str, provider: AIProvider) -> tuple:
+    """
+    What decides the answer: the question, the provider and model, and the
+    history the provider will see. A request already in flight has added
+    its question to the history, so a trailing copy of it is ignored.
+    """
+    question = normalize_prompt(prompt)
+    history = list(provider.messages)
+    if history and history[-1]['role'] == 'user' and normalize_prompt(history[-1]['content']) == question:
+        history = history[:-1]
+    context = hash(tuple((msg['role'], msg['content']) for msg in history))
+    model = getattr(provider, "model", "")
+    return question, provider.name, str(getattr(model, "model_name", model)), context
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Runs one call per key at a time. Callers asking for a key that is
+    already in flight wait for that call and get its result (or its
+    exception) instead of starting their own.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self.requests = 0
+        """Calls that actually ran and callers that shared another's result"""
+        self.executed = 0
+        self.coalesced = 0
+        self.max_waiters = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> tuple[Any, bool]:
+        """fn's result and whether it was shared with a call already in flight"""
+        with self._lock:
+            self.requests += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+                self.max_waiters = max(self.max_waiters, call.waiters)
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def get_stats(self) -> dict:
+        return {
+            'requests': self.requests,
+            'backend_calls': self.executed,
+            'coalesced': self.coalesced,
+            'coalesce_rate': self.coalesced / self.requests if self.requests else 0.0,
+            'in_flight': self.in_flight(),
+            'max_waiters': self.max_waiters,
+        }
@@ -0,0 +1,59 @@
+"""
+Test file for timeouts learned from observed latencies
+"""
+from adaptive_timeout import AdaptiveTimeout
+
+
+def test_warm_timeout_is_learned():
+    print("🧪 Learning a warm timeout...")
+    timeouts = AdaptiveTimeout(percentile=99.0, multiplier=1.5, floor=1.0, ceiling=30.0, default=10.0, min_samples=5)
+    assert timeouts.compute("llama")[0] == 10.0, "default until there are enough samples"
+
+    for latency in (2.0, 2.0, 2.0, 2.0, 4.0):
+        timeouts.record("llama", latency)
+    timeout, reason = timeouts.compute("llama")
+    assert 2.0 * 1.5 < timeout <= 4.0 * 1.5, reason
+    assert timeouts.compute("mistral")[0] == 10.0, "every model learns its own"
+    print(f"✅ {timeout:.2f}s ({reason})")
+
+
+def test_bounds_and_cold_requests():
+    print("🧪 Bounding timeouts, cold and warm apart...")
+    timeouts = AdaptiveTimeout(floor=3.0, ceiling=30.0, cold_default=60.0, cold_ceiling=120.0, min_samples=1)
+    timeouts.record("fast", 0.1)
+    timeout, reason = timeouts.compute("fast")
+    assert timeout == 3.0 and reason.endswith("raised to floor")
+
+    timeouts.record("slow", 100.0)
+    assert timeouts.compute("slow")[0] == 30.0
+
+    assert timeouts.compute("slow", cold=True)[0] == 60.0, "warm samples say nothing about loading the model"
+    timeouts.record("slow", 50.0, cold=True)
+    assert timeouts.compute("slow", cold=True)[0] == 75.0
+    timeouts.record("slow", 100.0, cold=True)
+    assert timeouts.compute("slow", cold=True)[0] == 120.0
+    print("✅ Floor, ceiling and the cold ceiling held")
+
+
+def test_timeouts_that_fired_raise_the_timeout():
+    print("🧪 A backend that got slower...")
+    timeouts = AdaptiveTimeout(percentile=50.0, multiplier=1.5, floor=0.1, min_samples=3, window=3)
+    for _ in range(3):
+        timeouts.record("llama", 1.0)
+    before = timeouts.compute("llama")[0]
+    # Requests now time out, each recorded at the timeout it had
+    timeout = before
+    for _ in range(6):
+        timeouts.record("llama", timeout)
+        grown = timeouts.compute("llama")[0]
+        assert grown >= timeout
+        timeout = grown
+    assert timeout > before * 2, (before, timeout)
+    print(f"✅ The timeout grew from {before:.2f}s to {timeout:.2f}s")
+
+
+if __name__ == "__main__":
+    test_warm_timeout_is_learned()
+    test_bounds_and_cold_requests()
+    test_timeouts_that_fired_raise_the_timeout()
+    print("\n🎉 Adaptive timeout tests successful!")
@@ -0,0 +1,97 @@
+"""
+Test file for the circuit breaker and the probing of an offline provider, with a fake backend instead of a real API
+"""
+import time
+
+from ai_providers import AIProvider, AiProviderStatus
+from circuit_breaker import CircuitBreaker, CircuitState
+
+
+class FlakyProvider(AIProvider):
+    def __init__(self):
+        super().__init__()
+        self.breaker = CircuitBreaker(recovery_timeout=0.2, on_state_change=self._on_breaker_change)
+        self.healthy = False
+        self.calls = 0
+
+    @property
+    def name(self) -> str:
+        return "Flaky"
+
+    def _call_api(self, message: list[dict[str, str]] | str) -> str:
+        self.calls += 1
+        if not self.healthy:
+            raise ConnectionError("backend down")
+        # Like the real providers, only a conversation is answered into the history
+        if isinstance(message, list):
+            self.add_message("assistant", "pong")
+        return "pong"
+
+    def _new_instance(self) -> "FlakyProvider":
+        return FlakyProvider()
+
+    def ask(self, prompt: str) -> str:
+        super().ask(prompt)
+        return self._generic_ask(prompt)
+
+
+def test_breaker_state_changes():
+    print("🧪 Failing, waiting and probing...")
+    changes = []
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0.1,
+                             on_state_change=lambda old, new: changes.append(new))
+
+    breaker.record_failure()
+    assert breaker.state is CircuitState.CLOSED and breaker.allow_request()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state is CircuitState.CLOSED, "a success resets the count"
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+    assert not breaker.allow_request() and breaker.rejected == 1
+
+    assert not breaker.start_probe(), "too early to probe"
+    time.sleep(0.15)
+    assert breaker.start_probe()
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert not breaker.allow_request(), "the half-open trial is the probe's"
+
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN and breaker.trips == 2
+    time.sleep(0.15)
+    assert breaker.start_probe()
+    breaker.record_success()
+    assert breaker.state is CircuitState.CLOSED
+    assert changes == [CircuitState.OPEN, CircuitState.HALF_OPEN, CircuitState.OPEN,
+                       CircuitState.HALF_OPEN, CircuitState.CLOSED]
+    print("✅ Closed, open, half-open and back in the expected order")
+
+
+def test_offline_provider_is_probed_back_online():
+    print("🧪 Taking a provider offline and bringing it back...")
+    provider = FlakyProvider()
+    for _ in range(provider.breaker.failure_threshold):
+        assert provider.ask_with_timeout("Hello") == ""
+    assert provider.breaker.state is CircuitState.OPEN
+    assert provider.status == AiProviderStatus.OFFLINE
+
+    calls = provider.calls
+    assert provider.ask_with_timeout("Hello") == ""
+    assert provider.calls == calls, "an open breaker fails fast"
+
+    provider.healthy = True
+    deadline = time.monotonic() + 3.0
+    while provider.breaker.state is not CircuitState.CLOSED and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert provider.breaker.state is CircuitState.CLOSED
+    assert provider.status == AiProviderStatus.IDLE
+    assert not any(msg['content'] == "pong" for msg in provider.messages), "the probe stays out of the history"
+    assert provider.ask_with_timeout("Hello") == "pong"
+    assert provider.messages[-1]['content'] == "pong"
+    print("✅ The probe found the backend healthy again")
+
+
+if __name__ == "__main__":
+    test_breaker_state_changes()
+    test_offline_provider_is_probed_back_online()
+    print("\n🎉 Circuit breaker tests successful!")
@@ -0,0 +1,66 @@
+"""
+Test file for the structured chat_history sent to Cohere, with a fake client instead of the API
+"""
+from types import SimpleNamespace
+
+from cohere_api import CohereAPI
+
+
+class FakeClient:
+    def __init__(self):
+        self.requests: list[dict] = []
+
+    def chat(self, **request) -> SimpleNamespace:
+        # chat_history is the provider's live list, keep it as sent
+        request["chat_history"] = [(msg.role, msg.message) for msg in request["chat_history"]]
+        self.requests.append(request)
+        billed = SimpleNamespace(input_tokens=10, output_tokens=5)
+        return SimpleNamespace(text=f" answer {len(self.requests)} ", meta=SimpleNamespace(billed_units=billed))
+
+
+def fake_cohere() -> tuple[CohereAPI, FakeClient]:
+    provider = CohereAPI(api_key="test")
+    provider.rate_limiter = None
+    provider.client = FakeClient()
+    return provider, provider.client
+
+
+def test_question_and_history_are_sent_apart():
+    print("🧪 Three turns with a system prompt...")
+    provider, client = fake_cohere()
+    provider.add_message("system", "Be brief")
+    assert provider.ask("Hi") == "answer 1"
+    provider.ask("What is 2 + 2?")
+    provider.ask("And 3 + 3?")
+
+    first, second, third = client.requests
+    assert first["message"] == "Hi" and first["chat_history"] == []
+    assert first["preamble"] == "Be brief"
+    assert second["chat_history"] == [("USER", "Hi"), ("CHATBOT", "answer 1")]
+    assert third["message"] == "And 3 + 3?"
+    assert third["chat_history"][-2:] == [("USER", "What is 2 + 2?"), ("CHATBOT", "answer 2")]
+    assert all(role != "SYSTEM" for role, _ in third["chat_history"]), "system prompts go in the preamble"
+    print("✅ Every turn sent the question once and the history as turns")
+
+
+def test_trimmed_history_is_rebuilt():
+    print("🧪 Trimming the history to a token budget...")
+    provider, client = fake_cohere()
+    provider.max_history_tokens = 40
+    for i in range(8):
+        provider.ask(f"Question number {i} with some words in it")
+    last = client.requests[-1]
+    expected = [("USER" if msg['role'] == 'user' else "CHATBOT", msg['content']) for msg in provider.messages[:-2]]
+    assert last["chat_history"] == expected, "the history sent matches what is left after trimming"
+    assert len(last["chat_history"]) < 14
+
+    provider.clear_messages()
+    provider.ask("Fresh start")
+    assert client.requests[-1]["chat_history"] == []
+    print("✅ The sent history followed every trim")
+
+
+if __name__ == "__main__":
+    test_question_and_history_are_sent_apart()
+    test_trimmed_history_is_rebuilt()
+    print("\n🎉 Cohere history tests successful!")
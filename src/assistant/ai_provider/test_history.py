@@ -0,0 +1,176 @@
+"""
+Test file for the history helpers: the cached wire format of a conversation, the question and answer log and the running conversation stats
+"""
+import os
+import tempfile
+
+from ai_providers import AIProvider
+from history import ConversationStats, QandALog, QuestionAndAnswer, WireHistory, estimate_tokens
+
+
+class EchoProvider(AIProvider):
+    @property
+    def name(self) -> str:
+        return "Echo"
+
+    def _call_api(self, message: list[dict[str, str]] | str) -> str:
+        answer = "You said: " + self.messages[-1]['content']
+        self.add_message("assistant", answer)
+        return answer
+
+    def _new_instance(self) -> "EchoProvider":
+        return EchoProvider()
+
+    def ask(self, prompt: str) -> str:
+        super().ask(prompt)
+        return self._generic_ask(prompt)
+
+
+def recount(messages: list[dict[str, str]]) -> dict:
+    """The counters computed from scratch, without the latencies"""
+    stats = ConversationStats()
+    stats.reset(messages)
+    return {key: value for key, value in stats.to_dict().items() if 'response' not in key}
+
+
+class CountingConvert:
+    """Converts to (role, content) tuples and drops tool messages, counting the calls"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, msg: dict[str, str]) -> tuple[str, str] | None:
+        self.calls += 1
+        if msg["role"] == "tool":
+            return None
+        return msg["role"], msg["content"]
+
+
+def test_wire_history_converts_only_new_messages():
+    print("🧪 Syncing a growing conversation...")
+    convert = CountingConvert()
+    wire = WireHistory(convert, prefix=[("system", "Be brief")])
+    messages = [{"role": "user", "content": "Hi"}]
+
+    first = wire.sync(messages)
+    assert first == [("system", "Be brief"), ("user", "Hi")]
+
+    messages.append({"role": "assistant", "content": "Hello!"})
+    messages.append({"role": "tool", "content": "ignored"})
+    messages.append({"role": "user", "content": "2 + 2?"})
+    second = wire.sync(messages)
+    assert second is first, "the same list is extended, not rebuilt"
+    assert second[-2:] == [("assistant", "Hello!"), ("user", "2 + 2?")]
+    assert convert.calls == 4, "every message converted exactly once"
+    assert wire.rebuilds == 1
+    print("✅ Only the new messages were converted")
+
+
+def test_wire_history_rebuilds_when_history_changes():
+    print("🧪 Trimming, replacing and invalidating the history...")
+    convert = CountingConvert()
+    wire = WireHistory(convert)
+    messages = [{"role": "user", "content": f"Question {i}"} for i in range(4)]
+    wire.sync(messages)
+
+    # Trimmed in place: shorter than what was converted
+    del messages[:2]
+    assert wire.sync(messages) == [("user", "Question 2"), ("user", "Question 3")]
+    assert wire.rebuilds == 2
+
+    # Replaced by another list
+    replaced = [{"role": "user", "content": "Fresh start"}]
+    assert wire.sync(replaced) == [("user", "Fresh start")]
+    assert wire.rebuilds == 3
+
+    # Changed in a way only the provider knows about
+    replaced[0] = {"role": "user", "content": "Edited"}
+    wire.invalidate()
+    assert wire.sync(replaced) == [("user", "Edited")]
+    assert wire.rebuilds == 4
+    print("✅ The wire history followed every change")
+
+
+def test_q_and_a_log_spills_oldest_to_disk():
+    print("🧪 Answering more questions than the log keeps...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "q_and_a.jsonl")
+        log = QandALog(max_entries=3, spill_path=path)
+        pairs = [QuestionAndAnswer(f"Question {i}", f"Answer {i} ✅") for i in range(5)]
+        for q_and_a in pairs:
+            log.append(q_and_a)
+        assert [q_and_a.question for q_and_a in log] == ["Question 2", "Question 3", "Question 4"]
+        assert log.spilled == 2
+
+        spilled = log.load_spilled()
+        assert [(q.question, q.answer) for q in spilled] == [("Question 0", "Answer 0 ✅"), ("Question 1", "Answer 1 ✅")]
+        assert abs(spilled[0].created - pairs[0].created) < 0.001, "timestamps survive the round trip"
+
+        # Lowering the limit spills the surplus too
+        log.max_entries = 1
+        assert len(log) == 1 and len(log.load_spilled()) == 4
+    print("✅ Old pairs went to disk in order and came back intact")
+
+
+def test_q_and_a_log_without_spill_path_drops_oldest():
+    log = QandALog(max_entries=2)
+    log.extend(QuestionAndAnswer(f"Question {i}", "Answer") for i in range(4))
+    assert [q_and_a.question for q_and_a in log] == ["Question 2", "Question 3"]
+    assert log.spilled == 0 and log.load_spilled() == []
+
+    unbounded = QandALog(max_entries=None)
+    unbounded.extend(QuestionAndAnswer(f"Question {i}", "Answer") for i in range(500))
+    assert len(unbounded) == 500
+
+
+def test_conversation_stats_counters():
+    print("🧪 Counting messages as they come and go...")
+    stats = ConversationStats(window=2)
+    hello = {"role": "user", "content": "Hello there"}
+    answer = {"role": "assistant", "content": "Hi!"}
+    stats.add(hello)
+    stats.add(answer)
+    assert stats.total == 2 and stats.by_role == {"user": 1, "assistant": 1}
+    assert stats.characters == len("Hello there") + len("Hi!")
+    assert stats.tokens == estimate_tokens("Hello there") + estimate_tokens("Hi!")
+    stats.remove(hello)
+    assert stats.to_dict()['user_messages'] == 0 and stats.total == 1
+
+    for latency in (1.0, 2.0, 4.0):
+        stats.record_latency(latency)
+    assert stats.to_dict()['recent_responses'] == 2
+    assert stats.to_dict()['avg_response_ms'] == 3000.0, "only the last `window` latencies count"
+    assert stats.to_dict()['last_response_ms'] == 4000.0
+    print("✅ Counters and the latency window kept up")
+
+
+def test_provider_running_stats_match_a_recount():
+    print("🧪 Asking, trimming and editing a provider's history...")
+    provider = EchoProvider()
+    provider.max_history_tokens = 60
+    for i in range(10):
+        provider.ask(f"Question number {i} with a few words")
+        assert provider.get_conversation_stats()['total_messages'] == len(provider.messages)
+    assert len(provider.messages) < 20, "trimmed to the token budget"
+    stats = provider.get_conversation_stats()
+    assert {key: stats[key] for key in recount(provider.messages)} == recount(provider.messages)
+
+    # Changed behind the provider's back: recounted on the next read
+    provider.messages.append({"role": "user", "content": "appended directly"})
+    stats = provider.get_conversation_stats()
+    assert {key: stats[key] for key in recount(provider.messages)} == recount(provider.messages)
+    assert stats['recent_responses'] == 10
+
+    provider.clear_messages()
+    assert provider.get_conversation_stats()['total_tokens'] == 0
+    print("✅ The running totals always matched the history")
+
+
+if __name__ == "__main__":
+    test_wire_history_converts_only_new_messages()
+    test_wire_history_rebuilds_when_history_changes()
+    test_q_and_a_log_spills_oldest_to_disk()
+    test_q_and_a_log_without_spill_path_drops_oldest()
+    test_conversation_stats_counters()
+    test_provider_running_stats_match_a_recount()
+    print("\n🎉 History tests successful!")
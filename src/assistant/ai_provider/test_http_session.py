@@ -0,0 +1,93 @@
+"""
+Test file for the keep-alive session providers post through, against a local stub server instead of a real API
+"""
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from event_loop import BackgroundLoop
+from http_session import PooledSession
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps({"message": {"role": "assistant", "content": "ok"}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub() -> tuple[ThreadingHTTPServer, str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/api/chat"
+
+
+def stop_stub(server: ThreadingHTTPServer) -> None:
+    server.shutdown()
+    server.server_close()
+
+
+def test_connections_are_reused():
+    print("🧪 Posting five questions over one session...")
+    server, url = start_stub()
+    try:
+        session = PooledSession()
+        for _ in range(5):
+            assert session.post(url, json={"prompt": "Hello"}).json()["message"]["content"] == "ok"
+        stats = session.get_stats()
+        session.close()
+
+        closing = PooledSession(keep_alive=False)
+        for _ in range(3):
+            closing.post(url, json={"prompt": "Hello"})
+        closing_stats = closing.get_stats()
+        closing.close()
+    finally:
+        stop_stub(server)
+    assert stats['requests'] == 5 and stats['connections_opened'] == 1 and stats['connections_reused'] == 4
+    assert closing_stats['connections_opened'] == 3 and closing_stats['reuse_rate'] == 0.0
+    print(f"✅ One connection served all five, reuse rate {stats['reuse_rate']:.0%}")
+
+
+def test_async_posts_get_a_client_per_loop():
+    print("🧪 Posting from the background loop and from another loop...")
+    server, url = start_stub()
+    session = PooledSession()
+
+    async def ask() -> str:
+        response = await session.post_async(url, json={"prompt": "Hello"})
+        return response.json()["message"]["content"]
+
+    async def ask_and_close() -> str:
+        answer = await ask()
+        await session.close_async()
+        return answer
+
+    try:
+        background = BackgroundLoop.get()
+        assert background.run(ask(), timeout=5) == "ok"
+        assert background.run(ask(), timeout=5) == "ok"
+        assert asyncio.run(ask_and_close()) == "ok"
+        assert len(session._async_clients) == 1, "the other loop's client was closed with it"
+        background.run(session.close_async(), timeout=5)
+    finally:
+        stop_stub(server)
+    assert session.get_stats()['async_requests'] == 3
+    print("✅ Each event loop used its own client")
+
+
+if __name__ == "__main__":
+    test_connections_are_reused()
+    test_async_posts_get_a_client_per_loop()
+    print("\n🎉 HTTP session tests successful!")
@@ -0,0 +1,113 @@
+"""
+Test file for continuing from Ollama's KV context, with a fake session instead of an Ollama server
+"""
+import copy
+
+import requests
+
+from ollama import Ollama
+
+
+class FakeResponse:
+    def __init__(self, data: dict, status_code: int = 200):
+        self.data = data
+        self.status_code = status_code
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Bad Request", response=self)
+
+    def json(self) -> dict:
+        return self.data
+
+
+class FakeSession:
+    """Answers like Ollama: /api/generate returns a context growing by one token per call"""
+
+    def __init__(self):
+        self.requests: list[tuple[str, dict]] = []
+        self.reject_context = False
+
+    def post(self, url: str, json: dict) -> FakeResponse:
+        endpoint = url.split("/api/", 1)[1].strip("/")
+        # The messages list is the provider's live history, keep it as sent
+        self.requests.append((endpoint, copy.deepcopy(json)))
+        if endpoint == "chat":
+            return FakeResponse({"message": {"role": "assistant", "content": "chat answer"}})
+        if "context" in json and self.reject_context:
+            return FakeResponse({"error": "invalid context"}, status_code=400)
+        context = json.get("context", []) + [len(self.requests)]
+        return FakeResponse({"response": f"answer {len(self.requests)}", "context": context, "prompt_eval_count": 5})
+
+
+def fake_ollama(reuse_context: bool = True) -> tuple[Ollama, FakeSession]:
+    session = FakeSession()
+    provider = Ollama(host="http://fake-ollama", session=session, warm_up=False, reuse_context=reuse_context)
+    return provider, session
+
+
+def test_later_turns_send_only_the_new_question():
+    print("🧪 Three turns with context reuse...")
+    provider, session = fake_ollama()
+    provider.add_message("system", "Be brief")
+    assert provider.ask("Hi") == "answer 1"
+    provider.ask("What is 2 + 2?")
+    provider.ask("And 3 + 3?")
+
+    (first, seed), (_, second), (_, third) = session.requests
+    assert first == "generate" and "context" not in seed and seed["system"] == "Be brief"
+    assert second["prompt"] == "What is 2 + 2?" and second["context"] == [1]
+    assert third["prompt"] == "And 3 + 3?" and third["context"] == [1, 2]
+    assert "messages" not in third, "the history is not resent"
+    assert [msg['content'] for msg in provider.messages if msg['role'] == 'assistant'] == ["answer 1", "answer 2", "answer 3"]
+    assert provider.get_context_stats()['context_turns'] == 2
+    print("✅ Only the first turn was evaluated from scratch")
+
+
+def test_changed_history_seeds_a_new_context():
+    print("🧪 Clearing the history and switching models...")
+    provider, session = fake_ollama()
+    provider.ask("Hi")
+    provider.ask("How are you?")
+    provider.clear_messages()
+    provider.ask("Fresh start")
+    assert "context" not in session.requests[-1][1]
+
+    provider.ask("Go on")
+    assert "context" in session.requests[-1][1]
+    provider.model = "llama3"
+    provider.ask("Same question, other model")
+    payload = session.requests[-1][1]
+    assert "context" not in payload and "Go on" in payload["system"], "reseeded from the turns so far"
+    print("✅ A context that no longer matched was never sent")
+
+
+def test_rejected_context_falls_back_to_chat():
+    print("🧪 The server rejects the saved context...")
+    provider, session = fake_ollama()
+    provider.ask("Hi")
+    session.reject_context = True
+    assert provider.ask("Still there?") == "chat answer"
+    endpoint, payload = session.requests[-1]
+    assert endpoint == "chat" and [msg['content'] for msg in payload["messages"]][-1] == "Still there?"
+
+    # The chat answer has no context, the next turn seeds a new one
+    provider.ask("Next")
+    assert session.requests[-1][0] == "generate" and "context" not in session.requests[-1][1]
+    print("✅ The full history was sent instead")
+
+
+def test_context_reuse_off_uses_chat():
+    provider, session = fake_ollama(reuse_context=False)
+    provider.ask("Hi")
+    provider.ask("Again")
+    assert [endpoint for endpoint, _ in session.requests] == ["chat", "chat"]
+    assert len(session.requests[-1][1]["messages"]) == 3
+
+
+if __name__ == "__main__":
+    test_later_turns_send_only_the_new_question()
+    test_changed_history_seeds_a_new_context()
+    test_rejected_context_falls_back_to_chat()
+    test_context_reuse_off_uses_chat()
+    print("\n🎉 Ollama context tests successful!")
@@ -0,0 +1,134 @@
+"""
+Test file for the rate limiter and the tokens reserved ahead of a request, with a fake backend instead of a real API
+"""
+import threading
+import time
+
+from ai_providers import AIProvider
+from rate_limit import FairRateLimiter
+
+
+class FakeProvider(AIProvider):
+    def __init__(self, limiter: FairRateLimiter):
+        super().__init__()
+        self.rate_limiter = limiter
+        self.calls = 0
+
+    @property
+    def name(self) -> str:
+        return "Fake"
+
+    def _call_api(self, message: list[dict[str, str]] | str) -> str:
+        self.calls += 1
+        answer = f"answer {self.calls}"
+        self.add_message("assistant", answer)
+        return answer
+
+    def _new_instance(self) -> "FakeProvider":
+        return FakeProvider(self.rate_limiter)
+
+    def ask(self, prompt: str) -> str:
+        super().ask(prompt)
+        return self._generic_ask(prompt)
+
+
+def timed_ask(provider: FakeProvider, prompt: str) -> float:
+    start = time.monotonic()
+    with provider.reserved_token():
+        assert provider.ask_with_timeout(prompt)
+    return time.monotonic() - start
+
+
+def queue_request(limiter: FairRateLimiter, user: str, served: list, stop_event: threading.Event | None = None):
+    """Queue one request of `user` and wait until it is in the queue"""
+    def acquire():
+        if limiter.acquire(user=user, stop_event=stop_event):
+            served.append(user)
+
+    waiting = sum(limiter.get_stats()['waiting'].values())
+    thread = threading.Thread(target=acquire)
+    thread.start()
+    while sum(limiter.get_stats()['waiting'].values()) == waiting:
+        time.sleep(0.005)
+    return thread
+
+
+def test_users_take_turns():
+    print("🧪 One user asking a lot while another asks twice...")
+    limiter = FairRateLimiter(requests_per_minute=600, burst=1)
+    assert limiter.acquire(user="setup"), "empty the bucket so everybody queues"
+    served = []
+    threads = [queue_request(limiter, "alice", served) for _ in range(4)]
+    threads += [queue_request(limiter, "bob", served) for _ in range(2)]
+    for thread in threads:
+        thread.join()
+    assert served == ["alice", "bob", "alice", "bob", "alice", "alice"], served
+    assert limiter.queued == 6
+    print("✅ Bob did not wait behind all of Alice's requests")
+
+
+def test_stopped_request_leaves_the_queue():
+    print("🧪 Giving up while queued...")
+    limiter = FairRateLimiter(requests_per_minute=60, burst=1)
+    assert limiter.acquire(user="setup")
+    served = []
+    stop = threading.Event()
+    waiting = queue_request(limiter, "alice", served, stop_event=stop)
+    stop.set()
+    waiting.join(timeout=1.0)
+    assert not waiting.is_alive() and not served
+    assert limiter.get_stats()['waiting'] == {}
+    print("✅ The stopped request gave up its place")
+
+
+def test_unused_reservations_go_back_to_the_limiter():
+    print("🧪 Reserving tokens for requests that never reach the API...")
+    limiter = FairRateLimiter(requests_per_minute=120, burst=1)
+    provider = FakeProvider(limiter)
+
+    # Breaker open: ask_with_timeout returns before asking
+    for _ in range(provider.breaker.failure_threshold):
+        provider.breaker.record_failure()
+    with provider.reserved_token():
+        assert provider.ask_with_timeout("Hello") == ""
+    provider.breaker.record_success()
+
+    # Invalid prompt
+    with provider.reserved_token():
+        assert provider.ask("   ") == "Please provide a valid prompt."
+
+    # Cancelled before the call
+    with provider.reserved_token():
+        provider._stop_event = threading.Event()
+        provider.cancel()
+        assert provider.ask("Hello") == "Request was cancelled"
+
+    assert provider.calls == 0
+    assert limiter.refunded == 3, limiter.get_stats()
+
+    # The burst of one is back: the first request is served at once, the next waits for the refill
+    assert timed_ask(provider, "Hello") < 0.2
+    waited = timed_ask(provider, "Hello again")
+    assert waited >= 0.4, waited
+    assert provider.calls == 2
+    print(f"✅ Every unused token was refunded, the next request still waited {waited:.2f}s")
+
+
+def test_reservation_is_taken_only_once():
+    print("🧪 Asking twice inside one reservation...")
+    limiter = FairRateLimiter(requests_per_minute=120, burst=2)
+    provider = FakeProvider(limiter)
+    with provider.reserved_token():
+        provider.ask_with_timeout("One")
+        provider.ask_with_timeout("Two")
+    # The reserved token and one more from the limiter
+    assert limiter.requests == 2 and limiter.refunded == 0, limiter.get_stats()
+    print("✅ The second request queued for its own token")
+
+
+if __name__ == "__main__":
+    test_users_take_turns()
+    test_stopped_request_leaves_the_queue()
+    test_unused_reservations_go_back_to_the_limiter()
+    test_reservation_is_taken_only_once()
+    print("\n🎉 Rate limit tests successful!")
@@ -0,0 +1,116 @@
+"""
+Test file for retrying transient errors: backoff, Retry-After and the shared retry budget, with a fake backend
+"""
+from ai_providers import AIProvider, AiProviderStatus
+from retry import RETRY_BUDGET, RetryBudget, RetryPolicy, is_retryable
+
+
+class HTTPError(Exception):
+    def __init__(self, status_code: int, headers: dict | None = None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class FailingProvider(AIProvider):
+    """Raises `errors` one by one, then answers"""
+
+    def __init__(self, errors: list[Exception]):
+        super().__init__()
+        self.retry_policy = RetryPolicy(max_attempts=3, base_delay=0.01, max_delay=0.05)
+        self.errors = list(errors)
+        self.calls = 0
+
+    @property
+    def name(self) -> str:
+        return "Failing"
+
+    def _call_api(self, message: list[dict[str, str]] | str) -> str:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        self.add_message("assistant", "answer")
+        return "answer"
+
+    def _new_instance(self) -> "FailingProvider":
+        return FailingProvider([])
+
+    def ask(self, prompt: str) -> str:
+        super().ask(prompt)
+        return self._generic_ask(prompt)
+
+
+def test_backoff_and_retry_after():
+    print("🧪 Computing backoff delays...")
+    policy = RetryPolicy(base_delay=0.5, max_delay=8.0)
+    for attempt in range(6):
+        for _ in range(20):
+            assert 0.0 <= policy.delay(attempt) <= min(8.0, 0.5 * 2 ** attempt)
+    # The server's Retry-After wins over a shorter backoff, but not over max_delay
+    assert policy.delay(0, HTTPError(429, {"Retry-After": "3"})) == 3.0
+    assert policy.delay(0, HTTPError(429, {"retry-after": "60"})) == 8.0
+    print("✅ Delays stayed within the jitter window")
+
+
+def test_what_is_retried():
+    assert is_retryable(ConnectionError("reset"))
+    assert is_retryable(TimeoutError())
+    assert is_retryable(HTTPError(503))
+    assert is_retryable(HTTPError(429))
+    assert not is_retryable(HTTPError(400))
+    assert not is_retryable(ValueError("bad request"))
+
+
+def test_retry_budget():
+    print("🧪 Spending the retry budget...")
+    budget = RetryBudget(ratio=0.5, max_tokens=1.0)
+    assert budget.try_spend()
+    assert not budget.try_spend()
+    budget.record_request()
+    assert not budget.try_spend(), "half a token is not enough"
+    budget.record_request()
+    assert budget.try_spend()
+    for _ in range(10):
+        budget.record_request()
+    assert budget.get_stats()['tokens'] == 1.0, "saved up retries are capped"
+    assert budget.retries == 2 and budget.denied == 2
+    print("✅ Retries were bounded by the requests made")
+
+
+def test_provider_retries_transient_errors_only():
+    print("🧪 Asking a backend that fails now and then...")
+    provider = FailingProvider([ConnectionError("reset"), HTTPError(503)])
+    assert provider.ask_with_timeout("Hello") == "answer"
+    assert provider.calls == 3
+
+    provider = FailingProvider([HTTPError(400)])
+    provider.ask_with_timeout("Hello")
+    assert provider.calls == 1 and provider.status == AiProviderStatus.ERROR
+
+    provider = FailingProvider([ConnectionError("reset")] * 5)
+    provider.ask_with_timeout("Hello")
+    assert provider.calls == provider.retry_policy.max_attempts
+    print("✅ Transient errors were retried up to max_attempts, the others not at all")
+
+
+def test_provider_stops_retrying_when_budget_is_spent():
+    print("🧪 Failing while the shared retry budget is empty...")
+    saved = RETRY_BUDGET._tokens
+    try:
+        while RETRY_BUDGET.try_spend():
+            pass
+        provider = FailingProvider([ConnectionError("reset")])
+        provider.ask_with_timeout("Hello")
+        assert provider.calls == 1
+    finally:
+        RETRY_BUDGET._tokens = saved
+    print("✅ No retry without budget")
+
+
+if __name__ == "__main__":
+    test_backoff_and_retry_after()
+    test_what_is_retried()
+    test_retry_budget()
+    test_provider_retries_transient_errors_only()
+    test_provider_stops_retrying_when_budget_is_spent()
+    print("\n🎉 Retry tests successful!")
@@ -0,0 +1,92 @@
+"""
+Test file to ask questions through the routers end-to-end, with fake backends instead of real APIs
+"""
+import time
+
+from ai_providers import AIProvider, AiProviderStatus
+from circuit_breaker import CircuitState
+from router import FailoverRouter, HedgedRouter
+
+
+class FakeProvider(AIProvider):
+    def __init__(self, name: str, delay: float = 0.0, fail: bool = False):
+        super().__init__()
+        self._name = name
+        self.delay = delay
+        self.fail = fail
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def _call_api(self, message: list[dict[str, str]] | str) -> str:
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError(f"{self._name} is down")
+        question = message[-1]['content'] if isinstance(message, list) else message
+        answer = f"{self._name} answers {question}"
+        if isinstance(message, list):
+            self.add_message("assistant", answer)
+        return answer
+
+    def _new_instance(self) -> "FakeProvider":
+        return FakeProvider(self._name, self.delay, self.fail)
+
+    def ask(self, prompt: str) -> str:
+        super().ask(prompt)
+        return self._generic_ask(prompt)
+
+
+def test_hedged_router_answers():
+    print("🧪 Asking through HedgedRouter...")
+    router = HedgedRouter([FakeProvider("primary"), FakeProvider("secondary")])
+    for question in ["Hello", "What's my name?"]:
+        answer = router.ask_with_timeout(question)
+        assert answer == f"primary answers {question}", answer
+        assert router.status == AiProviderStatus.IDLE
+    assert [msg['role'] for msg in router.messages] == ['user', 'assistant', 'user', 'assistant']
+    assert router.get_conversation_stats()['assistant_messages'] == 2
+    assert router.breaker.state is CircuitState.CLOSED
+    print("✅ HedgedRouter answered with the full history")
+
+
+def test_hedged_router_hedges_slow_primary():
+    print("🧪 Hedging a slow primary...")
+    router = HedgedRouter([FakeProvider("slow", delay=1.0), FakeProvider("fast")], default_hedge_delay=0.05)
+    answer = router.ask_with_timeout("Hello")
+    assert answer == "fast answers Hello", answer
+    assert router.get_router_stats()['slow']['hedged'] == 1
+    print("✅ The secondary answered for the slow primary")
+
+
+def test_failover_router_fails_over():
+    print("🧪 Asking through FailoverRouter with a broken primary...")
+    router = FailoverRouter([FakeProvider("broken", fail=True), FakeProvider("backup")])
+    router.retry_policy.max_attempts = 1
+    for provider in router.providers:
+        provider.retry_policy.max_attempts = 1
+    answer = router.ask_with_timeout("Hello")
+    assert answer == "backup answers Hello", answer
+    assert router.last_winner is router.providers[1]
+    print("✅ FailoverRouter answered from the backup")
+
+
+def test_hedged_router_times_out():
+    print("🧪 Asking through HedgedRouter with backends slower than the timeout...")
+    router = HedgedRouter([FakeProvider("slow", delay=2.0), FakeProvider("slower", delay=2.0)], default_hedge_delay=0.05)
+    router.timeout = 0.3
+    start = time.monotonic()
+    answer = router._generic_ask("Hello")
+    assert answer == "", answer
+    assert time.monotonic() - start < 1.0
+    time.sleep(0.2)
+    assert all(provider._stop_event.is_set() for provider in router.providers)
+    print("✅ The backend requests were cancelled at the timeout")
+
+
+if __name__ == "__main__":
+    test_hedged_router_answers()
+    test_hedged_router_hedges_slow_primary()
+    test_failover_router_fails_over()
+    test_hedged_router_times_out()
+    print("\n🎉 Router tests successful!")
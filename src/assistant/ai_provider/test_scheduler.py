@@ -0,0 +1,67 @@
+"""
+Test file for the priority scheduler: urgent questions first, waiting ones aging up
+"""
+import threading
+import time
+
+from scheduler import Priority, PriorityScheduler, current_priority
+
+
+def queue(scheduler: PriorityScheduler, priority: Priority, order: list) -> threading.Thread:
+    """Queue a request for the single slot and wait until it is waiting"""
+    waiting = sum(s['waiting'] for s in scheduler.get_stats().values())
+    thread = threading.Thread(target=scheduler.run, args=(lambda: order.append(priority), priority))
+    thread.start()
+    while sum(s['waiting'] for s in scheduler.get_stats().values()) == waiting:
+        time.sleep(0.005)
+    return thread
+
+
+def test_most_urgent_first():
+    print("🧪 Queueing background, normal and interactive questions...")
+    scheduler = PriorityScheduler(max_concurrent=1, aging_interval=60.0)
+    order = []
+    scheduler.acquire(Priority.INTERACTIVE)
+    threads = [queue(scheduler, priority, order)
+               for priority in (Priority.BACKGROUND, Priority.NORMAL, Priority.INTERACTIVE, Priority.NORMAL)]
+    scheduler.release()
+    for thread in threads:
+        thread.join()
+    assert order == [Priority.INTERACTIVE, Priority.NORMAL, Priority.NORMAL, Priority.BACKGROUND]
+    print("✅ Served by priority, in arrival order within one")
+
+
+def test_waiting_requests_age():
+    print("🧪 Letting a background question wait...")
+    scheduler = PriorityScheduler(max_concurrent=1, aging_interval=0.1)
+    order = []
+    scheduler.acquire(Priority.INTERACTIVE)
+    background = queue(scheduler, Priority.BACKGROUND, order)
+    # More than two aging intervals: now ahead of a fresh interactive question
+    time.sleep(0.3)
+    interactive = queue(scheduler, Priority.INTERACTIVE, order)
+    scheduler.release()
+    background.join()
+    interactive.join()
+    assert order == [Priority.BACKGROUND, Priority.INTERACTIVE]
+    assert scheduler.get_stats()['background']['aged'] == 1
+    print("✅ The background question was not starved")
+
+
+def test_priority_comes_from_the_context():
+    scheduler = PriorityScheduler()
+    token = current_priority.set(Priority.BACKGROUND)
+    try:
+        scheduler.run(lambda: None)
+    finally:
+        current_priority.reset(token)
+    scheduler.run(lambda: None)
+    stats = scheduler.get_stats()
+    assert stats['background']['requests'] == 1 and stats['interactive']['requests'] == 1
+
+
+if __name__ == "__main__":
+    test_most_urgent_first()
+    test_waiting_requests_age()
+    test_priority_comes_from_the_context()
+    print("\n🎉 Scheduler tests successful!")
@@ -0,0 +1,110 @@
+"""
+Test file for sharing one generation between identical questions asked at the same time
+"""
+import threading
+import time
+
+from ai_providers import AIProvider
+from single_flight import SingleFlight, request_key
+
+
+class EchoProvider(AIProvider):
+    @property
+    def name(self) -> str:
+        return "Echo"
+
+    def _call_api(self, message: list[dict[str, str]] | str) -> str:
+        return "echo"
+
+    def _new_instance(self) -> "EchoProvider":
+        return EchoProvider()
+
+    def ask(self, prompt: str) -> str:
+        super().ask(prompt)
+        return self._generic_ask(prompt)
+
+
+class RequestCancelled(Exception):
+    pass
+
+
+def ask_together(flight: SingleFlight, fn, callers: int) -> tuple[list[threading.Thread], tuple[list, list]]:
+    """Run `callers` threads on one key, the first one starts `fn` before the others join"""
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(flight.do("key", fn))
+        except RequestCancelled as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(callers)]
+    threads[0].start()
+    while not flight.in_flight():
+        time.sleep(0.01)
+    for thread in threads[1:]:
+        thread.start()
+    while flight.coalesced < callers - 1:
+        time.sleep(0.01)
+    return threads, (results, errors)
+
+
+def test_identical_questions_share_one_call():
+    print("🧪 Asking the same question four times at once...")
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def generate():
+        calls.append(1)
+        release.wait(timeout=5)
+        return "4"
+
+    threads, (results, errors) = ask_together(flight, generate, 4)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert sorted(results) == [("4", False), ("4", True), ("4", True), ("4", True)]
+    assert flight.get_stats()['backend_calls'] == 1 and flight.max_waiters == 3
+    assert flight.in_flight() == 0
+    print("✅ One backend call answered all four")
+
+
+def test_cancelled_call_is_not_reused():
+    print("🧪 Cancelling a call others are waiting for...")
+    flight = SingleFlight()
+    cancel = threading.Event()
+
+    def generate():
+        cancel.wait(timeout=5)
+        raise RequestCancelled("stopped by the user")
+
+    threads, (results, errors) = ask_together(flight, generate, 3)
+    cancel.set()
+    for thread in threads:
+        thread.join()
+    assert not results and len(errors) == 3, "every waiter sees the cancellation"
+    assert flight.in_flight() == 0
+
+    # The next identical question starts a fresh call
+    assert flight.do("key", lambda: "4") == ("4", False)
+    print("✅ Waiters were released and the cancelled call was forgotten")
+
+
+def test_request_key():
+    provider = EchoProvider()
+    assert request_key("What is 2 + 2?", provider) == request_key("  what is 2  + 2 ", provider)
+    before = request_key("What is 2 + 2?", provider)
+    # The leader already added the question to the history
+    provider.add_message("user", "What is 2 + 2?")
+    assert request_key("What is 2 + 2?", provider) == before
+    provider.add_message("assistant", "4")
+    assert request_key("What is 2 + 2?", provider) != before, "another history may give another answer"
+
+
+if __name__ == "__main__":
+    test_identical_questions_share_one_call()
+    test_cancelled_call_is_not_reused()
+    test_request_key()
+    print("\n🎉 Single flight tests successful!")
@@ -6,12 +6,19 @@ It provides a complete conversational AI assistant with speech recognition,
 response generation, and conversation management.
 """
 
-import re
+import time
 from enum import Enum 
+from typing import Callable
 
 from .ai_provider import AIProvider, Ollama
+from .ai_provider.scheduler import PriorityScheduler
+from .ai_provider.single_flight import SingleFlight, request_key
 from .robot.assistant_robo import ASSISTANT
+from .robot.answer_helper.answer_helper import clean_for_speech
 from .files.files import Files
+from .pipeline.voice_pipeline import VoicePipeline
+from .session.session_store import SessionStore
+from .session.context_spill import ContextSpill, DEFAULT_SPILL_PATH
 
 EXAMPLE_QUESTIONS = [
         {
@@ -89,6 +96,7 @@ class ConversationalAssistant(ASSISTANT):
     def __init__(self, 
                 ai_provider: AIProvider,
                 name: str = "Conversational Assistant",
+                spill_path: str | None = DEFAULT_SPILL_PATH,
                 ):
         super().__init__(
             name=name,
@@ -101,6 +109,20 @@ class ConversationalAssistant(ASSISTANT):
         self.current_prompt_index = 0
         self._state = ConversationStates.INITIALIZED
         self._ai_provider = ai_provider
+        """Concurrent voice loop, replaces listen()/answer() while running"""
+        self.pipeline: VoicePipeline | None = None
+        """Identical questions asked at the same time share one generation"""
+        self.single_flight = SingleFlight()
+        """Voice turns before API questions before batch work, see current_priority.
+        The shared provider keeps per-request state, it answers one question at a time"""
+        self.scheduler = PriorityScheduler(max_concurrent=1)
+        """Sessions have their own providers, several of them may answer at once"""
+        self.session_scheduler = PriorityScheduler(max_concurrent=4)
+        """Separate conversations for API users, each on its own copy of the provider.
+        Evicted conversations go to `spill_path` and come back on the session's next question,
+        without a path they are dropped"""
+        spill = ContextSpill(spill_path) if spill_path is not None else None
+        self.sessions = SessionStore(lambda: self.ai_provider.new_conversation(), spill=spill)
 
     @property
     def ai_provider(self) -> AIProvider:
@@ -109,6 +131,9 @@ class ConversationalAssistant(ASSISTANT):
     @ai_provider.setter
     def ai_provider(self, provider: AIProvider):
         self._ai_provider = provider
+        if self.pipeline is not None:
+            # The voice loop asks the new provider from its next turn on
+            self.pipeline.ai_provider = provider
 
     def greet(self) -> None:
         """Perform a greeting sequence"""
@@ -131,9 +156,7 @@ class ConversationalAssistant(ASSISTANT):
 
         text = self.response if not text else text
         # Clean unwanted characters
-        clean_text = re.sub(r"[*_`~#>\\-]", "", text)
-        clean_text = re.sub(r"[\U00010000-\U0010ffff]", "", clean_text)
-        self.answer_helper.speak(clean_text)
+        self.answer_helper.speak(clean_for_speech(text))
 
     def process_command(self, cmd: str = "") -> None:
         """First set the state to processing"""
@@ -146,7 +169,7 @@ class ConversationalAssistant(ASSISTANT):
         question = self.question_helper.what_spoken()
         """
         self.query = cmd if cmd else self.question_helper.question
-        question = self.question_helper.what_spoken()
+        question = cmd if cmd else self.question_helper.what_spoken()
         print(f"Processing Command: {question}")
         try:
             self.response = self.ask_to_ai(question)
@@ -157,9 +180,54 @@ class ConversationalAssistant(ASSISTANT):
         """Now Speak The Response"""
 
     def ask_to_ai(self, question: str) -> str:
-        response = self.ai_provider.ask(question)
+        return self._ask_once(question, self.ai_provider.ask)
+
+    def _ask_once(self, question: str, ask: Callable[[str], str]) -> str:
+        return self._ask_shared(question, ask, self.ai_provider, self.scheduler)[0]
+
+    def _ask_shared(
+        self, question: str, ask: Callable[[str], str], provider: AIProvider, scheduler: PriorityScheduler
+    ) -> tuple[str, bool]:
+        """Join a generation already running for the same question, provider and history"""
+        def generate() -> str:
+            # Wait for the rate limit before taking a slot, not while holding it
+            with provider.reserved_token():
+                return scheduler.run(lambda: ask(question))
+
+        response, shared = self.single_flight.do(request_key(question, provider), generate)
+        if shared:
+            print(f"🔗 Shared the answer of an identical question in flight: {question}")
+        return response, shared
+
+    def ask_in_session(self, session_id: str, question: str) -> str:
+        """Answer within the session's own conversation, other sessions run in parallel"""
+        with self.sessions.use(session_id) as session, session.lock:
+            provider = session.provider
+            response, shared = self._ask_shared(
+                question, provider.ask_with_timeout, provider, self.session_scheduler
+            )
+            if shared and response:
+                # Generated for another session, record the turn in this conversation too
+                provider.add_message("user", question)
+                provider.add_message("assistant", response)
+            session.questions += 1
+            session.last_used = time.monotonic()
         return response
 
+    def say(self, text: str) -> None:
+        """Speak an answer that is already known, without asking the AI again"""
+        self.response = text
+        self.speak(clean_for_speech(text))
+
+    def get_coalescing_stats(self) -> dict:
+        return self.single_flight.get_stats()
+
+    def get_scheduler_stats(self) -> dict:
+        return {'shared': self.scheduler.get_stats(), 'sessions': self.session_scheduler.get_stats()}
+
+    def get_session_stats(self) -> dict:
+        return self.sessions.get_stats()
+
     @property
     def state(self):
         return self._state
@@ -179,6 +247,30 @@ class ConversationalAssistant(ASSISTANT):
     def is_answering(self) -> bool:
         _is_answering = self.answer_helper.is_answering() or self.state == ConversationStates.PROCESSING
         return _is_answering
+
+    def stop_speaking(self) -> None:
+        """Stop speaking and drop the answer still being generated"""
+        self.ai_provider.cancel()
+        super().stop_speaking()
+        self.state = ConversationStates.IDLE
+
+    def start_voice_pipeline(self) -> VoicePipeline:
+        """Run capture, STT, LLM, TTS and playback as concurrent stages"""
+        if self.pipeline is None:
+            self.pipeline = VoicePipeline(
+                capture=self.question_helper.capture,
+                stt=self.question_helper.stt,
+                ai_provider=self.ai_provider,
+                tts=self.answer_helper.tts,
+                scheduler=self.scheduler,
+            )
+        self.pipeline.start()
+        return self.pipeline
+
+    def stop_voice_pipeline(self) -> None:
+        if self.pipeline is not None:
+            self.pipeline.stop()
+
     @staticmethod
     def get_example_questions():
         return EXAMPLE_QUESTIONS
@@ -0,0 +1,4 @@
+# Pipeline Package Exports
+from .voice_pipeline import VoicePipeline, PipelineStage, Turn
+
+__all__ = ['VoicePipeline', 'PipelineStage', 'Turn']
@@ -0,0 +1,108 @@
+"""
+Test file for the voice pipeline's speech bookkeeping, with fake STT, provider and TTS instead of real devices.
+Run from src: python -m pytest assistant/pipeline/test_voice_pipeline.py
+"""
+import threading
+import time
+
+from assistant.ai_provider.ai_providers import AIProvider
+from assistant.pipeline.voice_pipeline import Turn, VoicePipeline
+from assistant.robot.question_helper.audio.audio_capture import AudioCapture
+from assistant.robot.question_helper.stt.stt import STT
+
+
+class FakeSTT(STT):
+    @property
+    def name(self) -> str:
+        return "Fake STT"
+
+    def hear(self) -> str:
+        return ""
+
+
+class FakeProvider(AIProvider):
+    @property
+    def name(self) -> str:
+        return "Fake"
+
+    def _call_api(self, message: list[dict[str, str]] | str) -> str:
+        answer = "First sentence. Second sentence. Third sentence."
+        self.add_message("assistant", answer)
+        return answer
+
+    def _new_instance(self) -> "FakeProvider":
+        return FakeProvider()
+
+    def ask(self, prompt: str) -> str:
+        super().ask(prompt)
+        return self._generic_ask(prompt)
+
+
+class FakeTTS:
+    def synthesize(self, text: str) -> str:
+        return ""
+
+    def play(self, wav_path: str) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def remove_wav_file(self, wav_path: str) -> None:
+        pass
+
+
+class CancelAfterCheck(VoicePipeline):
+    """Cancels from another thread right after the LLM stage checked its turn is current"""
+
+    def __init__(self):
+        super().__init__(AudioCapture(), FakeSTT(), FakeProvider(), FakeTTS())
+        self.canceller: threading.Thread | None = None
+
+    def _is_stale(self, item) -> bool:
+        stale = super()._is_stale(item)
+        if isinstance(item, Turn) and self.canceller is None:
+            self.canceller = threading.Thread(target=self.cancel)
+            self.canceller.start()
+            # Give the cancel every chance to run before the count goes up
+            time.sleep(0.1)
+        return stale
+
+
+def test_cancel_between_generation_and_queueing():
+    print("🧪 Cancelling while an answer is about to be queued...")
+    pipeline = CancelAfterCheck()
+    pipeline._generate(Turn(id=1, generation=pipeline._generation, question="Hello"))
+    pipeline.canceller.join()
+    assert not pipeline.is_speaking(), pipeline._pending_speech
+    assert pipeline._sentences.qsize() == 0
+    print("✅ Nothing is left counted as speaking, the microphone opens again")
+
+
+def test_sentences_not_queued_are_not_counted():
+    print("🧪 Queueing an answer while the pipeline stops...")
+    pipeline = VoicePipeline(AudioCapture(), FakeSTT(), FakeProvider(), FakeTTS())
+    pipeline._stop_event.set()
+    pipeline._generate(Turn(id=1, generation=pipeline._generation, question="Hello"))
+    assert not pipeline.is_speaking(), pipeline._pending_speech
+    print("✅ Sentences that never reached TTS were taken back")
+
+
+def test_answer_is_counted_until_played():
+    print("🧪 Queueing an answer...")
+    pipeline = VoicePipeline(AudioCapture(), FakeSTT(), FakeProvider(), FakeTTS(), queue_size=2)
+    pipeline._generate(Turn(id=1, generation=pipeline._generation, question="Hello"))
+    assert pipeline._pending_speech == 3
+    while not pipeline._sentences.empty():
+        # Synthesis fails in FakeTTS, each sentence is done right away
+        pipeline._synthesize(pipeline._sentences.get_nowait())
+    assert not pipeline.is_speaking()
+    assert len(pipeline.completed_turns) == 1
+    print("✅ The answer was counted as speech until its last sentence was done")
+
+
+if __name__ == "__main__":
+    test_cancel_between_generation_and_queueing()
+    test_sentences_not_queued_are_not_counted()
+    test_answer_is_counted_until_played()
+    print("\n🎉 Voice pipeline tests successful!")
@@ -0,0 +1,371 @@
+"""
+Voice Pipeline Module
+
+Runs capture -> STT -> LLM -> TTS -> playback as concurrent stages, each on
+its own worker thread, connected by bounded queues. While one sentence of an
+answer is playing the next one is already being synthesized, and a new
+question can be transcribed while the previous answer is still generating.
+"""
+
+import queue
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+
+from ..ai_provider.ai_providers import AIProvider
+from ..ai_provider.scheduler import Priority, PriorityScheduler
+from ..robot.answer_helper.answer_helper import clean_for_speech
+from ..robot.answer_helper.tts.piper_tts import PIPER_TTS
+from ..robot.question_helper.audio.audio_capture import AudioCapture
+from ..robot.question_helper.audio.barge_in import BargeIn
+from ..robot.question_helper.audio.ring_buffer import AudioSpan, BufferOverrun
+from ..robot.question_helper.audio.utterance import UtteranceCollector
+from ..robot.question_helper.stt.stt import STT
+
+
+class PipelineStage(Enum):
+    CAPTURE = "capture"
+    STT = "stt"
+    LLM = "llm"
+    TTS = "tts"
+    PLAYBACK = "playback"
+
+
+@dataclass
+class Turn:
+    """One question/answer round trip and where its time went"""
+    id: int
+    generation: int
+    """Where the question sits in the capture ring, read only by STT"""
+    audio: AudioSpan | None = None
+    question: str = ""
+    answer: str = ""
+    """stage -> [first start, last end] in time.monotonic() seconds"""
+    timings: dict[str, list[float]] = field(default_factory=dict)
+
+    def mark_start(self, stage: PipelineStage, at: float | None = None) -> None:
+        at = time.monotonic() if at is None else at
+        self.timings.setdefault(stage.value, [at, at])
+
+    def mark_end(self, stage: PipelineStage, at: float | None = None) -> None:
+        at = time.monotonic() if at is None else at
+        self.timings.setdefault(stage.value, [at, at])[1] = at
+
+    def durations(self) -> dict[str, float]:
+        return {stage: end - start for stage, (start, end) in self.timings.items()}
+
+    def response_latency(self) -> float | None:
+        """End of the user's speech to the first sound of the answer"""
+        capture = self.timings.get(PipelineStage.CAPTURE.value)
+        playback = self.timings.get(PipelineStage.PLAYBACK.value)
+        if capture is None or playback is None:
+            return None
+        return playback[0] - capture[1]
+
+
+@dataclass
+class Segment:
+    """A sentence of an answer travelling through TTS and playback"""
+    turn: Turn
+    text: str
+    last: bool
+    wav_path: str = ""
+
+
+def split_sentences(text: str) -> list[str]:
+    sentences = [s.strip() for s in re.split(r"(?<=[.!?])\s+", text)]
+    return [s for s in sentences if s]
+
+
+class VoicePipeline:
+    """
+    Full-duplex voice loop.
+
+    Every queue is bounded: a slow stage blocks the one before it instead of
+    piling up work, except capture, which cannot wait and drops the oldest
+    utterance instead. `cancel()` (also triggered by barge-in) bumps the
+    generation so stale items are dropped by every stage, and stops the
+    provider request and playback in flight.
+    """
+
+    def __init__(
+        self,
+        capture: AudioCapture,
+        stt: STT,
+        ai_provider: AIProvider,
+        tts: PIPER_TTS,
+        queue_size: int = 2,
+        scheduler: PriorityScheduler | None = None,
+    ):
+        self.capture = capture
+        self.stt = stt
+        self.ai_provider = ai_provider
+        self.tts = tts
+        """Shared with other users of the provider, voice turns go first"""
+        self.scheduler = scheduler
+        self._utterances: queue.Queue[Turn] = queue.Queue(maxsize=queue_size)
+        self._questions: queue.Queue[Turn] = queue.Queue(maxsize=queue_size)
+        self._sentences: queue.Queue[Segment] = queue.Queue(maxsize=queue_size * 2)
+        self._speech: queue.Queue[Segment] = queue.Queue(maxsize=queue_size)
+        self._collector = UtteranceCollector(
+            self._on_utterance,
+            capture.buffer,
+            frame_duration=capture.frame_duration,
+        )
+        self.barge_in = BargeIn(capture, self.is_speaking, self.cancel)
+
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._next_turn_id = 0
+        """Sentences handed to TTS that have not finished playing"""
+        self._pending_speech = 0
+        self._stop_event = threading.Event()
+        self._workers: list[threading.Thread] = []
+        self._previous_gate = None
+
+        self.completed_turns: deque[Turn] = deque(maxlen=100)
+        self.dropped_utterances = 0
+        """Utterances overwritten in the ring buffer before STT got to them"""
+        self.overrun_utterances = 0
+        """Times the user interrupted (barge-in) or cancel() was called"""
+        self.cancelled_turns = 0
+
+    def start(self) -> None:
+        if self._workers:
+            return
+        self._stop_event.clear()
+        stages = [
+            (PipelineStage.STT, self._utterances, self._transcribe),
+            (PipelineStage.LLM, self._questions, self._generate),
+            (PipelineStage.TTS, self._sentences, self._synthesize),
+            (PipelineStage.PLAYBACK, self._speech, self._play),
+        ]
+        for stage, inbox, handler in stages:
+            worker = threading.Thread(
+                target=self._work, args=(stage, inbox, handler), daemon=True, name=f"pipeline-{stage.value}"
+            )
+            worker.start()
+            self._workers.append(worker)
+        # Don't transcribe our own answers
+        self._previous_gate = self.capture.gate
+        self.capture.gate = self.is_speaking
+        self.capture.add_listener(self._collector.process)
+        self.barge_in.start()
+        self.capture.start()
+        print("🎙️ Voice pipeline started")
+
+    def stop(self) -> None:
+        self._cancel()
+        self._stop_event.set()
+        self.barge_in.stop()
+        self.capture.remove_listener(self._collector.process)
+        self.capture.gate = self._previous_gate
+        self.capture.release()
+        for worker in self._workers:
+            worker.join(timeout=1.0)
+        self._workers = []
+        print("🎙️ Voice pipeline stopped")
+
+    def is_running(self) -> bool:
+        return bool(self._workers) and not self._stop_event.is_set()
+
+    def is_speaking(self) -> bool:
+        return self._pending_speech > 0
+
+    def cancel(self) -> None:
+        """Drop every turn in flight, in all stages"""
+        self.cancelled_turns += 1
+        self._cancel()
+
+    def _cancel(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._pending_speech = 0
+        for inbox in (self._utterances, self._questions, self._sentences, self._speech):
+            self._drain(inbox)
+        self.ai_provider.cancel()
+        self.tts.stop()
+
+    def _drain(self, inbox: queue.Queue) -> None:
+        while True:
+            try:
+                item = inbox.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(item)
+
+    def _discard(self, item: Turn | Segment) -> None:
+        if isinstance(item, Segment) and item.wav_path:
+            self.tts.remove_wav_file(item.wav_path)
+
+    def _is_stale(self, item: Turn | Segment) -> bool:
+        turn = item.turn if isinstance(item, Segment) else item
+        return turn.generation != self._generation
+
+    def _put(self, outbox: queue.Queue, item: Turn | Segment) -> bool:
+        """Blocking put, this is where backpressure reaches the previous stage"""
+        while not self._stop_event.is_set() and not self._is_stale(item):
+            try:
+                outbox.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _work(self, stage: PipelineStage, inbox: queue.Queue, handler) -> None:
+        while not self._stop_event.is_set():
+            try:
+                item = inbox.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if self._is_stale(item):
+                self._discard(item)
+                continue
+            try:
+                handler(item)
+            except Exception as e:
+                print(f"❌ Pipeline {stage.value} error: {e}")
+
+    def _on_utterance(self, audio: AudioSpan, start_time: float, end_time: float) -> None:
+        """Capture stage, runs on the capture thread so it must never block"""
+        with self._lock:
+            self._next_turn_id += 1
+            turn = Turn(id=self._next_turn_id, generation=self._generation, audio=audio)
+        turn.mark_start(PipelineStage.CAPTURE, start_time)
+        turn.mark_end(PipelineStage.CAPTURE, end_time)
+        while True:
+            try:
+                self._utterances.put_nowait(turn)
+                return
+            except queue.Full:
+                try:
+                    self._utterances.get_nowait()
+                    self.dropped_utterances += 1
+                except queue.Empty:
+                    pass
+
+    def _transcribe(self, turn: Turn) -> None:
+        turn.mark_start(PipelineStage.STT)
+        try:
+            # The only copy of the audio, made as late as possible
+            pcm = turn.audio.tobytes()
+        except BufferOverrun as e:
+            self.overrun_utterances += 1
+            print(f"⚠️ Dropping utterance, STT fell behind capture: {e}")
+            return
+        finally:
+            turn.audio = None
+        turn.question = self.stt.recognize(pcm, self.capture.sample_rate, self.capture.sample_width)
+        turn.mark_end(PipelineStage.STT)
+        if turn.question:
+            self._put(self._questions, turn)
+
+    def _ask(self, turn: Turn) -> None:
+        turn.mark_start(PipelineStage.LLM)
+        turn.answer = self.ai_provider.ask_with_timeout(turn.question)
+        turn.mark_end(PipelineStage.LLM)
+
+    def _generate(self, turn: Turn) -> None:
+        if self.scheduler is not None:
+            # Wait for the rate limit before taking a slot, not while holding it
+            with self.ai_provider.reserved_token():
+                self.scheduler.run(lambda: self._ask(turn), Priority.INTERACTIVE)
+        else:
+            self._ask(turn)
+        sentences = split_sentences(clean_for_speech(turn.answer))
+        if not sentences:
+            return
+        with self._lock:
+            # Checked together, a cancel in between would reset the count before it goes up
+            if self._is_stale(turn):
+                return
+            self._pending_speech += len(sentences)
+        for i, sentence in enumerate(sentences):
+            if not self._put(self._sentences, Segment(turn, sentence, last=i == len(sentences) - 1)):
+                # The rest will never be played
+                self._unpend(turn, len(sentences) - i)
+                return
+
+    def _synthesize(self, segment: Segment) -> None:
+        segment.turn.mark_start(PipelineStage.TTS)
+        segment.wav_path = self.tts.synthesize(segment.text)
+        segment.turn.mark_end(PipelineStage.TTS)
+        if not segment.wav_path:
+            self._speech_done(segment)
+        elif not self._put(self._speech, segment):
+            self.tts.remove_wav_file(segment.wav_path)
+
+    def _play(self, segment: Segment) -> None:
+        segment.turn.mark_start(PipelineStage.PLAYBACK)
+        try:
+            self.tts.play(segment.wav_path)
+        finally:
+            self.tts.remove_wav_file(segment.wav_path)
+        segment.turn.mark_end(PipelineStage.PLAYBACK)
+        self._speech_done(segment)
+
+    def _unpend(self, turn: Turn, count: int) -> None:
+        """Take back sentences counted in _pending_speech that will not be played"""
+        with self._lock:
+            # A cancel already reset the count for stale turns
+            if not self._is_stale(turn):
+                self._pending_speech = max(0, self._pending_speech - count)
+
+    def _speech_done(self, segment: Segment) -> None:
+        with self._lock:
+            if self._is_stale(segment):
+                return
+            self._pending_speech = max(0, self._pending_speech - 1)
+        if segment.last:
+            self.completed_turns.append(segment.turn)
+
+    def get_stats(self) -> dict:
+        """Average time per stage over the last completed turns, in ms"""
+        turns = list(self.completed_turns)
+        stages = {}
+        for stage in PipelineStage:
+            values = [t.durations()[stage.value] for t in turns if stage.value in t.timings]
+            stages[stage.value] = 1000 * sum(values) / len(values) if values else 0.0
+        latencies = [t.response_latency() for t in turns if t.response_latency() is not None]
+        return {
+            'completed_turns': len(turns),
+            'dropped_utterances': self.dropped_utterances,
+            'cancelled_turns': self.cancelled_turns,
+            'overrun_utterances': self.overrun_utterances,
+            'audio_buffer_kb': self.capture.buffer.capacity // 1024,
+            'avg_stage_ms': stages,
+            'avg_response_latency_ms': 1000 * sum(latencies) / len(latencies) if latencies else 0.0,
+            'queue_depths': {
+                PipelineStage.STT.value: self._utterances.qsize(),
+                PipelineStage.LLM.value: self._questions.qsize(),
+                PipelineStage.TTS.value: self._sentences.qsize(),
+                PipelineStage.PLAYBACK.value: self._speech.qsize(),
+            },
+        }
+
+
+def test_voice_pipeline():
+    from ..ai_provider import Ollama
+    from ..robot.question_helper.stt.google_stt import GoogleSTT
+
+    pipeline = VoicePipeline(
+        capture=AudioCapture(),
+        stt=GoogleSTT(),
+        ai_provider=Ollama(),
+        tts=PIPER_TTS(),
+    )
+    pipeline.start()
+    print("🎤 Talk to the robot, Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(10)
+            print(pipeline.get_stats())
+    except KeyboardInterrupt:
+        pipeline.stop()
+
+
+if __name__ == "__main__":
+    test_voice_pipeline()
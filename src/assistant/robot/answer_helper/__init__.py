@@ -1,11 +1,12 @@
 # AnswerHelper Package Exports
-from .answer_helper import AnswerHelper, AnswerHelperState
+from .answer_helper import AnswerHelper, AnswerHelperState, clean_for_speech
 from .tts.tts import TTS, TTSState
 from .tts.piper_tts import PIPER_TTS
 
 __all__ = [
     'AnswerHelper',
     'AnswerHelperState',
+    'clean_for_speech',
     'TTS',
     'TTSState',
     'PIPER_TTS'
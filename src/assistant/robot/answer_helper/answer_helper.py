@@ -1,4 +1,5 @@
 # from answer_helper import TTS
+import re
 import threading
 # For Test
 import time
@@ -21,6 +22,12 @@ class AnswerHelperState(Enum):
     ERROR = "error"
 
 
+def clean_for_speech(text: str) -> str:
+    """Strip markdown symbols and emojis that TTS would read out"""
+    clean_text = re.sub(r"[*_`~#>\\-]", "", text)
+    return re.sub(r"[\U00010000-\U0010ffff]", "", clean_text)
+
+
 class AnswerHelper:
     """_summary_
 
@@ -67,6 +74,13 @@ class AnswerHelper:
                 self.state = AnswerHelperState.PROCESSING
             else:
                 self.state = AnswerHelperState.IDLE
+        # TTS may finish before this thread gets scheduled, never stay stuck in PROCESSING
+        self.state = AnswerHelperState.IDLE
+
+    def stop(self) -> None:
+        """Cut the current answer short"""
+        self.tts.stop()
+        self.state = AnswerHelperState.IDLE
 
     def get_tts_thread(self) -> threading.Thread | None:
         return self._tts_thread
@@ -54,6 +54,11 @@ class PIPER_TTS(TTS):
         super().__init__()
         self._text = ""
         self.piper_state = PiperState.IDLE
+        """Running piper and player processes, killed by stop()"""
+        self._processes: set[subprocess.Popen] = set()
+        self._process_lock = threading.Lock()
+        """Bumped by stop() to cancel speech that has not finished yet"""
+        self._generation = 0
 
     @property
     def piper_state(self) -> PiperState:
@@ -71,45 +76,105 @@ class PIPER_TTS(TTS):
     def speak(self, text: str) -> None:
         super().speak(text)
         self.piper_state = PiperState.PROCESSING
-        self._thread = threading.Thread(target=self._speak_internal)
+        self._thread = threading.Thread(
+            target=self._speak_internal, args=(text, self._generation)
+        )
         self._thread.start()
 
-    def _speak_internal(self) -> None:
-        try:
-            if not os.path.exists(PIPER_PATH) or not os.path.exists(MODEL_PATH):
-                self.piper_state = PiperState.ERROR
-                print("Missing Piper or model")
-                return
+    @property
+    def generation(self) -> int:
+        """Speech started with an older generation is cancelled"""
+        return self._generation
 
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
-                wav_path = tmp.name
-            result = subprocess.run(
-                [PIPER_PATH, "--model", MODEL_PATH, "--output_file", wav_path],
-                input=self.text,
-                text=True,
-                capture_output=True,
-            )
-            if result.returncode != 0:
-                self.piper_state = PiperState.ERROR
-                print("[TTS Error] Piper failed:", result.stderr)
+    def _is_cancelled(self, generation: int) -> bool:
+        return generation != self._generation
+
+    def _speak_internal(self, text: str, generation: int) -> None:
+        wav_path = ""
+        try:
+            wav_path = self.synthesize(text, generation)
+            if not wav_path:
                 return
             self.piper_state = PiperState.SPEAKING
-            if platform.system() == "Windows":
-                winsound.PlaySound(wav_path, winsound.SND_FILENAME)
-            else:
-                player = "afplay" if platform.system() == "Darwin" else "aplay"
-                subprocess.run([player, wav_path])
-
+            self.play(wav_path, generation)
             self.piper_state = PiperState.IDLE
-            self.done_speaking()
-            # Spawn a thread just for cleanup
-            threading.Thread(
-                target=self.remove_wav_file, args=(wav_path,), daemon=True
-            ).start()
 
         except Exception as e:
             self.piper_state = PiperState.ERROR
             print("[TTS Error]", e)
+        finally:
+            if wav_path:
+                # Spawn a thread just for cleanup
+                threading.Thread(
+                    target=self.remove_wav_file, args=(wav_path,), daemon=True
+                ).start()
+            # Also on errors, otherwise the microphone stays muted forever
+            if not self._is_cancelled(generation):
+                self.done_speaking()
+
+    def synthesize(self, text: str, generation: int | None = None) -> str:
+        """Render text to a temporary wav file, returns "" on failure or cancel"""
+        generation = self._generation if generation is None else generation
+        if not os.path.exists(PIPER_PATH) or not os.path.exists(MODEL_PATH):
+            self.piper_state = PiperState.ERROR
+            print("Missing Piper or model")
+            return ""
+
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
+            wav_path = tmp.name
+        result = self._run_process(
+            [PIPER_PATH, "--model", MODEL_PATH, "--output_file", wav_path],
+            generation,
+            text,
+        )
+        if result is None or result[0] != 0:
+            if result is not None:
+                self.piper_state = PiperState.ERROR
+                print("[TTS Error] Piper failed:", result[1])
+            self.remove_wav_file(wav_path)
+            return ""
+        return wav_path
+
+    def play(self, wav_path: str, generation: int | None = None) -> None:
+        """Play a wav file, blocking until it ends or stop() is called"""
+        generation = self._generation if generation is None else generation
+        if self._is_cancelled(generation):
+            return
+        if platform.system() == "Windows":
+            winsound.PlaySound(wav_path, winsound.SND_FILENAME)
+        else:
+            player = "afplay" if platform.system() == "Darwin" else "aplay"
+            self._run_process([player, wav_path], generation)
+
+    def _run_process(self, args: list[str], generation: int, text: str | None = None) -> tuple[int, str] | None:
+        """Run piper or the player so stop() can kill it, None when cancelled"""
+        pipe = subprocess.PIPE if text is not None else None
+        with self._process_lock:
+            if self._is_cancelled(generation):
+                return None
+            process = subprocess.Popen(args, stdin=pipe, stdout=pipe, stderr=pipe, text=True)
+            self._processes.add(process)
+        try:
+            _, stderr = process.communicate(text)
+        finally:
+            with self._process_lock:
+                self._processes.discard(process)
+        if self._is_cancelled(generation):
+            return None
+        return process.returncode, stderr or ""
+
+    def stop(self) -> None:
+        """Cancel queued and in-flight speech, killing Piper or the player"""
+        with self._process_lock:
+            # Threads started before this point see a stale generation and bail out
+            self._generation += 1
+            for process in self._processes:
+                if process.poll() is None:
+                    process.kill()
+        if platform.system() == "Windows":
+            winsound.PlaySound(None, 0)
+        self.piper_state = PiperState.IDLE
+        super().stop()
 
     def remove_wav_file(self, wav_path: str) -> None:
         """Delete wav file in a background thread"""
@@ -58,4 +58,8 @@ class TTS(ABC):
 
     
     def done_speaking(self) -> None:
-        self.state = TTSState.IDLE
\ No newline at end of file
+        self.state = TTSState.IDLE
+
+    def stop(self) -> None:
+        """Cancel speech, engines that can interrupt playback override this"""
+        self.done_speaking()
\ No newline at end of file
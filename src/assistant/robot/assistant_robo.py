@@ -16,15 +16,18 @@ from abc import ABC, abstractmethod
 import speech_recognition as sr
 from typing import  Dict, Any
 from enum import Enum
+import threading
 
 # Custom Imports
 try:
     from .answer_helper.answer_helper import AnswerHelper
     from .question_helper.question_helper import QuestionHelper
+    from .question_helper.audio.barge_in import BargeIn
     from .talking_robo import SPEAKING_ROBOT
 except ImportError:
     from answer_helper.answer_helper import AnswerHelper
     from question_helper.question_helper import QuestionHelper
+    from question_helper.audio.barge_in import BargeIn
     from talking_robo import SPEAKING_ROBOT
 
 class AssistantStates(Enum):
@@ -59,6 +62,12 @@ class ASSISTANT(ABC, SPEAKING_ROBOT):
         self.response = ""
         self._timeout_seconds = 10
         self._state = AssistantStates.IDLE
+        """Lets the user interrupt long answers by talking over them"""
+        self.barge_in = BargeIn(
+            capture=self.question_helper.capture,
+            is_speaking=self.answer_helper.is_answering,
+            on_barge_in=self._on_barge_in,
+        )
 
     """
     TODO: Implement this after , v0.1.0 Release.
@@ -72,6 +81,28 @@ class ASSISTANT(ABC, SPEAKING_ROBOT):
         self.question_helper.hear()
         self.state = AssistantStates.IDLE
 
+    def enable_barge_in(self) -> None:
+        self.barge_in.start()
+
+    def disable_barge_in(self) -> None:
+        self.barge_in.stop()
+        self.question_helper.capture.release()
+
+    def _on_barge_in(self) -> None:
+        """Runs on the capture thread: silence now, transcribe on another thread"""
+        onset = (self.barge_in.onset_position, self.barge_in.onset_time)
+        self.stop_speaking()
+        threading.Thread(target=self._answer_barge_in, args=onset, daemon=True).start()
+
+    def _answer_barge_in(self, onset_position: int, onset_time: float) -> None:
+        self.state = AssistantStates.LISTENING
+        # The user is already talking and the capture already has their first
+        # words, a new recording would miss them and open the microphone twice
+        self.question_helper.hear_from(onset_position, onset_time)
+        self.state = AssistantStates.IDLE
+        if self.query:
+            self.answer()
+
     @property 
     def query(self) -> str:
         return self.question_helper.question
@@ -0,0 +1,8 @@
+# Audio Package Exports
+from .audio_capture import AudioCapture
+from .ring_buffer import AudioRingBuffer, AudioSpan, BufferOverrun
+from .vad import EnergyVAD, VADState
+from .barge_in import BargeIn
+from .utterance import UtteranceCollector
+
+__all__ = ['AudioCapture', 'AudioRingBuffer', 'AudioSpan', 'BufferOverrun', 'EnergyVAD', 'VADState', 'BargeIn', 'UtteranceCollector']
@@ -0,0 +1,180 @@
+import threading
+import time
+from typing import Callable
+
+import speech_recognition as sr
+
+try:
+    from .ring_buffer import AudioRingBuffer, DEFAULT_MEMORY_BUDGET
+except ImportError:
+    from ring_buffer import AudioRingBuffer, DEFAULT_MEMORY_BUDGET
+
+"""Listener signature: (frame, capture_time) -> None"""
+FrameListener = Callable[[bytes, float], None]
+
+
+class AudioCapture:
+    """
+    Continuous microphone capture on its own thread.
+
+    Frames are 16-bit mono PCM of `frame_duration` seconds and are handed to
+    every registered listener in capture order. Listeners run on the capture
+    thread, so they must be quick.
+
+    While `gate` returns True (the robot is speaking) and for `gate_hangover`
+    seconds after, frames are dropped so the robot does not hear itself.
+
+    Every frame is written once into `buffer`, a preallocated ring, and
+    listeners get a `memoryview` of it rather than a copy. A listener that
+    needs the audio later keeps ring positions (`buffer.write_position`)
+    instead of the frame itself.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        frame_duration: float = 0.03,
+        device_index: int | None = None,
+        buffer_seconds: float = 30.0,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+    ):
+        self.sample_rate = sample_rate
+        self.sample_width = 2
+        self.frame_size = int(sample_rate * frame_duration)
+        self.device_index = device_index
+        self.buffer = AudioRingBuffer(
+            seconds=buffer_seconds,
+            sample_rate=sample_rate,
+            sample_width=self.sample_width,
+            frame_size=self.frame_size,
+            memory_budget=memory_budget,
+        )
+        self._listeners: list[FrameListener] = []
+        """Listeners that also get frames while input is suppressed (barge-in)"""
+        self._ungated_listeners: list[FrameListener] = []
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stop_event = threading.Event()
+        self._frames_captured = 0
+        """ Returns True while input must be suppressed, e.g. AnswerHelper.is_answering """
+        self.gate: Callable[[], bool] | None = None
+        """ Seconds to keep suppressing after playback ends (room echo, player buffers) """
+        self.gate_hangover: float = 0.3
+        self._gated_until = 0.0
+        self._discarded_frames = 0
+        """Why capture stopped on its own, e.g. the microphone could not be opened"""
+        self.error: Exception | None = None
+        """Set when capture fails, so whoever waits for frames stops waiting"""
+        self._failure_events: list[threading.Event] = []
+
+    @property
+    def frame_duration(self) -> float:
+        return self.frame_size / self.sample_rate
+
+    @property
+    def frames_captured(self) -> int:
+        return self._frames_captured
+
+    @property
+    def discarded_frames(self) -> int:
+        """Frames dropped because the robot was speaking"""
+        return self._discarded_frames
+
+    @property
+    def thread(self) -> threading.Thread | None:
+        return self._thread
+
+    def add_listener(self, listener: FrameListener, gated: bool = True) -> None:
+        with self._lock:
+            if gated:
+                self._listeners.append(listener)
+            else:
+                self._ungated_listeners.append(listener)
+
+    def remove_listener(self, listener: FrameListener) -> None:
+        with self._lock:
+            for listeners in (self._listeners, self._ungated_listeners):
+                if listener in listeners:
+                    listeners.remove(listener)
+
+    def add_failure_event(self, event: threading.Event) -> None:
+        """`event` is set when capture fails, right away if it already has"""
+        with self._lock:
+            self._failure_events.append(event)
+            if self.error is not None and not self.is_running():
+                event.set()
+
+    def remove_failure_event(self, event: threading.Event) -> None:
+        with self._lock:
+            if event in self._failure_events:
+                self._failure_events.remove(event)
+
+    def start(self) -> None:
+        if self.is_running():
+            return
+        self._stop_event.clear()
+        self.error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def release(self) -> None:
+        """Stop capturing unless someone else is still listening"""
+        with self._lock:
+            in_use = bool(self._listeners or self._ungated_listeners)
+        if not in_use:
+            self.stop()
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self) -> None:
+        try:
+            with sr.Microphone(
+                device_index=self.device_index,
+                sample_rate=self.sample_rate,
+                chunk_size=self.frame_size,
+            ) as source:
+                while not self._stop_event.is_set():
+                    frame = source.stream.read(self.frame_size)
+                    self.dispatch(frame, time.monotonic())
+        except Exception as e:
+            print(f"❌ Error during audio capture: {e}")
+            with self._lock:
+                self.error = e
+                events = list(self._failure_events)
+            for event in events:
+                event.set()
+
+    def is_gated(self, now: float | None = None) -> bool:
+        """Check if input is currently suppressed"""
+        now = time.monotonic() if now is None else now
+        if self.gate is not None and self.gate():
+            self._gated_until = now + self.gate_hangover
+            return True
+        return now < self._gated_until
+
+    def wait_until_open(self, poll_interval: float = 0.05) -> None:
+        """Block while input is suppressed"""
+        while self.is_gated():
+            time.sleep(poll_interval)
+
+    def dispatch(self, frame: bytes | memoryview, capture_time: float) -> None:
+        """Hand a frame to every listener (also used to replay WAV files)"""
+        frame = self.buffer.write(frame)
+        self._frames_captured += 1
+        with self._lock:
+            ungated = list(self._ungated_listeners)
+            listeners = list(self._listeners)
+        for listener in ungated:
+            listener(frame, capture_time)
+        if self.is_gated(capture_time):
+            self._discarded_frames += 1
+            return
+        for listener in listeners:
+            listener(frame, capture_time)
@@ -0,0 +1,115 @@
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+try:
+    from .audio_capture import AudioCapture
+    from .vad import EnergyVAD, VADState
+except ImportError:
+    from audio_capture import AudioCapture
+    from vad import EnergyVAD, VADState
+
+
+class BargeIn:
+    """
+    Watches the live microphone while the robot speaks and interrupts it.
+
+    The first `calibration_frames` frames of every answer only measure how
+    loud the robot's own voice is on the microphone; after that, speech well
+    above that level fires `on_barge_in`. The time from the user's first
+    voiced frame until `on_barge_in` returned (playback silenced) is kept in
+    `latencies`. Where that speech starts in the capture ring is kept in
+    `onset_position`, so it can be transcribed without recording it again.
+    """
+
+    def __init__(
+        self,
+        capture: AudioCapture,
+        is_speaking: Callable[[], bool],
+        on_barge_in: Callable[[], None],
+        vad: EnergyVAD | None = None,
+        calibration_frames: int = 10,
+    ):
+        self.capture = capture
+        self.is_speaking = is_speaking
+        self.on_barge_in = on_barge_in
+        self.vad = vad or EnergyVAD(threshold=800, min_speech_frames=5, noise_ratio=3.0)
+        self.calibration_frames = calibration_frames
+        self._frames_into_answer = 0
+        self._onset_time: float | None = None
+        self._onset_position = 0
+        """Ring position and capture time of the speech that interrupted the last answer"""
+        self.onset_position: int | None = None
+        self.onset_time = 0.0
+        self._triggered = False
+        self._enabled = False
+        self._lock = threading.Lock()
+        """Speech onset to silence, in seconds"""
+        self.latencies: deque[float] = deque(maxlen=100)
+        self.barge_ins = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def start(self) -> None:
+        if self._enabled:
+            return
+        self._enabled = True
+        self.capture.add_listener(self._on_frame, gated=False)
+        self.capture.start()
+
+    def stop(self) -> None:
+        self._enabled = False
+        self.capture.remove_listener(self._on_frame)
+
+    def _on_frame(self, frame: bytes, capture_time: float) -> None:
+        if not self.is_speaking():
+            if self._frames_into_answer:
+                self._reset()
+            return
+        self._frames_into_answer += 1
+        if self._frames_into_answer <= self.calibration_frames:
+            self.vad.calibrate(frame)
+            return
+        if self._triggered:
+            return
+
+        state = self.vad.process(frame)
+        if not self.vad.last_voiced:
+            self._onset_time = None
+        elif self._onset_time is None:
+            self._onset_time = capture_time
+            self._onset_position = self.capture.buffer.write_position - len(frame)
+        if state == VADState.SPEECH and self._onset_time is not None:
+            self._trigger(self._onset_time)
+
+    def _trigger(self, onset_time: float) -> None:
+        with self._lock:
+            if self._triggered:
+                return
+            self._triggered = True
+        self.onset_position = self._onset_position
+        self.onset_time = onset_time
+        print("✋ Barge-in detected, stopping answer")
+        self.on_barge_in()
+        latency = time.monotonic() - onset_time
+        self.latencies.append(latency)
+        self.barge_ins += 1
+        print(f"⏱️ Barge-in latency: {latency * 1000:.0f} ms")
+
+    def _reset(self) -> None:
+        self._frames_into_answer = 0
+        self._onset_time = None
+        self._triggered = False
+        self.vad.reset()
+        self.vad.reset_noise_floor()
+
+    def get_stats(self) -> dict:
+        latencies = sorted(self.latencies)
+        return {
+            'barge_ins': self.barge_ins,
+            'avg_latency_ms': 1000 * sum(latencies) / len(latencies) if latencies else 0.0,
+            'max_latency_ms': 1000 * latencies[-1] if latencies else 0.0,
+        }
@@ -0,0 +1,101 @@
+"""
+The few PCM operations the audio code needs. audioop does them in C but was
+removed in Python 3.13, there the same results come from array math.
+"""
+import array
+import math
+import sys
+
+try:
+    import audioop
+except ImportError:
+    audioop = None
+
+"""array typecodes of signed samples by sample width"""
+_TYPECODES = {2: "h", 4: "i"}
+
+
+def _samples(pcm: bytes, width: int) -> list[int]:
+    """Signed samples, 8-bit WAV is unsigned around 128"""
+    if width == 1:
+        return [sample - 128 for sample in pcm]
+    if width == 3:
+        return [int.from_bytes(pcm[i:i + 3], "little", signed=True) for i in range(0, len(pcm) - 2, 3)]
+    samples = array.array(_TYPECODES[width])
+    samples.frombytes(pcm[:len(pcm) - len(pcm) % width])
+    if sys.byteorder == "big":
+        samples.byteswap()
+    return samples.tolist()
+
+
+def _pcm(samples: list[int], width: int) -> bytes:
+    if width == 1:
+        return bytes(sample + 128 for sample in samples)
+    if width == 3:
+        return b"".join(sample.to_bytes(3, "little", signed=True) for sample in samples)
+    data = array.array(_TYPECODES[width], samples)
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data.tobytes()
+
+
+def rms(frame: bytes, width: int) -> int:
+    """Root mean square of a frame, as audioop.rms"""
+    if audioop is not None:
+        return audioop.rms(frame, width)
+    samples = array.array(_TYPECODES[width])
+    samples.frombytes(frame[:len(frame) - len(frame) % width])
+    if not samples:
+        return 0
+    return int(math.sqrt(sum(sample * sample for sample in samples) / len(samples)))
+
+
+def to_mono(pcm: bytes, width: int) -> bytes:
+    """Average the two channels of interleaved stereo"""
+    if audioop is not None and width != 1:
+        return audioop.tomono(pcm, width, 0.5, 0.5)
+    samples = _samples(pcm, width)
+    return _pcm([(left + right) // 2 for left, right in zip(samples[::2], samples[1::2])], width)
+
+
+def convert_width(pcm: bytes, width: int, new_width: int) -> bytes:
+    """Change the sample width, 8-bit input is taken as unsigned like in WAV files"""
+    if width == new_width:
+        return pcm
+    if audioop is not None:
+        if width == 1:
+            pcm = audioop.bias(pcm, 1, -128)
+        converted = audioop.lin2lin(pcm, width, new_width)
+        return audioop.bias(converted, 1, 128) if new_width == 1 else converted
+    shift = 8 * (new_width - width)
+    samples = _samples(pcm, width)
+    if shift > 0:
+        converted = [sample << shift for sample in samples]
+    else:
+        converted = [sample >> -shift for sample in samples]
+    if new_width == 1:
+        # Back to unsigned
+        return bytes(sample + 128 for sample in converted)
+    return _pcm(converted, new_width)
+
+
+def resample(pcm: bytes, width: int, rate: int, new_rate: int) -> bytes:
+    """Mono PCM at another sample rate, by linear interpolation"""
+    if rate == new_rate:
+        return pcm
+    if audioop is not None and width != 1:
+        return audioop.ratecv(pcm, width, 1, rate, new_rate, None)[0]
+    samples = _samples(pcm, width)
+    if not samples:
+        return b""
+    count = len(samples) * new_rate // rate
+    step = rate / new_rate
+    last = len(samples) - 1
+    resampled = []
+    for i in range(count):
+        position = i * step
+        index = int(position)
+        fraction = position - index
+        following = samples[min(index + 1, last)]
+        resampled.append(int(samples[index] + (following - samples[index]) * fraction))
+    return _pcm(resampled, width)
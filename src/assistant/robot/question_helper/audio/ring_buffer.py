@@ -0,0 +1,141 @@
+# Memory budget for captured audio, sized for a Raspberry Pi (32 s of 16 kHz mono PCM)
+DEFAULT_MEMORY_BUDGET = 1024 * 1024
+
+
+class BufferOverrun(Exception):
+    """The requested audio has already been overwritten by the capture thread"""
+
+
+class AudioRingBuffer:
+    """
+    Preallocated ring of raw PCM shared by the capture thread and its readers.
+
+    The capture thread is the only writer. Positions are absolute byte
+    offsets since the buffer was created, so a reader can keep a position
+    and later check whether the writer has lapped it. Frames never straddle
+    the end of the ring (the capacity is a whole number of frames), so every
+    frame handed out by `write` is a single `memoryview` into the ring with
+    no copy. Views stay valid until the writer comes round again, roughly
+    `seconds` later; copy anything that has to live longer.
+    """
+
+    def __init__(
+        self,
+        seconds: float = 30.0,
+        sample_rate: int = 16000,
+        sample_width: int = 2,
+        frame_size: int = 480,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+    ):
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.frame_bytes = frame_size * sample_width
+        wanted = int(seconds * sample_rate) * sample_width
+        capacity = min(wanted, memory_budget)
+        capacity -= capacity % self.frame_bytes
+        if capacity <= 0:
+            raise ValueError(f"Memory budget of {memory_budget} bytes cannot hold a single frame")
+        if wanted > memory_budget:
+            print(f"⚠️ Audio buffer limited to {capacity / (sample_rate * sample_width):.1f}s by memory budget")
+        self._buffer = bytearray(capacity)
+        self._view = memoryview(self._buffer)
+        self._write_pos = 0
+        """ End of the region being written, readers must treat it as gone """
+        self._writing_until = 0
+        self._overruns = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def seconds(self) -> float:
+        return self.capacity / (self.sample_rate * self.sample_width)
+
+    @property
+    def write_position(self) -> int:
+        return self._write_pos
+
+    @property
+    def oldest_position(self) -> int:
+        """Oldest byte that can still be read"""
+        return max(0, self._writing_until - self.capacity)
+
+    @property
+    def overruns(self) -> int:
+        """Reads that failed because the writer got there first"""
+        return self._overruns
+
+    def write(self, data: bytes) -> memoryview:
+        """Copy data into the ring and return a view of where it landed"""
+        size = len(data)
+        if size > self.capacity:
+            raise ValueError(f"Cannot write {size} bytes into a {self.capacity} byte ring")
+        offset = self._write_pos % self.capacity
+        self._writing_until = self._write_pos + size
+        first = min(size, self.capacity - offset)
+        self._view[offset:offset + first] = data[:first]
+        if first < size:
+            self._view[:size - first] = data[first:]
+        self._write_pos = self._writing_until
+        if first < size:
+            # Only unaligned writes wrap, there is no single view for those
+            return memoryview(bytes(data))
+        return self._view[offset:offset + size]
+
+    def is_available(self, start: int) -> bool:
+        return start >= self.oldest_position
+
+    def views(self, start: int, end: int) -> list[memoryview]:
+        """One or two zero-copy views covering [start, end)"""
+        if end > self._write_pos or start > end:
+            raise ValueError(f"Invalid range [{start}, {end}) with writer at {self._write_pos}")
+        self._check(start)
+        offset = start % self.capacity
+        size = end - start
+        first = min(size, self.capacity - offset)
+        views = [self._view[offset:offset + first]]
+        if first < size:
+            views.append(self._view[:size - first])
+        return views
+
+    def read(self, start: int, end: int) -> bytes:
+        """Copy [start, end) out of the ring, raising BufferOverrun if it was overwritten"""
+        data = b"".join(self.views(start, end))
+        # The writer may have lapped us while we were copying
+        self._check(start)
+        return data
+
+    def span(self, start: int, end: int) -> "AudioSpan":
+        return AudioSpan(self, start, end)
+
+    def _check(self, start: int) -> None:
+        if start < self.oldest_position:
+            self._overruns += 1
+            raise BufferOverrun(
+                f"Audio at byte {start} was overwritten, oldest available is {self.oldest_position}"
+            )
+
+
+class AudioSpan:
+    """A range of the ring handed between stages instead of a copy of the audio"""
+
+    __slots__ = ("buffer", "start", "end")
+
+    def __init__(self, buffer: AudioRingBuffer, start: int, end: int):
+        self.buffer = buffer
+        self.start = start
+        self.end = end
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    @property
+    def duration(self) -> float:
+        return len(self) / (self.buffer.sample_rate * self.buffer.sample_width)
+
+    def is_valid(self) -> bool:
+        return self.buffer.is_available(self.start)
+
+    def tobytes(self) -> bytes:
+        return self.buffer.read(self.start, self.end)
@@ -0,0 +1,42 @@
+"""
+Test file for microphone gating while the robot speaks, frames are dispatched by hand instead of a microphone.
+Run from src: python -m pytest assistant/robot/question_helper/audio/test_audio_capture.py
+"""
+from assistant.robot.question_helper.audio.audio_capture import AudioCapture
+
+
+def test_frames_are_dropped_while_speaking_and_hangover():
+    print("🧪 Dispatching frames while the robot speaks...")
+    capture = AudioCapture()
+    speaking = True
+    capture.gate = lambda: speaking
+    capture.gate_hangover = 0.3
+    heard, heard_ungated = [], []
+    capture.add_listener(lambda frame, t: heard.append(t))
+    capture.add_listener(lambda frame, t: heard_ungated.append(t), gated=False)
+    silence = bytes(capture.frame_size * capture.sample_width)
+
+    capture.dispatch(silence, 10.0)
+    assert capture.is_gated(10.0)
+    speaking = False
+    # Still within the hangover after the last gated frame
+    capture.dispatch(silence, 10.2)
+    # Past it
+    capture.dispatch(silence, 10.4)
+
+    assert heard == [10.4]
+    assert heard_ungated == [10.0, 10.2, 10.4], "barge-in listeners hear everything"
+    assert capture.discarded_frames == 2 and capture.frames_captured == 3
+    print("✅ The robot's own voice never reached the gated listeners")
+
+
+def test_no_gate_means_always_open():
+    capture = AudioCapture()
+    assert not capture.is_gated()
+    capture.wait_until_open()
+
+
+if __name__ == "__main__":
+    test_frames_are_dropped_while_speaking_and_hangover()
+    test_no_gate_means_always_open()
+    print("\n🎉 Audio capture tests successful!")
@@ -0,0 +1,112 @@
+"""
+Test file for interrupting the robot by talking over it, frames are dispatched by hand instead of a microphone.
+Run from src: python -m pytest assistant/robot/question_helper/audio/test_barge_in.py
+"""
+import struct
+import threading
+import time
+
+from assistant.robot.question_helper.audio.audio_capture import AudioCapture
+from assistant.robot.question_helper.audio.barge_in import BargeIn
+from assistant.robot.question_helper.question_helper import QuestionHelper
+from assistant.robot.question_helper.stt.stt import STT
+
+
+def tone(capture: AudioCapture, level: int) -> bytes:
+    """A frame whose RMS is `level`"""
+    return struct.pack(f"<{capture.frame_size}h", *[level, -level] * (capture.frame_size // 2))
+
+
+class RecordingSTT(STT):
+    def __init__(self):
+        super().__init__()
+        self.heard: list[bytes] = []
+
+    @property
+    def name(self) -> str:
+        return "Recording STT"
+
+    def hear(self) -> str:
+        return ""
+
+    def recognize(self, pcm: bytes, sample_rate: int, sample_width: int) -> str:
+        self.heard.append(pcm)
+        return "stop please"
+
+
+def test_barge_in_fires_on_speech_over_the_robot():
+    print("🧪 Talking over the robot...")
+    capture = AudioCapture()
+    speaking = True
+    capture.gate = lambda: speaking
+    interruptions = []
+    barge_in = BargeIn(capture, lambda: speaking, lambda: interruptions.append(time.monotonic()))
+    capture.add_listener(barge_in._on_frame, gated=False)
+
+    t = 0.0
+    # The robot's own voice: measured first, then ignored however long it goes on
+    for _ in range(barge_in.calibration_frames + 20):
+        capture.dispatch(tone(capture, 1000), t)
+        t += capture.frame_duration
+    assert not interruptions
+
+    onset = capture.buffer.write_position
+    for _ in range(barge_in.vad.min_speech_frames):
+        capture.dispatch(tone(capture, 8000), t)
+        t += capture.frame_duration
+    assert len(interruptions) == 1
+    assert barge_in.onset_position == onset, "the onset points at the first voiced frame"
+
+    # Only once per answer
+    for _ in range(10):
+        capture.dispatch(tone(capture, 8000), t)
+        t += capture.frame_duration
+    assert len(interruptions) == 1 and barge_in.barge_ins == 1
+
+    # The next answer can be interrupted again
+    speaking = False
+    capture.dispatch(tone(capture, 0), t)
+    speaking = True
+    for i in range(barge_in.calibration_frames + barge_in.vad.min_speech_frames):
+        capture.dispatch(tone(capture, 8000 if i >= barge_in.calibration_frames else 1000), t)
+        t += capture.frame_duration
+    assert len(interruptions) == 2
+    print("✅ Only the user's voice interrupted, once per answer")
+
+
+def test_hear_from_transcribes_speech_already_captured():
+    print("🧪 Transcribing the words that interrupted the answer...")
+    capture = AudioCapture()
+    stt = RecordingSTT()
+    helper = QuestionHelper(stt=stt, capture=capture)
+
+    # The interruption started before hear_from was called
+    onset = capture.buffer.write_position
+    for _ in range(5):
+        capture.dispatch(tone(capture, 8000), 0.0)
+
+    def keep_talking():
+        while not capture._ungated_listeners:
+            time.sleep(0.01)
+        for _ in range(5):
+            capture.dispatch(tone(capture, 8000), 0.2)
+        for _ in range(15):
+            capture.dispatch(tone(capture, 0), 0.4)
+
+    talker = threading.Thread(target=keep_talking)
+    talker.start()
+    helper.hear_from(onset, 0.0, max_seconds=2.0)
+    talker.join()
+
+    assert helper.question == "stop please"
+    pcm = stt.heard[0]
+    assert pcm[:len(tone(capture, 8000))] == tone(capture, 8000), "starts with the first interrupting frame"
+    assert pcm.count(tone(capture, 8000)) == 10, "both the early and the later speech were transcribed"
+    assert not capture._ungated_listeners, "the collector was removed"
+    print("✅ The interruption was transcribed without opening the microphone again")
+
+
+if __name__ == "__main__":
+    test_barge_in_fires_on_speech_over_the_robot()
+    test_hear_from_transcribes_speech_already_captured()
+    print("\n🎉 Barge-in tests successful!")
@@ -0,0 +1,76 @@
+"""
+Test file for the capture ring buffer: wrap-around and overrun detection.
+Run from src: python -m pytest assistant/robot/question_helper/audio/test_ring_buffer.py
+"""
+from assistant.robot.question_helper.audio.ring_buffer import AudioRingBuffer, BufferOverrun
+
+FRAME_SIZE = 4
+FRAME_BYTES = FRAME_SIZE * 2
+
+
+def frame(value: int) -> bytes:
+    return bytes([value]) * FRAME_BYTES
+
+
+def small_ring(frames: int = 4) -> AudioRingBuffer:
+    """A ring holding `frames` frames of FRAME_SIZE samples"""
+    return AudioRingBuffer(seconds=frames * FRAME_SIZE / 16000, frame_size=FRAME_SIZE)
+
+
+def test_capacity_is_whole_frames_within_budget():
+    print("🧪 Sizing the ring...")
+    ring = AudioRingBuffer(seconds=10.0, frame_size=480, memory_budget=10000)
+    assert ring.capacity == 9600 and ring.capacity % ring.frame_bytes == 0
+    try:
+        AudioRingBuffer(frame_size=480, memory_budget=100)
+        assert False, "a budget below one frame should be refused"
+    except ValueError:
+        pass
+    print("✅ The budget wins and the ring holds whole frames")
+
+
+def test_wrap_around():
+    print("🧪 Writing past the end of the ring...")
+    ring = small_ring()
+    views = [ring.write(frame(i)) for i in range(6)]
+    assert ring.write_position == 6 * FRAME_BYTES
+    assert ring.oldest_position == 2 * FRAME_BYTES
+    # Aligned frames are views into the ring, the wrapped ones landed at its start
+    assert bytes(views[5]) == frame(5)
+    assert bytes(views[0]) == frame(4), "the first view now shows the frame that replaced it"
+
+    # A range crossing the end comes back as two views, read joins them in order
+    start, end = 3 * FRAME_BYTES, 6 * FRAME_BYTES
+    assert len(ring.views(start, end)) == 2
+    assert ring.read(start, end) == frame(3) + frame(4) + frame(5)
+
+    # Unaligned writes that wrap are copied instead
+    ring.write(b"\x09" * (FRAME_BYTES // 2))
+    wrapped = ring.write(b"\x0a" * FRAME_BYTES)
+    assert bytes(wrapped) == b"\x0a" * FRAME_BYTES
+    print("✅ Data came back in order across the wrap")
+
+
+def test_overrun():
+    print("🧪 Reading audio the writer has lapped...")
+    ring = small_ring()
+    ring.write(frame(1))
+    span = ring.span(0, FRAME_BYTES)
+    assert span.is_valid() and span.tobytes() == frame(1)
+    for i in range(4):
+        ring.write(frame(2 + i))
+    assert not span.is_valid()
+    try:
+        span.tobytes()
+        assert False, "overwritten audio must not be returned"
+    except BufferOverrun:
+        pass
+    assert ring.overruns == 1
+    print("✅ The stale read was refused and counted")
+
+
+if __name__ == "__main__":
+    test_capacity_is_whole_frames_within_budget()
+    test_wrap_around()
+    test_overrun()
+    print("\n🎉 Ring buffer tests successful!")
@@ -0,0 +1,81 @@
+from typing import Callable
+
+try:
+    from .ring_buffer import AudioRingBuffer, AudioSpan
+    from .vad import EnergyVAD, VADState
+except ImportError:
+    from ring_buffer import AudioRingBuffer, AudioSpan
+    from vad import EnergyVAD, VADState
+
+"""Callback signature: (audio, start_time, end_time) -> None"""
+UtteranceListener = Callable[[AudioSpan, float, float], None]
+
+
+class UtteranceCollector:
+    """
+    Cuts the capture stream into utterances using the VAD.
+
+    Nothing is copied: the collector only remembers where the utterance
+    starts in the capture ring buffer and hands out an `AudioSpan` when it
+    ends. A few frames from before the VAD triggered are included as
+    pre-roll so the first syllable is not lost. Utterances longer than
+    `max_seconds` are closed early.
+    """
+
+    def __init__(
+        self,
+        on_utterance: UtteranceListener,
+        buffer: AudioRingBuffer,
+        vad: EnergyVAD | None = None,
+        frame_duration: float = 0.03,
+        pre_roll: float = 0.3,
+        max_seconds: float = 10.0,
+    ):
+        self.on_utterance = on_utterance
+        self.buffer = buffer
+        self.vad = vad or EnergyVAD(sample_width=buffer.sample_width)
+        bytes_per_second = buffer.sample_rate * buffer.sample_width
+        self.max_bytes = int(max_seconds * bytes_per_second)
+        self._pre_roll_bytes = int(pre_roll / frame_duration) * buffer.frame_bytes
+        if self.max_bytes + self._pre_roll_bytes > buffer.capacity:
+            raise ValueError(
+                f"Utterances of {max_seconds}s do not fit in a {buffer.seconds:.1f}s audio buffer"
+            )
+        self._start: int | None = None
+        self._start_time = 0.0
+
+    def is_collecting(self) -> bool:
+        return self._start is not None
+
+    def process(self, frame: memoryview, capture_time: float) -> None:
+        """AudioCapture listener, `frame` is the latest write into the ring"""
+        state = self.vad.process(frame)
+        end = self.buffer.write_position
+        if self._start is None:
+            if state == VADState.SPEECH:
+                frame_start = end - len(frame)
+                self._start = max(self.buffer.oldest_position, frame_start - self._pre_roll_bytes)
+                self._start_time = capture_time - (frame_start - self._start) / (
+                    self.buffer.sample_rate * self.buffer.sample_width
+                )
+            return
+
+        if state == VADState.SILENCE or end - self._start >= self.max_bytes:
+            span = self.buffer.span(self._start, end)
+            self._start = None
+            self.vad.reset()
+            self.on_utterance(span, self._start_time, capture_time)
+
+    def begin(self, start: int, start_time: float) -> None:
+        """Collect from ring position `start`, where speech was already heard (barge-in)"""
+        pre_roll_start = max(self.buffer.oldest_position, start - self._pre_roll_bytes)
+        self._start_time = start_time - (start - pre_roll_start) / (
+            self.buffer.sample_rate * self.buffer.sample_width
+        )
+        self._start = pre_roll_start
+        self.vad.reset()
+        self.vad.assume_speech()
+
+    def reset(self) -> None:
+        self._start = None
+        self.vad.reset()
@@ -0,0 +1,107 @@
+from enum import Enum
+
+try:
+    from .pcm import rms
+except ImportError:
+    from pcm import rms
+
+
+class VADState(Enum):
+    """ When no one is talking """
+    SILENCE = "silence"
+    """ When speech is detected on the stream """
+    SPEECH = "speech"
+
+
+class EnergyVAD:
+    """
+    Energy based voice activity detector.
+
+    Cheap enough to run on every captured frame of a Raspberry Pi. A frame is
+    voiced when its RMS is above both the fixed `threshold` and the adaptive
+    noise floor times `noise_ratio`. Speech starts after `min_speech_frames`
+    voiced frames in a row and ends after `hangover_frames` unvoiced ones.
+    """
+
+    def __init__(
+        self,
+        threshold: int = 300,
+        sample_width: int = 2,
+        min_speech_frames: int = 3,
+        hangover_frames: int = 10,
+        noise_ratio: float = 2.5,
+    ):
+        self.threshold = threshold
+        self.sample_width = sample_width
+        self.min_speech_frames = min_speech_frames
+        self.hangover_frames = hangover_frames
+        self.noise_ratio = noise_ratio
+        self._noise_floor: float = 0.0
+        self._voiced_run = 0
+        self._unvoiced_run = 0
+        self._state = VADState.SILENCE
+        self._last_rms = 0
+        self._last_voiced = False
+
+    @property
+    def state(self) -> VADState:
+        return self._state
+
+    @property
+    def noise_floor(self) -> float:
+        return self._noise_floor
+
+    @property
+    def last_rms(self) -> int:
+        return self._last_rms
+
+    @property
+    def last_voiced(self) -> bool:
+        """Raw (unsmoothed) decision for the last processed frame"""
+        return self._last_voiced
+
+    def is_voiced(self, frame: bytes) -> bool:
+        """Check a single frame against the current threshold"""
+        level = rms(frame, self.sample_width)
+        self._last_rms = level
+        voiced = level > max(self.threshold, self._noise_floor * self.noise_ratio)
+        self._last_voiced = voiced
+        if not voiced:
+            # Track the background level only while nobody is talking
+            self._noise_floor = 0.95 * self._noise_floor + 0.05 * level
+        return voiced
+
+    def calibrate(self, frame: bytes) -> None:
+        """Raise the noise floor to the level of a frame known not to be the user"""
+        self._noise_floor = max(self._noise_floor, rms(frame, self.sample_width))
+
+    def reset_noise_floor(self) -> None:
+        self._noise_floor = 0.0
+
+    def process(self, frame: bytes) -> VADState:
+        """Feed one frame and return the smoothed speech state"""
+        if self.is_voiced(frame):
+            self._voiced_run += 1
+            self._unvoiced_run = 0
+            if self._voiced_run >= self.min_speech_frames:
+                self._state = VADState.SPEECH
+        else:
+            self._unvoiced_run += 1
+            self._voiced_run = 0
+            if self._unvoiced_run >= self.hangover_frames:
+                self._state = VADState.SILENCE
+        return self._state
+
+    def assume_speech(self) -> None:
+        """Continue as if speech had started, e.g. after another detector heard it"""
+        self._voiced_run = self.min_speech_frames
+        self._unvoiced_run = 0
+        self._state = VADState.SPEECH
+
+    def is_speech(self) -> bool:
+        return self._state == VADState.SPEECH
+
+    def reset(self) -> None:
+        self._voiced_run = 0
+        self._unvoiced_run = 0
+        self._state = VADState.SILENCE
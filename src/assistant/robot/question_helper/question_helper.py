@@ -1,11 +1,19 @@
 
 from .stt.stt import STT
 from .stt.google_stt import GoogleSTT
+from .wake_word.wake_word import WakeWord, WakeWordState
+from .audio.audio_capture import AudioCapture
+from .audio.ring_buffer import AudioSpan, BufferOverrun
+from .audio.utterance import UtteranceCollector
 from enum import Enum
+import threading
+from typing import Callable
 
 class QuestionHelperState(Enum):
     """ When Doing Nothing"""
     IDLE = "idle"
+    """ When waiting for the wake word before listening """
+    WAITING = "waiting"
     """ When the robot is actively listening for questions"""
     LISTENING = "listening"
     """ When the robot is processing a question"""
@@ -20,7 +28,11 @@ class QuestionHelper:
     _description_   
     Helper class to manage answers and integrate TTS functionality.
     """
-    def __init__(self,stt: STT = GoogleSTT()):
+    def __init__(self,
+                 stt: STT = GoogleSTT(),
+                 wake_word: WakeWord | None = None,
+                 capture: AudioCapture | None = None,
+                 ):
         self._state = QuestionHelperState.IDLE
         self._question = ""
         
@@ -28,6 +40,11 @@ class QuestionHelper:
         tts is PIPER_TTS by default
         """
         self._stt = stt
+        """ Optional keyword spotter that gates the (expensive) STT """
+        self._wake_word = wake_word
+        self._capture = capture or AudioCapture()
+        """ Seconds to wait for the wake word, None waits forever """
+        self.wake_word_timeout: float | None = None
     
     
     @property
@@ -37,12 +54,96 @@ class QuestionHelper:
     def stt(self, stt: STT):
         self._stt = stt
 
-    
-    def hear(self):
+    @property
+    def wake_word(self) -> WakeWord | None:
+        return self._wake_word
+    @wake_word.setter
+    def wake_word(self, wake_word: WakeWord | None):
+        self._wake_word = wake_word
+
+    @property
+    def capture(self) -> AudioCapture:
+        return self._capture
+
+    @property
+    def playback_gate(self) -> Callable[[], bool] | None:
+        return self._capture.gate
+    @playback_gate.setter
+    def playback_gate(self, gate: Callable[[], bool] | None):
+        """Suppress microphone input while `gate` returns True"""
+        self._capture.gate = gate
+
+    def wait_for_wake_word(self) -> bool:
+        """Block on the local spotter, True when STT should run"""
+        if self._wake_word is None:
+            return True
+        self.state = QuestionHelperState.WAITING
+        try:
+            detected = self._wake_word.wait(self._capture, timeout=self.wake_word_timeout)
+        finally:
+            # Release the microphone for the STT engine
+            self._capture.release()
+        if self._wake_word.state == WakeWordState.ERR:
+            print(f"⚠️ {self._wake_word.name} failed, listening without wake word")
+            return True
+        return detected
+
+    def hear(self, use_wake_word: bool = True):
+        if use_wake_word and not self.wait_for_wake_word():
+            self.state = QuestionHelperState.IDLE
+            return
+        # Never let the STT engine record the robot's own answer
+        self._capture.wait_until_open()
         self.state = QuestionHelperState.LISTENING
+        # Don't hand back the previous question when nothing is recognized
+        self._stt.text = ""
         self._stt.hear()
         self.question  = self.stt.text 
         self.state = QuestionHelperState.IDLE
+
+    def hear_from(self, start: int, start_time: float, max_seconds: float = 10.0) -> None:
+        """
+        Transcribe speech the running capture has been recording since ring
+        position `start`, e.g. the words that interrupted an answer. The rest
+        of the utterance is cut by the VAD; the microphone is not opened again.
+        """
+        utterances: list[AudioSpan] = []
+        ended = threading.Event()
+
+        def on_utterance(span: AudioSpan, begin: float, end: float) -> None:
+            utterances.append(span)
+            ended.set()
+
+        collector = UtteranceCollector(
+            on_utterance,
+            self._capture.buffer,
+            frame_duration=self._capture.frame_duration,
+            max_seconds=max_seconds,
+        )
+        collector.begin(start, start_time)
+        self.state = QuestionHelperState.LISTENING
+        self.question = ""
+        # Ungated: the robot was just silenced, the hangover would cut off the user
+        self._capture.add_listener(collector.process, gated=False)
+        self._capture.add_failure_event(ended)
+        try:
+            # The collector closes the utterance after max_seconds of capture
+            ended.wait(timeout=max_seconds + 1.0)
+        finally:
+            self._capture.remove_listener(collector.process)
+            self._capture.remove_failure_event(ended)
+        if not utterances:
+            print("⏰ Lost the interrupting speech, capture stopped")
+            self.state = QuestionHelperState.IDLE
+            return
+        try:
+            pcm = utterances[0].tobytes()
+            self.question = self._stt.recognize(pcm, self._capture.sample_rate, self._capture.sample_width)
+        except BufferOverrun as e:
+            print(f"⚠️ Interrupting speech was overwritten before STT: {e}")
+        except NotImplementedError as e:
+            print(f"⚠️ {e}")
+        self.state = QuestionHelperState.IDLE
     
     @property
     def state(self) -> QuestionHelperState:
@@ -63,6 +164,8 @@ class QuestionHelper:
     
     def is_listening(self) -> bool:
         return self.state == QuestionHelperState.LISTENING 
+    def is_waiting(self) -> bool:
+        return self.state == QuestionHelperState.WAITING
     def is_idle(self) -> bool:
         return self.state == QuestionHelperState.IDLE
     def is_processing(self) -> bool:
@@ -35,19 +35,7 @@ class GoogleSTT(STT):
                 # Listen with timeout
                 audio = self.recognizer.listen(source, timeout=self.timeout_seconds, phrase_time_limit=6)
 
-            try:
-                # Use Google's speech recognition
-                """TODO: Fix this : Attribute "recognize_legacy" is unknown"""
-                command = self.recognizer.recognize_google(audio, language='en-US')
-                print(f"✅ You said: {command}")
-                self.state = STTState.PROCESSING
-                self.text = command.lower()
-            except sr.UnknownValueError:
-                print("❌ Sorry, I didn't catch that. Could you repeat?")
-                self.state = STTState.ERR
-            except sr.RequestError as e:
-                print(f"❌ Speech service error: {e}")
-                self.state = STTState.ERR
+            self._recognize_audio(audio)
 
         except sr.WaitTimeoutError:
             print("⏰ No speech detected within timeout period")
@@ -56,6 +44,27 @@ class GoogleSTT(STT):
             print(f"❌ Error during listening: {e}")
             self.state = STTState.ERR
 
+    def recognize(self, pcm: bytes, sample_rate: int, sample_width: int) -> str:
+        """Transcribe audio that was captured elsewhere (voice pipeline)"""
+        self.text = ""
+        self._recognize_audio(sr.AudioData(pcm, sample_rate, sample_width))
+        return self.text
+
+    def _recognize_audio(self, audio: sr.AudioData) -> None:
+        try:
+            # Use Google's speech recognition
+            """TODO: Fix this : Attribute "recognize_legacy" is unknown"""
+            command = self.recognizer.recognize_google(audio, language='en-US')
+            print(f"✅ You said: {command}")
+            self.state = STTState.PROCESSING
+            self.text = command.lower()
+        except sr.UnknownValueError:
+            print("❌ Sorry, I didn't catch that. Could you repeat?")
+            self.state = STTState.ERR
+        except sr.RequestError as e:
+            print(f"❌ Speech service error: {e}")
+            self.state = STTState.ERR
+
 
 if __name__ == "__main__":
     # Test the GoogleSTT class
@@ -22,6 +22,9 @@ class STT(abc.ABC):
     def hear(self) -> str:
         self._state = STTState.LISTENING
         pass
+    def recognize(self, pcm: bytes, sample_rate: int, sample_width: int) -> str:
+        """Transcribe already captured 16-bit mono PCM"""
+        raise NotImplementedError(f"{self.name} can only listen to the microphone itself")
     @property
     @abc.abstractmethod
     def name(self) -> str:
@@ -0,0 +1,5 @@
+# Wake Word Package Exports
+from .wake_word import WakeWord, WakeWordState, evaluate_wake_word
+from .sphinx_wake_word import SphinxWakeWord, DEFAULT_WAKE_WORD
+
+__all__ = ['WakeWord', 'WakeWordState', 'evaluate_wake_word', 'SphinxWakeWord', 'DEFAULT_WAKE_WORD']
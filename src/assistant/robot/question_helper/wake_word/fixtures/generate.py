@@ -0,0 +1,89 @@
+"""
+Writes the labelled WAV clips next to this file, run it again after changing them.
+
+positive/ should trigger a spotter listening for two short syllables
+("hey ro-bot" as energy bursts), negative/ should not. They are synthetic:
+they check the evaluation end to end, including the mono, sample width and
+sample rate conversions of WakeWord.detect_in_wav. Add recordings of the
+real wake word to both folders to measure a spotter like SphinxWakeWord.
+Two clips are hard on purpose: a whispered wake word (positive) and two
+claps (negative).
+"""
+import math
+import os
+import random
+import struct
+import wave
+
+RATE = 16000
+DURATION = 0.8
+
+
+def burst(seconds: float, amplitude: float, rng: random.Random) -> list[float]:
+    """A voiced sounding burst: two harmonics with some breath noise and soft edges"""
+    count = int(seconds * RATE)
+    samples = []
+    for i in range(count):
+        t = i / RATE
+        envelope = min(1.0, i / 160, (count - i) / 160)
+        tone = 0.6 * math.sin(2 * math.pi * 220 * t) + 0.3 * math.sin(2 * math.pi * 440 * t)
+        samples.append(amplitude * envelope * (tone + 0.1 * rng.uniform(-1, 1)))
+    return samples
+
+
+def clip(parts: list[tuple[float, list[float]]], noise: float = 0.0, seed: int = 0) -> list[float]:
+    """DURATION seconds of background noise with the parts placed at their start times"""
+    rng = random.Random(seed)
+    samples = [noise * rng.uniform(-1, 1) for _ in range(int(DURATION * RATE))]
+    for start, part in parts:
+        offset = int(start * RATE)
+        for i, value in enumerate(part[:len(samples) - offset]):
+            samples[offset + i] += value
+    return samples
+
+
+def wake_word(amplitude: float = 8000, noise: float = 0.0, seed: int = 0) -> list[float]:
+    rng = random.Random(seed)
+    return clip([(0.1, burst(0.2, amplitude, rng)), (0.45, burst(0.3, amplitude, rng))], noise, seed)
+
+
+def write(path: str, samples: list[float], rate: int = RATE, width: int = 2, channels: int = 1) -> None:
+    if rate != RATE:
+        samples = [samples[int(i * RATE / rate)] for i in range(int(len(samples) * rate / RATE))]
+    ints = [max(-32768, min(32767, int(value))) for value in samples]
+    if width == 1:
+        data = bytes((value >> 8) + 128 for value in ints for _ in range(channels))
+    else:
+        data = struct.pack(f"<{len(ints) * channels}h", *[value for value in ints for _ in range(channels)])
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(width)
+        wav.setframerate(rate)
+        wav.writeframes(data)
+
+
+def generate(fixtures_dir: str) -> None:
+    rng = random.Random(7)
+    clips = {
+        "positive/wake_word.wav": (wake_word(), {}),
+        "positive/wake_word_8khz.wav": (wake_word(seed=1), {"rate": 8000}),
+        "positive/wake_word_stereo.wav": (wake_word(seed=2), {"channels": 2}),
+        "positive/wake_word_8bit.wav": (wake_word(seed=3), {"width": 1}),
+        "positive/wake_word_noisy_room.wav": (wake_word(noise=300, seed=4), {}),
+        "positive/wake_word_whispered.wav": (wake_word(amplitude=250, seed=5), {}),
+        "negative/silence.wav": (clip([]), {}),
+        "negative/room_noise.wav": (clip([], noise=300, seed=6), {}),
+        "negative/hum.wav": (clip([(0.0, [3000 * math.sin(2 * math.pi * 50 * i / RATE) for i in range(int(DURATION * RATE))])]), {}),
+        "negative/one_syllable.wav": (clip([(0.2, burst(0.3, 8000, rng))]), {}),
+        "negative/long_sentence.wav": (clip([(0.0, burst(0.75, 8000, rng))]), {}),
+        "negative/two_claps.wav": (clip([(0.1, burst(0.12, 12000, rng)), (0.4, burst(0.12, 12000, rng))]), {}),
+    }
+    for name, (samples, options) in clips.items():
+        path = os.path.join(fixtures_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write(path, samples, **options)
+        print(f"🎵 {name}")
+
+
+if __name__ == "__main__":
+    generate(os.path.dirname(os.path.abspath(__file__)))
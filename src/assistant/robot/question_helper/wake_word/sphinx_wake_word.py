@@ -0,0 +1,96 @@
+import speech_recognition as sr
+
+# Custom Imports
+try:
+    from .wake_word import WakeWord, WakeWordState, evaluate_wake_word
+    from ..audio.audio_capture import AudioCapture
+    from ..audio.vad import EnergyVAD, VADState
+except ImportError:
+    from wake_word import WakeWord, WakeWordState, evaluate_wake_word
+    from audio.audio_capture import AudioCapture
+    from audio.vad import EnergyVAD, VADState
+
+DEFAULT_WAKE_WORD = "hey robot"
+
+
+class SphinxWakeWord(WakeWord):
+    """
+    Offline keyword spotter built on PocketSphinx keyword search.
+
+    The energy VAD runs on every frame and only short voiced segments are
+    decoded, so the decoder stays idle while the room is quiet. Needs the
+    `pocketsphinx` package next to `speech_recognition`.
+    """
+
+    def __init__(
+        self,
+        wake_word: str = DEFAULT_WAKE_WORD,
+        sensitivity: float = 1e-20,
+        sample_rate: int = 16000,
+        max_segment_seconds: float = 2.0,
+        vad: EnergyVAD | None = None,
+    ):
+        super().__init__(wake_word=wake_word, sample_rate=sample_rate)
+        """ Keyword threshold passed to PocketSphinx, lower accepts more """
+        self.sensitivity = sensitivity
+        self.max_segment_seconds = max_segment_seconds
+        self.recognizer = sr.Recognizer()
+        self.vad = vad or EnergyVAD(sample_width=self.sample_width)
+        self._segment = bytearray()
+
+    @property
+    def name(self) -> str:
+        return "PocketSphinx Wake Word"
+
+    def _detect(self, frame: bytes) -> bool:
+        was_speech = self.vad.is_speech()
+        is_speech = self.vad.process(frame) == VADState.SPEECH
+        if is_speech or was_speech:
+            self._segment.extend(frame)
+
+        max_bytes = int(self.max_segment_seconds * self.sample_rate) * self.sample_width
+        if (was_speech and not is_speech) or len(self._segment) >= max_bytes:
+            segment = bytes(self._segment)
+            self._segment.clear()
+            return self._decode(segment)
+        return False
+
+    def _decode(self, segment: bytes) -> bool:
+        if self.state == WakeWordState.ERR:
+            return False
+        audio = sr.AudioData(segment, self.sample_rate, self.sample_width)
+        try:
+            heard = self.recognizer.recognize_sphinx(
+                audio, keyword_entries=[(self.wake_word, self.sensitivity)]
+            )
+        except sr.UnknownValueError:
+            return False
+        except sr.RequestError as e:
+            print(f"❌ Wake word engine unavailable: {e}")
+            self.state = WakeWordState.ERR
+            return False
+        return self.wake_word in heard.lower()
+
+    def reset(self) -> None:
+        if self.state != WakeWordState.ERR:
+            super().reset()
+        self.vad.reset()
+        self._segment.clear()
+
+
+if __name__ == "__main__":
+    import sys
+
+    detector = SphinxWakeWord()
+    if len(sys.argv) > 1:
+        # python -m assistant.robot.question_helper.wake_word.sphinx_wake_word <fixtures_dir>
+        for key, value in evaluate_wake_word(detector, sys.argv[1]).items():
+            print(f"  {key.replace('_', ' ').title()}: {value}")
+    else:
+        capture = AudioCapture()
+        print(f"🎤 Say '{detector.wake_word}'...")
+        while True:
+            if detector.wait(capture, timeout=30):
+                print(f"✅ Wake word detected (CPU load {detector.cpu_load:.1%})")
+            else:
+                print("⏰ No wake word within timeout period")
@@ -0,0 +1,87 @@
+"""
+Test file measuring false accept / false reject rates on the labelled WAV fixtures.
+Run from src: python -m pytest assistant/robot/question_helper/wake_word/test_wake_word.py
+"""
+import importlib.util
+import os
+
+from assistant.robot.question_helper.audio.vad import EnergyVAD
+from assistant.robot.question_helper.wake_word.wake_word import WakeWord, evaluate_wake_word
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+class SyllableWakeWord(WakeWord):
+    """
+    Reference spotter for the synthetic fixtures: two short voiced bursts
+    close together, the rhythm of "hey ro-bot". Cheap and deterministic,
+    it checks the evaluation rather than real speech.
+    """
+
+    def __init__(self, frame_duration: float = 0.03):
+        super().__init__(wake_word="hey robot")
+        self.vad = EnergyVAD(sample_width=self.sample_width)
+        self.min_frames = int(0.08 / frame_duration)
+        self.max_frames = int(0.4 / frame_duration)
+        self.max_gap_frames = int(0.3 / frame_duration)
+        self.reset()
+
+    @property
+    def name(self) -> str:
+        return "Syllable Rhythm Wake Word"
+
+    def _detect(self, frame: bytes) -> bool:
+        if self.vad.is_voiced(frame):
+            if self._silent >= self.max_gap_frames:
+                self._bursts = 0
+            self._voiced += 1
+            self._silent = 0
+            return False
+        self._silent += 1
+        if self._voiced:
+            is_syllable = self.min_frames <= self._voiced <= self.max_frames
+            self._bursts = self._bursts + 1 if is_syllable else 0
+            self._voiced = 0
+        return self._bursts >= 2
+
+    def reset(self) -> None:
+        super().reset()
+        self.vad.reset_noise_floor()
+        self._voiced = 0
+        self._silent = self.max_gap_frames
+        self._bursts = 0
+
+
+def print_report(report: dict) -> None:
+    for key, value in report.items():
+        print(f"  {key.replace('_', ' ').title()}: {value}")
+
+
+def test_false_accept_and_reject_rates():
+    print("🧪 Replaying the labelled fixtures...")
+    report = evaluate_wake_word(SyllableWakeWord(), FIXTURES_DIR)
+    print_report(report)
+    assert report["positive_clips"] == 6 and report["negative_clips"] == 6
+    # The whispered wake word is missed and the two claps are taken for it
+    assert report["false_reject_rate"] == 1 / 6
+    assert report["false_accept_rate"] == 1 / 6
+    print("✅ Both rates measured")
+
+
+def test_sphinx_rates():
+    """Needs pocketsphinx, meaningful once recordings of the real wake word are added to the fixtures"""
+    if importlib.util.find_spec("pocketsphinx") is None:
+        print("⏭️ pocketsphinx is not installed, skipping")
+        return
+    from assistant.robot.question_helper.wake_word.sphinx_wake_word import SphinxWakeWord
+
+    report = evaluate_wake_word(SphinxWakeWord(), FIXTURES_DIR)
+    print_report(report)
+    assert 0.0 <= report["false_accept_rate"] <= 1.0
+    assert 0.0 <= report["false_reject_rate"] <= 1.0
+
+
+if __name__ == "__main__":
+    test_false_accept_and_reject_rates()
+    test_sphinx_rates()
+    print("\n🎉 Wake word tests successful!")
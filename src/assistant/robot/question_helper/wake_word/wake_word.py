@@ -0,0 +1,176 @@
+import abc
+import os
+import threading
+import time
+import wave
+from enum import Enum
+
+try:
+    from ..audio.audio_capture import AudioCapture
+    from ..audio.pcm import convert_width, resample, to_mono
+except ImportError:
+    from audio.audio_capture import AudioCapture
+    from audio.pcm import convert_width, resample, to_mono
+
+
+class WakeWordState(Enum):
+    IDLE = "idle"
+    LISTENING = "listening"
+    DETECTED = "detected"
+    ERR = "error"
+
+
+class WakeWord(abc.ABC):
+    """
+    Base class for always-on keyword spotters.
+
+    A spotter is fed raw 16-bit mono PCM frames and answers whether the wake
+    word was heard. CPU time spent inside `process_frame` is compared with the
+    duration of the audio it was given, so the spotter can be checked against
+    `cpu_budget` (fraction of one core) on the robot.
+    """
+
+    def __init__(self, wake_word: str, sample_rate: int = 16000, cpu_budget: float = 0.15):
+        self._state = WakeWordState.IDLE
+        self.wake_word = wake_word
+        self.sample_rate = sample_rate
+        self.sample_width = 2
+        self.cpu_budget = cpu_budget
+        self._cpu_seconds = 0.0
+        self._audio_seconds = 0.0
+        self._over_budget_reported = False
+
+    @property
+    def wake_word(self) -> str:
+        return self._wake_word
+
+    @wake_word.setter
+    def wake_word(self, value: str) -> None:
+        if not value or not value.strip():
+            raise ValueError("Wake word cannot be empty")
+        self._wake_word = value.lower().strip()
+
+    @property
+    def state(self) -> WakeWordState:
+        return self._state
+
+    @state.setter
+    def state(self, new_state: WakeWordState):
+        self._state = new_state
+
+    @property
+    @abc.abstractmethod
+    def name(self) -> str:
+        pass
+
+    @abc.abstractmethod
+    def _detect(self, frame: bytes) -> bool:
+        """Return True when the wake word ends in this frame"""
+        pass
+
+    def process_frame(self, frame: bytes) -> bool:
+        """Feed one frame, keeping track of the CPU it costs"""
+        started = time.thread_time()
+        detected = self._detect(frame)
+        self._cpu_seconds += time.thread_time() - started
+        self._audio_seconds += len(frame) / (self.sample_width * self.sample_rate)
+        if not self._over_budget_reported and self._audio_seconds > 10 and self.cpu_load > self.cpu_budget:
+            print(f"⚠️ {self.name} uses {self.cpu_load:.0%} CPU, budget is {self.cpu_budget:.0%}")
+            self._over_budget_reported = True
+        if detected:
+            self.state = WakeWordState.DETECTED
+        return detected
+
+    @property
+    def cpu_load(self) -> float:
+        """CPU seconds spent per second of audio"""
+        if self._audio_seconds == 0:
+            return 0.0
+        return self._cpu_seconds / self._audio_seconds
+
+    def reset(self) -> None:
+        self._state = WakeWordState.IDLE
+
+    def reset_stats(self) -> None:
+        self._cpu_seconds = 0.0
+        self._audio_seconds = 0.0
+        self._over_budget_reported = False
+
+    def wait(self, capture: AudioCapture, timeout: float | None = None) -> bool:
+        """Block until the wake word is heard on `capture` or `timeout` expires"""
+        self.reset()
+        if self.state == WakeWordState.ERR:
+            return False
+        self.state = WakeWordState.LISTENING
+        heard = threading.Event()
+
+        def listener(frame: bytes, _capture_time: float) -> None:
+            if heard.is_set():
+                return
+            if self.process_frame(frame) or self.state == WakeWordState.ERR:
+                heard.set()
+
+        capture.add_listener(listener)
+        capture.add_failure_event(heard)
+        try:
+            capture.start()
+            heard.wait(timeout)
+        finally:
+            capture.remove_listener(listener)
+            capture.remove_failure_event(heard)
+        if capture.error is not None:
+            # No microphone, nothing will ever be heard
+            print(f"⚠️ {self.name} stopped waiting: {capture.error}")
+            self.state = WakeWordState.ERR
+        detected = self.state == WakeWordState.DETECTED
+        if not detected and self.state != WakeWordState.ERR:
+            self.state = WakeWordState.IDLE
+        return detected
+
+    def detect_in_wav(self, path: str, frame_duration: float = 0.03) -> bool:
+        """Replay a WAV file through the spotter"""
+        self.reset()
+        with wave.open(path, "rb") as wav:
+            pcm = wav.readframes(wav.getnframes())
+            width, channels, rate = wav.getsampwidth(), wav.getnchannels(), wav.getframerate()
+        if channels == 2:
+            pcm = to_mono(pcm, width)
+        pcm = convert_width(pcm, width, self.sample_width)
+        pcm = resample(pcm, self.sample_width, rate, self.sample_rate)
+        step = int(self.sample_rate * frame_duration) * self.sample_width
+        # Trailing silence lets the spotter close an utterance at the end of a clip
+        pcm += bytes(int(self.sample_rate * 0.5) * self.sample_width)
+        for offset in range(0, len(pcm) - step + 1, step):
+            if self.process_frame(pcm[offset:offset + step]):
+                return True
+        return False
+
+    def __str__(self) -> str:
+        return f"name={self.name}, wake_word={self.wake_word}, state={self.state}"
+
+
+def evaluate_wake_word(detector: WakeWord, fixtures_dir: str) -> dict:
+    """
+    Report false accept / false reject rates against WAV fixtures.
+
+    `fixtures_dir` holds a `positive/` folder with clips containing the wake
+    word and a `negative/` folder with clips that must not trigger it.
+    """
+    results = {}
+    for label in ("positive", "negative"):
+        folder = os.path.join(fixtures_dir, label)
+        clips = sorted(f for f in os.listdir(folder) if f.endswith(".wav")) if os.path.isdir(folder) else []
+        hits = sum(detector.detect_in_wav(os.path.join(folder, clip)) for clip in clips)
+        results[label] = (hits, len(clips))
+
+    accepted_negatives, negatives = results["negative"]
+    accepted_positives, positives = results["positive"]
+    return {
+        "wake_word": detector.wake_word,
+        "positive_clips": positives,
+        "negative_clips": negatives,
+        "false_accept_rate": accepted_negatives / negatives if negatives else 0.0,
+        "false_reject_rate": (positives - accepted_positives) / positives if positives else 0.0,
+        "cpu_load": detector.cpu_load,
+        "within_cpu_budget": detector.cpu_load <= detector.cpu_budget,
+    }
@@ -83,6 +83,8 @@ class SPEAKING_ROBOT(BARE_ROBO):
         self.voice_config = voice_config 
         self.answer_helper = answer_helper
         self.question_helper = question_helper 
+        """Mute the microphone while the robot is speaking, so it doesn't answer itself"""
+        self.question_helper.playback_gate = self.answer_helper.is_answering
 
 
     def update_state(self):
@@ -123,7 +125,8 @@ class SPEAKING_ROBOT(BARE_ROBO):
 
     def stop_speaking(self) -> None:
         """Stop current speech"""
-        self._is_speaking = False
+        self.answer_helper.stop()
+        self.state = TalkingRoboState.IDLE
         print(f"{self.name} stopped speaking")
 
     def get_voice_config(self) -> Dict[str, Any]:
@@ -140,6 +143,7 @@ class SPEAKING_ROBOT(BARE_ROBO):
         status.update({
             'voice_config': self.get_voice_config(),
             'speaking': self.is_speaking,
+            'discarded_mic_frames': self.question_helper.capture.discarded_frames,
         })
         return status
     @property
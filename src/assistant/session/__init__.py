@@ -0,0 +1,5 @@
+# Session Package Exports
+from .session_store import Session, SessionStore
+from .context_spill import ContextSpill
+
+__all__ = ['Session', 'SessionStore', 'ContextSpill']
@@ -0,0 +1,102 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from ..ai_provider.history import intern_role
+
+# Get the project root directory (go up from current file to project root)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+"""Set ASSISTANT_SPILL_PATH to keep the histories somewhere else"""
+DEFAULT_SPILL_PATH = os.getenv("ASSISTANT_SPILL_PATH", os.path.join(PROJECT_ROOT, "conversation_contexts.db"))
+
+
+class ContextSpill:
+    """
+    Conversation histories of evicted sessions, kept in a SQLite sidecar file.
+
+    A history is stored as zlib compressed JSON of [role, content] pairs,
+    one row per session, so a session can be rebuilt on its next question.
+    The file is opened on the first save, or on a read when it already
+    exists, so a store that never spills leaves nothing on disk. Rows not
+    touched for `max_age_days` are deleted when the file opens.
+    """
+
+    def __init__(self, path: str = DEFAULT_SPILL_PATH, max_age_days: float = 30.0):
+        self.path = path
+        self.max_age_days = max_age_days
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    def _connect(self, create: bool) -> sqlite3.Connection | None:
+        """Under the lock: the open connection, None if there is no file yet and `create` is False"""
+        if self._connection is None and (create or os.path.exists(self.path)):
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            with connection:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS contexts ("
+                    "session_id TEXT PRIMARY KEY, messages INTEGER, data BLOB, updated REAL)"
+                )
+                connection.execute(
+                    "DELETE FROM contexts WHERE updated < ?", (time.time() - self.max_age_days * 86400,)
+                )
+            self._connection = connection
+        return self._connection
+
+    @staticmethod
+    def encode(messages: list[dict[str, str]]) -> bytes:
+        pairs = [[msg['role'], msg['content']] for msg in messages]
+        return zlib.compress(json.dumps(pairs, separators=(",", ":")).encode("utf-8"))
+
+    @staticmethod
+    def decode(data: bytes) -> list[dict[str, str]]:
+        return [{"role": intern_role(role), "content": content} for role, content in json.loads(zlib.decompress(data))]
+
+    def save(self, session_id: str, messages: list[dict[str, str]]) -> int:
+        """Store the history, returns its size on disk in bytes"""
+        data = self.encode(messages)
+        with self._lock:
+            connection = self._connect(create=True)
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO contexts (session_id, messages, data, updated) VALUES (?, ?, ?, ?)",
+                    (session_id, len(messages), data, time.time()),
+                )
+        return len(data)
+
+    def load(self, session_id: str) -> list[dict[str, str]] | None:
+        with self._lock:
+            connection = self._connect(create=False)
+            if connection is None:
+                return None
+            row = connection.execute(
+                "SELECT data FROM contexts WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return self.decode(row[0]) if row else None
+
+    def forget(self, session_id: str) -> None:
+        with self._lock:
+            connection = self._connect(create=False)
+            if connection is None:
+                return
+            with connection:
+                connection.execute("DELETE FROM contexts WHERE session_id = ?", (session_id,))
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            connection = self._connect(create=False)
+            if connection is None:
+                return {'stored_sessions': 0, 'stored_kb': 0.0}
+            rows, size = connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM contexts"
+            ).fetchone()
+        return {'stored_sessions': rows, 'stored_kb': size / 1024}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -0,0 +1,256 @@
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from ..ai_provider.ai_providers import AIProvider
+from ..ai_provider.metrics import _percentile
+from .context_spill import ContextSpill
+
+"""Approximate size of a message dict and its role, on top of the content string"""
+MESSAGE_OVERHEAD = sys.getsizeof({"role": "", "content": ""})
+
+
+class Session:
+    """One conversation: its own provider instance, so its own bounded history"""
+    __slots__ = ("session_id", "provider", "lock", "in_use", "created", "last_used", "questions")
+
+    def __init__(self, session_id: str, provider: AIProvider):
+        self.session_id = session_id
+        self.provider = provider
+        """Questions of one session run one at a time, different sessions in parallel"""
+        self.lock = threading.Lock()
+        """Callers between SessionStore.get() and done(), such a session is not evicted"""
+        self.in_use = 0
+        self.created = time.monotonic()
+        self.last_used = self.created
+        self.questions = 0
+
+    @property
+    def idle_time(self) -> float:
+        return time.monotonic() - self.last_used
+
+    def memory_bytes(self) -> int:
+        return sum(sys.getsizeof(msg['content']) + MESSAGE_OVERHEAD for msg in self.provider.messages)
+
+    def to_dict(self) -> dict:
+        return {
+            'session_id': self.session_id,
+            'provider': self.provider.name,
+            'messages': len(self.provider.messages),
+            'questions': self.questions,
+            'idle_seconds': round(self.idle_time, 1),
+        }
+
+
+class SessionStore:
+    """
+    Conversations keyed by user or session id.
+
+    Each session gets a fresh provider from `provider_factory` whose
+    history is trimmed to `max_history_tokens`. At most `max_sessions` are
+    kept; sessions idle for longer than `idle_timeout` and, when full, the
+    least recently used one are evicted, also while the histories together
+    take more than `max_memory_bytes`. A session handed out by get() is
+    not evicted until its caller called done().
+
+    With a `spill` store an evicted history is written there and read back
+    when its session asks again, so only the memory is bounded, not the
+    number of conversations. Providers are created and histories read and
+    written outside the store's lock, so other sessions are not held up.
+    """
+
+    def __init__(
+        self,
+        provider_factory: Callable[[], AIProvider],
+        max_sessions: int = 32,
+        idle_timeout: float = 1800.0,
+        max_history_tokens: int | None = 2000,
+        max_memory_bytes: int | None = 4 * 1024 * 1024,
+        spill: ContextSpill | None = None,
+    ):
+        self.provider_factory = provider_factory
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.max_history_tokens = max_history_tokens
+        self.max_memory_bytes = max_memory_bytes
+        self.spill = spill
+        self.spilled = 0
+        self.rehydrated = 0
+        self.rehydrate_times: deque[float] = deque(maxlen=100)
+        self._lock = threading.Lock()
+        """Least recently used first"""
+        self._sessions: OrderedDict[str, Session] = OrderedDict()
+        """Evicted sessions whose history is still being written to the spill store"""
+        self._pending: dict[str, Session] = {}
+        self.created = 0
+        self.evicted = 0
+
+    def get(self, session_id: str) -> Session:
+        """The session for `session_id`, created on first use. Hand it back with done()"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            pending = self._pending.get(session_id)
+            if session is not None:
+                evicted = self._check_out(session)
+        if session is None:
+            session = self._create(session_id, pending)
+            with self._lock:
+                existing = self._sessions.get(session_id)
+                if existing is None:
+                    self._sessions[session_id] = session
+                else:
+                    # Another caller created it meanwhile, use theirs
+                    session.provider.release()
+                    session = existing
+                evicted = self._check_out(session)
+        self._finish_evictions(evicted)
+        return session
+
+    def done(self, session: Session) -> None:
+        """The caller of get() is finished with the session"""
+        with self._lock:
+            session.in_use -= 1
+            if session.in_use or self._sessions.get(session.session_id) is session:
+                return
+            pending = self._pending.get(session.session_id) is session
+        # Evicted or removed while in use
+        if pending:
+            self._spill_and_release(session)
+        else:
+            session.provider.release()
+
+    @contextmanager
+    def use(self, session_id: str) -> Iterator[Session]:
+        session = self.get(session_id)
+        try:
+            yield session
+        finally:
+            self.done(session)
+
+    def _check_out(self, session: Session) -> list[Session]:
+        """Under the lock: mark the session used, returns the sessions evicted to make room"""
+        session.in_use += 1
+        session.last_used = time.monotonic()
+        self._sessions.move_to_end(session.session_id)
+        return self._evict()
+
+    def _create(self, session_id: str, pending: Session | None) -> Session:
+        provider = self.provider_factory()
+        provider.max_history_tokens = self.max_history_tokens
+        session = Session(session_id, provider)
+        if not self._rehydrate(session, pending):
+            self.created += 1
+            print(f"🧵 New session {session_id} on {provider.name}")
+        return session
+
+    def _rehydrate(self, session: Session, pending: Session | None = None) -> bool:
+        """Load a spilled history into a new session, True if there was one"""
+        if self.spill is None:
+            return False
+        start = time.perf_counter()
+        if pending is not None:
+            # Still being written out, take it from memory
+            messages = [dict(msg) for msg in pending.provider.messages]
+        else:
+            messages = self.spill.load(session.session_id)
+        if messages is None:
+            return False
+        session.provider.replace_messages(messages)
+        elapsed = time.perf_counter() - start
+        self.rehydrate_times.append(elapsed)
+        self.rehydrated += 1
+        print(f"💧 Rehydrated session {session.session_id}: {len(messages)} messages in {1000 * elapsed:.1f} ms")
+        return True
+
+    def memory_bytes(self) -> int:
+        return sum(session.memory_bytes() for session in self._sessions.values())
+
+    def _evict(self) -> list[Session]:
+        """Under the lock: detach idle sessions, then the least recently used ones above max_sessions or the memory ceiling"""
+        memory = self.memory_bytes() if self.max_memory_bytes is not None else 0
+        evicted = []
+        for session in list(self._sessions.values()):
+            over_capacity = len(self._sessions) > self.max_sessions
+            over_memory = self.max_memory_bytes is not None and memory > self.max_memory_bytes
+            if not over_capacity and not over_memory and session.idle_time < self.idle_timeout:
+                break
+            if session.in_use or session.lock.locked():
+                continue
+            memory -= session.memory_bytes()
+            evicted.append(self._detach(session))
+        return evicted
+
+    def _detach(self, session: Session) -> Session:
+        """Under the lock: take the session out, its history is written by _spill_and_release"""
+        del self._sessions[session.session_id]
+        self._pending[session.session_id] = session
+        self.evicted += 1
+        print(f"🧹 Evicted session {session.session_id} after {session.idle_time:.0f}s idle")
+        return session
+
+    def _finish_evictions(self, sessions: list[Session]) -> None:
+        """Outside the lock: spill the evicted sessions, those still in use are spilled by done()"""
+        for session in sessions:
+            if not session.in_use:
+                self._spill_and_release(session)
+
+    def _spill_and_release(self, session: Session) -> None:
+        messages = session.provider.messages
+        if self.spill is not None and any(msg['role'] != 'system' for msg in messages):
+            size = self.spill.save(session.session_id, messages)
+            self.spilled += 1
+            print(f"💾 Spilled session {session.session_id}: {len(messages)} messages, {size} bytes")
+        session.provider.release()
+        with self._lock:
+            if self._pending.get(session.session_id) is session:
+                del self._pending[session.session_id]
+
+    def remove(self, session_id: str) -> bool:
+        """End a conversation for good, also its spilled history"""
+        with self._lock:
+            self._pending.pop(session_id, None)
+            session = self._sessions.pop(session_id, None)
+            release = session is not None and not session.in_use
+        if self.spill is not None:
+            self.spill.forget(session_id)
+        if release:
+            session.provider.release()
+        return session is not None
+
+    def clear(self) -> None:
+        """Forget every session, e.g. after the provider was changed"""
+        with self._lock:
+            evicted = [self._detach(session) for session in list(self._sessions.values())]
+        self._finish_evictions(evicted)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            memory = self.memory_bytes()
+        rehydrate_times = list(self.rehydrate_times)
+        stats = {
+            'active': len(sessions),
+            'busy': sum(1 for session in sessions if session.lock.locked()),
+            'max_sessions': self.max_sessions,
+            'created': self.created,
+            'evicted': self.evicted,
+            'total_messages': sum(len(session.provider.messages) for session in sessions),
+            'memory_kb': memory / 1024,
+            'max_memory_kb': self.max_memory_bytes / 1024 if self.max_memory_bytes is not None else None,
+            'spilled': self.spilled,
+            'rehydrated': self.rehydrated,
+            'avg_rehydrate_ms': 1000 * sum(rehydrate_times) / len(rehydrate_times) if rehydrate_times else 0.0,
+            'p95_rehydrate_ms': 1000 * _percentile(rehydrate_times, 95),
+        }
+        if self.spill is not None:
+            stats.update(self.spill.get_stats())
+        return stats
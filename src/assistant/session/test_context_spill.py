@@ -0,0 +1,62 @@
+"""
+Test file for the SQLite store of evicted conversation histories, on a temporary file.
+Run from src: python -m pytest assistant/session/test_context_spill.py
+"""
+import os
+import tempfile
+import time
+
+from assistant.session.context_spill import ContextSpill
+
+HISTORY = [
+    {"role": "system", "content": "You are a helpful assistant."},
+    {"role": "user", "content": "What is 2 + 2?"},
+    {"role": "assistant", "content": "2 + 2 is 4. " * 50},
+]
+
+
+def test_round_trip():
+    print("🧪 Saving and loading a history...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "contexts.db")
+        spill = ContextSpill(path)
+        assert spill.load("alice") is None
+        assert not os.path.exists(path), "nothing spilled yet, no file expected"
+
+        size = spill.save("alice", HISTORY)
+        assert os.path.exists(path)
+        assert size < len(HISTORY[2]["content"]), "histories are stored compressed"
+        assert spill.load("alice") == HISTORY
+        assert spill.load("bob") is None
+        assert spill.get_stats()["stored_sessions"] == 1
+
+        spill.forget("alice")
+        assert spill.load("alice") is None
+        spill.close()
+    print("✅ The history came back as it was saved")
+
+
+def test_reopened_store_keeps_recent_histories_only():
+    print("🧪 Reopening the store...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "contexts.db")
+        spill = ContextSpill(path)
+        spill.save("alice", HISTORY)
+        spill.save("bob", HISTORY[:2])
+        with spill._lock, spill._connection:
+            spill._connection.execute(
+                "UPDATE contexts SET updated = ? WHERE session_id = 'bob'", (time.time() - 2 * 86400,)
+            )
+        spill.close()
+
+        reopened = ContextSpill(path, max_age_days=1)
+        assert reopened.load("alice") == HISTORY
+        assert reopened.load("bob") is None, "untouched for longer than max_age_days"
+        reopened.close()
+    print("✅ Recent histories survived, old ones were deleted")
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_reopened_store_keeps_recent_histories_only()
+    print("\n🎉 Context spill tests successful!")
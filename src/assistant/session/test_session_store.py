@@ -0,0 +1,98 @@
+"""
+Test file for per-session conversations: LRU and idle eviction, sessions in use, spilling to disk. Fake provider, temporary spill file.
+Run from src: python -m pytest assistant/session/test_session_store.py
+"""
+import os
+import tempfile
+import time
+
+from assistant.ai_provider.ai_providers import AIProvider
+from assistant.session.context_spill import ContextSpill
+from assistant.session.session_store import SessionStore
+
+
+class FakeProvider(AIProvider):
+    def __init__(self):
+        super().__init__()
+        self.released = False
+
+    @property
+    def name(self) -> str:
+        return "Fake"
+
+    def _call_api(self, message: list[dict[str, str]] | str) -> str:
+        answer = f"answer {len(self.messages)}"
+        self.add_message("assistant", answer)
+        return answer
+
+    def _new_instance(self) -> "FakeProvider":
+        return FakeProvider()
+
+    def ask(self, prompt: str) -> str:
+        super().ask(prompt)
+        return self._generic_ask(prompt)
+
+    def release(self) -> None:
+        self.released = True
+
+
+def talk(store: SessionStore, session_id: str, question: str = "Hello") -> FakeProvider:
+    with store.use(session_id) as session:
+        session.provider.ask(question)
+        return session.provider
+
+
+def test_least_recently_used_session_is_evicted():
+    print("🧪 Three conversations in a store for two...")
+    store = SessionStore(FakeProvider, max_sessions=2)
+    talk(store, "alice")
+    bob = talk(store, "bob")
+    talk(store, "alice")
+    talk(store, "carol")
+    assert "alice" in store and "carol" in store and "bob" not in store
+    assert bob.released and store.evicted == 1
+    print("✅ Bob, the least recently used, made room")
+
+
+def test_idle_sessions_are_evicted():
+    print("🧪 Leaving a conversation idle...")
+    store = SessionStore(FakeProvider, idle_timeout=0.05)
+    alice = talk(store, "alice")
+    time.sleep(0.1)
+    talk(store, "bob")
+    assert "alice" not in store and alice.released
+    print("✅ The idle session was evicted on the next use of the store")
+
+
+def test_session_in_use_is_not_evicted_until_done():
+    print("🧪 Evicting a session while its question is running...")
+    with tempfile.TemporaryDirectory() as tmp:
+        spill = ContextSpill(os.path.join(tmp, "contexts.db"))
+        store = SessionStore(FakeProvider, max_sessions=1, spill=spill)
+
+        alice = store.get("alice")
+        alice.provider.ask("What is 2 + 2?")
+        talk(store, "bob")
+        assert "alice" in store, "in use, so bob's session could not push it out"
+
+        store.clear()
+        assert "alice" not in store
+        assert not alice.provider.released and spill.load("alice") is None, "still answering"
+        store.done(alice)
+        assert alice.provider.released
+        assert spill.load("alice") == alice.provider.messages
+
+        # Alice comes back to her conversation
+        with store.use("alice") as session:
+            assert session.provider.messages == alice.provider.messages
+            assert session.provider is not alice.provider
+        assert store.rehydrated == 1
+        spill.close()
+    print("✅ The history was written out once the question finished, and came back")
+
+
+if __name__ == "__main__":
+    test_least_recently_used_session_is_evicted()
+    test_idle_sessions_are_evicted()
+    test_session_in_use_is_not_evicted_until_done()
+    print("\n🎉 Session store tests successful!")
@@ -16,6 +16,8 @@ import os
 
 try:
     from ...ai_assistant import get_ai_assistant, initialize_ai_assistant, AISingleton
+    from ...assistant.ai_provider.rate_limit import current_user
+    from ...assistant.ai_provider.scheduler import Priority, current_priority
     ASSISTANT_AVAILABLE = True
 except ImportError:
     ASSISTANT_AVAILABLE = False
@@ -74,15 +76,21 @@ class AssistantAPIController:
             # Get response from assistant
             response_text = ""
             status = "failed"
+            assistant = None
             if ASSISTANT_AVAILABLE and AISingleton.is_initialized():
+                # Rate limited providers queue requests fairly per user
+                client_id = user_id or RequestHandler.get_client_id()
+                current_user.set(client_id)
+                current_priority.set(Priority[dto.priority.upper()])
                 try:
                     assistant = get_ai_assistant()
                     assistant.question = question
-                    assistant.process_command(question)
-                    assistant.answer()
-                    if assistant.response is not None:
-                        status =  "answered"
-                    response_text = assistant.response or "I'm not sure how to respond to that."
+                    # Every user or session continues its own conversation
+                    answer = assistant.ask_in_session(dto.session_id or client_id, question)
+                    if answer:
+                        status = "answered"
+                    response_text = answer or "I'm not sure how to respond to that."
+                    assistant.say(response_text)
                 except Exception as e:
                     response_text = f"Sorry, I encountered an error: {str(e)}"
                     status = "failed"
@@ -173,7 +181,15 @@ class AssistantAPIController:
                 name=assistant.name if assistant else None,
                 is_connected=assistant.is_connected() if assistant else False,
                 ai_provider=assistant.ai_provider.name if assistant else None,
-                response_time=assistant.ai_provider.response_time if assistant else None
+                response_time=assistant.ai_provider.response_time if assistant else None,
+                provider_status=assistant.ai_provider.status.value if assistant else None,
+                timeout=assistant.ai_provider.timeout if assistant else None,
+                timeout_reason=assistant.ai_provider.timeout_reason if assistant else None,
+                circuit_breakers=assistant.ai_provider.get_breaker_states() if assistant else None,
+                coalescing=assistant.get_coalescing_stats() if assistant else None,
+                sessions=assistant.get_session_stats() if assistant else None,
+                scheduler=assistant.get_scheduler_stats() if assistant else None,
+                conversation=assistant.ai_provider.get_conversation_stats() if assistant else None
             )
             
             return ResponseHandler.success('Assistant status retrieved successfully', status_dto.to_dict())
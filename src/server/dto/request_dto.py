@@ -13,6 +13,8 @@ class AskQuestionDTO:
     """DTO for ask question endpoint"""
     question: str
     user_id: Optional[str] = None
+    session_id: Optional[str] = None
+    priority: str = "normal"
     
     @classmethod
     def from_dict(cls, data: dict) -> 'AskQuestionDTO':
@@ -28,7 +30,9 @@ class AskQuestionDTO:
         
         return cls(
             question=data['question'].strip(),
-            user_id=data.get('user_id')
+            user_id=data.get('user_id'),
+            session_id=data.get('session_id'),
+            priority=str(data.get('priority') or 'normal').lower()
         )
     
     def validate(self) -> tuple[bool, Optional[str]]:
@@ -39,6 +43,9 @@ class AskQuestionDTO:
         if len(self.question) > 1000:
             return False, "Question is too long (max 1000 characters)"
         
+        if self.priority not in ('interactive', 'normal', 'background'):
+            return False, "Priority must be 'interactive', 'normal' or 'background'"
+        
         return True, None
 
 
@@ -108,6 +108,14 @@ class AssistantStatusDTO:
     is_connected: bool = False
     ai_provider: Optional[str] = None
     response_time: Optional[float] = None
+    provider_status: Optional[str] = None
+    timeout: Optional[float] = None
+    timeout_reason: Optional[str] = None
+    circuit_breakers: Optional[Dict[str, Dict[str, Any]]] = None
+    coalescing: Optional[Dict[str, Any]] = None
+    sessions: Optional[Dict[str, Any]] = None
+    scheduler: Optional[Dict[str, Any]] = None
+    conversation: Optional[Dict[str, Any]] = None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
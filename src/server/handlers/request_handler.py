@@ -19,6 +19,11 @@ class RequestHandler:
         """Get query parameters from request"""
         return dict(request.args)
     
+    @staticmethod
+    def get_client_id() -> str:
+        """Who is asking when no user id was given, the client's address"""
+        return request.headers.get('X-Forwarded-For', request.remote_addr or 'anonymous').split(',')[0].strip()
+    
     @staticmethod
     def validate_required_fields(data: Dict[str, Any], required_fields: list) -> Tuple[bool, str]:
         """Validate that required fields are present in data"""
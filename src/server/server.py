@@ -641,6 +641,15 @@ def ask_assistant():
               type: string
               description: Optional user ID for conversation tracking
               example: "user123"
+            session_id:
+              type: string
+              description: Conversation to continue, defaults to the user ID or the client address
+              example: "kiosk-1"
+            priority:
+              type: string
+              enum: [interactive, normal, background]
+              description: Scheduling class, background questions wait for interactive and normal ones
+              example: "normal"
     responses:
       200:
         description: Successful response from assistant
@@ -759,6 +768,26 @@ def get_assistant_status():
                   type: boolean
                 provider:
                   type: string
+                provider_status:
+                  type: string
+                  example: "Idle"
+                timeout:
+                  type: number
+                  description: Timeout in seconds chosen for the last request
+                timeout_reason:
+                  type: string
+                circuit_breakers:
+                  type: object
+                  description: Breaker state per AI provider (Closed, Open or Half-open)
+                coalescing:
+                  type: object
+                  description: Identical questions in flight that shared one generation
+                sessions:
+                  type: object
+                  description: Active, busy and evicted conversation sessions
+                scheduler:
+                  type: object
+                  description: Queue latency per priority class, for the shared provider and for sessions
     """
     return AssistantAPIController.get_assistant_status()
 
@@ -853,6 +882,9 @@ def get_stats():
                       type: boolean
                     provider:
                       type: string
+                conversation:
+                  type: object
+                  description: Running totals of the shared conversation (messages by role, characters, tokens, recent response latency)
       500:
         description: Server error
     """
@@ -860,6 +892,7 @@ def get_stats():
         stats = DatabaseHelper.get_stats()
         assistant_status = assistant.get_status()
         stats['assistant_status'] = assistant_status
+        stats['conversation'] = assistant.ai_provider.get_conversation_stats()
         logger.info("Statistics retrieved successfully")
         return ResponseHandler.success('Statistics retrieved successfully', stats)
     except Exception as e: